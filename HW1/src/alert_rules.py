@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Mapping, Optional, Tuple
+
+THRESHOLD_OPS = ("<", ">")
+CROSS_OPS = ("cross_above", "cross_below")
+
+
+@dataclass(frozen=True)
+class AlertRule:
+	"""구독자 알림 규칙
+
+	예) RSI < 30 on 005930      → AlertRule("r1", "kim", "005930", "RSI", "<", 30)
+	    MACD 가 시그널 상향 돌파 → AlertRule("r2", "kim", "005930", "MACD", "cross_above", ref="MACD_SIGNAL")
+	"""
+	rule_id: str
+	user: str
+	ticker: str
+	field: str
+	op: str
+	threshold: float = math.nan
+	ref: Optional[str] = None
+	cooldown: float = 3600.0  # 같은 규칙 재알림 최소 간격 (초)
+
+	def signature(self) -> Tuple:
+		return (self.user, self.ticker, self.field, self.op, self.threshold if self.op in THRESHOLD_OPS else None, self.ref)
+
+
+@dataclass
+class FiredAlert:
+	rule: AlertRule
+	value: float
+	ts: float
+
+
+class _ThresholdIndex:
+	"""한 (종목, 지표)에 대한 임계값 정렬 인덱스"""
+	__slots__ = ("thresholds", "rule_ids")
+
+	def __init__(self) -> None:
+		self.thresholds: List[float] = []
+		self.rule_ids: List[str] = []
+
+	def __len__(self) -> int:
+		return len(self.rule_ids)
+
+	def add(self, threshold: float, rule_id: str) -> None:
+		i = bisect.bisect_right(self.thresholds, threshold)
+		self.thresholds.insert(i, threshold)
+		self.rule_ids.insert(i, rule_id)
+
+	def remove(self, threshold: float, rule_id: str) -> None:
+		lo = bisect.bisect_left(self.thresholds, threshold)
+		hi = bisect.bisect_right(self.thresholds, threshold)
+		for i in range(lo, hi):
+			if self.rule_ids[i] == rule_id:
+				del self.thresholds[i]
+				del self.rule_ids[i]
+				return
+
+	def between(self, lo: float, hi: float, lo_closed: bool, hi_closed: bool) -> List[str]:
+		start = bisect.bisect_left(self.thresholds, lo) if lo_closed else bisect.bisect_right(self.thresholds, lo)
+		end = bisect.bisect_right(self.thresholds, hi) if hi_closed else bisect.bisect_left(self.thresholds, hi)
+		return self.rule_ids[start:end]
+
+
+class RuleEngine:
+	"""(종목, 지표) → 규칙 역색인 기반 알림 엔진
+
+	값이 갱신되면 이전 값과 새 값 사이 구간을 통과한 임계값의 규칙만 조회하므로,
+	업데이트 비용은 전체 규칙 수가 아니라 실제로 발동 가능한 규칙 수에 비례한다.
+	"""
+
+	def __init__(self) -> None:
+		self.rules: Dict[str, AlertRule] = {}
+		self._by_signature: Dict[Tuple, str] = {}
+		self._below: Dict[Tuple[str, str], _ThresholdIndex] = {}
+		self._above: Dict[Tuple[str, str], _ThresholdIndex] = {}
+		self._cross: Dict[Tuple[str, str, str], List[str]] = {}
+		self._cross_pairs: Dict[str, set] = {}  # 종목별 (지표, 기준 지표) 교차 쌍
+		self._fields: Dict[str, set] = {}  # 종목별로 규칙이 걸린 지표
+		self._last: Dict[Tuple[str, str], float] = {}
+		self._last_diff: Dict[Tuple[str, str, str], float] = {}
+		self._last_fired: Dict[str, float] = {}
+
+	def __len__(self) -> int:
+		return len(self.rules)
+
+	def add_rule(self, rule: AlertRule) -> str:
+		"""규칙 등록. 같은 사용자의 동일 조건 규칙은 하나로 합쳐 기존 ID 반환"""
+		if rule.op not in THRESHOLD_OPS + CROSS_OPS:
+			raise ValueError(f"지원하지 않는 연산자: {rule.op}")
+		if rule.op in CROSS_OPS and not rule.ref:
+			raise ValueError(f"{rule.op} 규칙에는 ref 지표가 필요합니다")
+		existing = self._by_signature.get(rule.signature())
+		if existing:
+			return existing
+		if rule.rule_id in self.rules:
+			# 같은 ID 로 조건을 바꾸면 이전 조건의 색인을 먼저 제거
+			self.remove_rule(rule.rule_id)
+		self.rules[rule.rule_id] = rule
+		self._by_signature[rule.signature()] = rule.rule_id
+		fields = self._fields.setdefault(rule.ticker, set())
+		fields.add(rule.field)
+		if rule.op == "<":
+			self._below.setdefault((rule.ticker, rule.field), _ThresholdIndex()).add(rule.threshold, rule.rule_id)
+		elif rule.op == ">":
+			self._above.setdefault((rule.ticker, rule.field), _ThresholdIndex()).add(rule.threshold, rule.rule_id)
+		else:
+			fields.add(rule.ref)
+			self._cross_pairs.setdefault(rule.ticker, set()).add((rule.field, rule.ref))
+			self._cross.setdefault((rule.ticker, rule.field, rule.ref), []).append(rule.rule_id)
+		return rule.rule_id
+
+	def remove_rule(self, rule_id: str) -> None:
+		rule = self.rules.pop(rule_id, None)
+		if rule is None:
+			return
+		self._by_signature.pop(rule.signature(), None)
+		self._last_fired.pop(rule_id, None)
+		key = (rule.ticker, rule.field)
+		if rule.op in THRESHOLD_OPS:
+			indexes = self._below if rule.op == "<" else self._above
+			indexes[key].remove(rule.threshold, rule_id)
+			if not indexes[key]:
+				del indexes[key]
+		else:
+			key3 = (rule.ticker, rule.field, rule.ref)
+			self._cross[key3].remove(rule_id)
+			if not self._cross[key3]:
+				# 빈 교차 쌍은 update 에서 더 이상 보지 않도록 정리
+				del self._cross[key3]
+				self._last_diff.pop(key3, None)
+				pairs = self._cross_pairs[rule.ticker]
+				pairs.discard((rule.field, rule.ref))
+				if not pairs:
+					del self._cross_pairs[rule.ticker]
+		self._prune_fields(rule.ticker)
+
+	def _prune_fields(self, ticker: str) -> None:
+		"""규칙이 남지 않은 지표를 종목의 갱신 대상에서 제외"""
+		used = {f for f in self._fields.get(ticker, ()) if (ticker, f) in self._below or (ticker, f) in self._above}
+		for field, ref in self._cross_pairs.get(ticker, ()):
+			used.update((field, ref))
+		for field in self._fields.get(ticker, set()) - used:
+			self._last.pop((ticker, field), None)
+		if used:
+			self._fields[ticker] = used
+		else:
+			self._fields.pop(ticker, None)
+
+	def update(self, ticker: str, values: Mapping[str, float], now: Optional[float] = None) -> List[FiredAlert]:
+		"""종목의 지표 값 갱신 → 이번 갱신으로 조건이 새로 충족된 규칙 목록"""
+		fields = self._fields.get(ticker)
+		if not fields:
+			return []
+		now = time.time() if now is None else now
+		candidates: List[Tuple[str, float]] = []
+		for field in fields:
+			new = values.get(field)
+			if new is None or math.isnan(new):
+				continue
+			key = (ticker, field)
+			old = self._last.get(key)
+			self._last[key] = new
+			below = self._below.get(key)
+			if below and (old is None or new < old):
+				# 임계값 t 에 대해 old >= t > new 가 된 규칙 (처음 값이면 new < t 전체)
+				hi = math.inf if old is None else old
+				candidates.extend((rid, new) for rid in below.between(new, hi, False, True))
+			above = self._above.get(key)
+			if above and (old is None or new > old):
+				lo = -math.inf if old is None else old
+				candidates.extend((rid, new) for rid in above.between(lo, new, True, False))
+
+		for field, ref in self._cross_pairs.get(ticker, ()):
+			rule_ids = self._cross.get((ticker, field, ref))
+			a, b = values.get(field), values.get(ref)
+			if not rule_ids or a is None or b is None or math.isnan(a) or math.isnan(b):
+				continue
+			key3 = (ticker, field, ref)
+			diff = a - b
+			prev = self._last_diff.get(key3)
+			self._last_diff[key3] = diff
+			if prev is None:
+				continue
+			for rid in rule_ids:
+				op = self.rules[rid].op
+				if (op == "cross_above" and prev <= 0 < diff) or (op == "cross_below" and prev >= 0 > diff):
+					candidates.append((rid, a))
+
+		fired: List[FiredAlert] = []
+		seen = set()
+		for rid, value in candidates:
+			if rid in seen:
+				continue
+			seen.add(rid)
+			rule = self.rules[rid]
+			if now - self._last_fired.get(rid, -math.inf) < rule.cooldown:
+				continue
+			self._last_fired[rid] = now
+			fired.append(FiredAlert(rule, value, now))
+		return fired
+
+
+def load_rules(path: str) -> RuleEngine:
+	"""JSON 규칙 파일([{rule_id, user, ticker, field, op, threshold?, ref?, cooldown?}, ...]) 로드"""
+	engine = RuleEngine()
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			items = json.load(f)
+	except FileNotFoundError:
+		return engine
+	for item in items:
+		engine.add_rule(AlertRule(**item))
+	return engine
+
+
+def save_rules(engine: RuleEngine, path: str) -> None:
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump([asdict(r) for r in engine.rules.values()], f, ensure_ascii=False, indent=2)
+
+
+def format_alert(alert: FiredAlert) -> str:
+	r = alert.rule
+	if r.op in CROSS_OPS:
+		direction = "상향" if r.op == "cross_above" else "하향"
+		return f"🔔 {r.ticker} {r.field} 가 {r.ref} 를 {direction} 돌파 ({r.field} {alert.value:.2f})"
+	return f"🔔 {r.ticker} {r.field} {alert.value:.2f} ({r.op} {r.threshold:g})"
+
+
+if __name__ == "__main__":
+	import random
+
+	random.seed(0)
+	n_tickers, n_rules = 3000, 100_000
+	tickers = [f"{i:06d}" for i in range(n_tickers)]
+	engine = RuleEngine()
+	started = time.perf_counter()
+	for i in range(n_rules):
+		t = random.choice(tickers)
+		kind = random.random()
+		if kind < 0.45:
+			rule = AlertRule(f"r{i}", f"user{i % 5000}", t, "RSI", "<", float(random.randint(10, 40)), cooldown=0)
+		elif kind < 0.9:
+			rule = AlertRule(f"r{i}", f"user{i % 5000}", t, "Close", ">", random.uniform(90, 130), cooldown=0)
+		else:
+			rule = AlertRule(f"r{i}", f"user{i % 5000}", t, "MACD", "cross_above", ref="MACD_SIGNAL", cooldown=0)
+		engine.add_rule(rule)
+	print(f"📚 규칙 {len(engine):,}개 / 종목 {n_tickers:,}개 색인: {time.perf_counter() - started:.2f}s")
+
+	state = {t: {"RSI": 50.0, "Close": 100.0, "MACD": 0.0, "MACD_SIGNAL": 0.0} for t in tickers}
+	rounds = 20
+	fired = 0
+	started = time.perf_counter()
+	for _ in range(rounds):
+		for t in tickers:
+			s = state[t]
+			s["RSI"] = min(100.0, max(0.0, s["RSI"] + random.gauss(0, 3)))
+			s["Close"] *= 1 + random.gauss(0, 0.01)
+			s["MACD"] += random.gauss(0, 0.1)
+			s["MACD_SIGNAL"] += 0.2 * (s["MACD"] - s["MACD_SIGNAL"])
+			fired += len(engine.update(t, s))
+	elapsed = time.perf_counter() - started
+	updates = rounds * n_tickers
+	print(f"⚡ 업데이트 {updates:,}건 / {elapsed:.2f}s → {updates / elapsed:,.0f} updates/s, 발동 {fired:,}건")
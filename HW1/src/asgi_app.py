@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import mimetypes
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+REPORTS_DIR = os.path.join(ROOT_DIR, "reports")
+
+MAX_CONCURRENCY = int(os.getenv("ASGI_MAX_CONCURRENCY", "256"))  # 동시에 처리하는 요청 수 (초과 시 503)
+WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "8"))  # Flask 로 넘기는 요청의 스레드 수
+CACHE_BYTES = int(os.getenv("ASGI_CACHE_MB", "64")) * 1024 * 1024
+SHUTDOWN_TIMEOUT = 10.0
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class FileCache:
+	"""리포트 파일 메모리 캐시 (mtime 이 바뀌면 다시 읽음, 총 크기 제한 LRU)
+
+	디스크 읽기는 스레드로 넘겨 이벤트 루프를 막지 않는다.
+	"""
+
+	def __init__(self, max_bytes: int = CACHE_BYTES) -> None:
+		self.max_bytes = max_bytes
+		self.size = 0
+		self._entries: "OrderedDict[str, Tuple[float, bytes, str]]" = OrderedDict()
+
+	async def get(self, path: str) -> Optional[Tuple[bytes, str]]:
+		"""(내용, ETag) 또는 파일이 없으면 None"""
+		try:
+			mtime = os.stat(path).st_mtime
+		except OSError:
+			return None
+		entry = self._entries.get(path)
+		if entry and entry[0] == mtime:
+			self._entries.move_to_end(path)
+			return entry[1], entry[2]
+		try:
+			body = await asyncio.to_thread(_read_bytes, path)
+		except OSError:
+			return None
+		etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+		if entry:
+			self.size -= len(entry[1])
+		self._entries[path] = (mtime, body, etag)
+		self.size += len(body)
+		while self.size > self.max_bytes and len(self._entries) > 1:
+			_, (_, old, _) = self._entries.popitem(last=False)
+			self.size -= len(old)
+		return body, etag
+
+
+def _read_bytes(path: str) -> bytes:
+	with open(path, "rb") as f:
+		return f.read()
+
+
+def _safe_join(directory: str, name: str) -> Optional[str]:
+	path = os.path.normpath(os.path.join(directory, name))
+	return path if path.startswith(directory + os.sep) else None
+
+
+async def _respond(send: Send, status: int, body: bytes, content_type: str = "text/plain; charset=utf-8",
+                   headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+	base = [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())]
+	await send({"type": "http.response.start", "status": status, "headers": base + (headers or [])})
+	await send({"type": "http.response.body", "body": body})
+
+
+def _content_type(path: str) -> str:
+	ctype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+	return f"{ctype}; charset=utf-8" if ctype.startswith("text/") or ctype == "application/json" else ctype
+
+
+class WsgiBridge:
+	"""정적 경로가 아닌 요청을 기존 Flask 앱에 전달 (고정 크기 스레드 풀)"""
+
+	def __init__(self, threads: int = WSGI_THREADS) -> None:
+		self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="wsgi")
+		self._app = None
+
+	def _wsgi_app(self):
+		if self._app is None:
+			from web_app import app  # Flask 앱은 처음 필요할 때 로드
+			self._app = app
+		return self._app
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		body = b""
+		while True:
+			message = await receive()
+			body += message.get("body", b"")
+			if not message.get("more_body"):
+				break
+		loop = asyncio.get_running_loop()
+		status, headers, content = await loop.run_in_executor(self.pool, self._call_wsgi, scope, body)
+		await send({"type": "http.response.start", "status": status, "headers": headers})
+		await send({"type": "http.response.body", "body": content})
+
+	def _call_wsgi(self, scope: Scope, body: bytes) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+		server = scope.get("server") or ("localhost", 80)
+		environ = {
+			"REQUEST_METHOD": scope["method"],
+			"SCRIPT_NAME": "",
+			"PATH_INFO": scope["path"],
+			"QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+			"SERVER_NAME": str(server[0]),
+			"SERVER_PORT": str(server[1]),
+			"SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+			"wsgi.version": (1, 0),
+			"wsgi.url_scheme": scope.get("scheme", "http"),
+			"wsgi.input": io.BytesIO(body),
+			"wsgi.errors": sys.stderr,
+			"wsgi.multithread": True,
+			"wsgi.multiprocess": True,
+			"wsgi.run_once": False,
+		}
+		for name, value in scope.get("headers", []):
+			key = name.decode("latin-1").upper().replace("-", "_")
+			if key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+				environ[key] = value.decode("latin-1")
+			else:
+				environ[f"HTTP_{key}"] = value.decode("latin-1")
+		result: Dict[str, Any] = {}
+
+		def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+			result["status"] = int(status.split(" ", 1)[0])
+			result["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+
+		chunks = self._wsgi_app()(environ, start_response)
+		try:
+			content = b"".join(chunks)
+		finally:
+			if hasattr(chunks, "close"):
+				chunks.close()
+		return result["status"], result["headers"], content
+
+
+class ReportApp:
+	"""리포트 서빙용 ASGI 앱
+
+	- /report.txt, /report.json, /reports/<파일>: 발행 시 미리 렌더링된 파일을 메모리에서 제공 (ETag/304)
+	- 그 외 경로(/api/* 등): 기존 Flask 앱으로 전달
+	- 동시 처리 상한을 넘으면 503, 종료 시 진행 중인 요청이 끝날 때까지 대기
+	"""
+
+	def __init__(self, max_concurrency: int = MAX_CONCURRENCY) -> None:
+		self.cache = FileCache()
+		self.wsgi = WsgiBridge()
+		self.max_concurrency = max_concurrency
+		self.in_flight = 0
+		self.served = 0
+		self.started_at = time.time()
+		self._idle: Optional[asyncio.Event] = None
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] == "lifespan":
+			return await self._lifespan(receive, send)
+		if scope["type"] != "http":
+			return
+		if self.in_flight >= self.max_concurrency:
+			return await _respond(send, 503, "서버가 혼잡합니다. 잠시 후 다시 시도하세요.".encode("utf-8"),
+			                      headers=[(b"retry-after", b"1")])
+		self.in_flight += 1
+		if self._idle:
+			self._idle.clear()
+		try:
+			await self._dispatch(scope, receive, send)
+		finally:
+			self.in_flight -= 1
+			self.served += 1
+			if self.in_flight == 0 and self._idle:
+				self._idle.set()
+
+	async def _dispatch(self, scope: Scope, receive: Receive, send: Send) -> None:
+		path = unquote(scope["path"])
+		if scope["method"] in ("GET", "HEAD"):
+			if path == "/healthz":
+				body = f'{{"in_flight": {self.in_flight}, "served": {self.served}, "cache_bytes": {self.cache.size}}}'
+				return await _respond(send, 200, body.encode(), "application/json")
+			target = self._static_target(path)
+			if target and await self._send_file(scope, send, target):
+				return
+		# 미리 렌더링된 파일이 없는 .txt 등은 Flask 의 기존 처리(HTML 감싸기)를 그대로 사용
+		await self.wsgi(scope, receive, send)
+
+	@staticmethod
+	def _static_target(path: str) -> Optional[str]:
+		if path == "/report.txt":
+			return os.path.join(ROOT_DIR, "report.html")
+		if path == "/report.json":
+			return os.path.join(ROOT_DIR, "report.json")
+		if path.startswith("/reports/"):
+			name = path[len("/reports/"):]
+			stem, ext = os.path.splitext(name)
+			if ext == ".txt":
+				name = stem + ".html"
+			elif ext not in (".html", ".json"):
+				return None
+			return _safe_join(REPORTS_DIR, name)
+		return None
+
+	async def _send_file(self, scope: Scope, send: Send, path: str) -> bool:
+		cached = await self.cache.get(path)
+		if cached is None:
+			return False
+		body, etag = cached
+		headers = [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]
+		for name, value in scope.get("headers", []):
+			if name == b"if-none-match" and value.decode("latin-1") == etag:
+				await send({"type": "http.response.start", "status": 304, "headers": headers})
+				await send({"type": "http.response.body", "body": b""})
+				return True
+		if scope["method"] == "HEAD":
+			body = b""
+		await _respond(send, 200, body, _content_type(path), headers)
+		return True
+
+	async def _lifespan(self, receive: Receive, send: Send) -> None:
+		while True:
+			message = await receive()
+			if message["type"] == "lifespan.startup":
+				self._idle = asyncio.Event()
+				self._idle.set()
+				# 최신 리포트를 미리 메모리에 올려 첫 요청 폭주에 대비
+				for name in ("report.html", "report.json"):
+					await self.cache.get(os.path.join(ROOT_DIR, name))
+				await send({"type": "lifespan.startup.complete"})
+			elif message["type"] == "lifespan.shutdown":
+				try:
+					await asyncio.wait_for(self._idle.wait(), SHUTDOWN_TIMEOUT)
+				except asyncio.TimeoutError:
+					print(f"⚠️ 종료 대기 시간 초과: 처리 중 요청 {self.in_flight}건")
+				self.wsgi.pool.shutdown(wait=True)
+				await send({"type": "lifespan.shutdown.complete"})
+				return
+
+
+app = ReportApp()
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="리포트 웹 서버 (ASGI, 운영용)")
+	parser.add_argument("--host", default="0.0.0.0")
+	parser.add_argument("--port", type=int, default=5000)
+	parser.add_argument("--workers", type=int, default=2, help="프로세스 수")
+	args = parser.parse_args()
+
+	try:
+		import uvicorn
+	except ImportError:
+		raise SystemExit("❌ uvicorn 이 필요합니다: pip install uvicorn")
+
+	print(f"🚀 ASGI 웹 서버 시작: http://{args.host}:{args.port} (워커 {args.workers}개)")
+	uvicorn.run(
+		"asgi_app:app",
+		host=args.host,
+		port=args.port,
+		workers=args.workers,
+		limit_concurrency=MAX_CONCURRENCY * 2,  # 앱의 503 보다 먼저 소켓 단에서 과부하 차단
+		timeout_graceful_shutdown=SHUTDOWN_TIMEOUT,
+		app_dir=os.path.dirname(os.path.abspath(__file__)),
+		log_level="warning",
+	)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import AppConfig, Subscriber, load_subscribers
+from data_fetchers import fetch_kr_price_history, fetch_us_price_history
+from report import ReportRenderer, build_reco_item_kr, build_reco_item_us, KST
+from screener import screen_tickers
+
+REPORTS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "reports"))
+
+
+def is_kr_ticker(ticker: str) -> bool:
+	return len(ticker) == 6 and ticker.isdigit()
+
+
+def subscriber_ids(subscribers: List[Subscriber]) -> List[str]:
+	"""구독자별 고유 키 (파일명·링크 경로로 안전한 문자만, 중복이면 -2, -3 …)"""
+	ids: List[str] = []
+	seen = set()
+	for sub in subscribers:
+		base = re.sub(r"[^\w-]", "_", sub.id or sub.name).strip("_") or "subscriber"
+		key, n = base, 1
+		while key in seen:
+			n += 1
+			key = f"{base}-{n}"
+		seen.add(key)
+		ids.append(key)
+	return ids
+
+
+def collect_watch_items(tickers: Iterable[str], known: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+	"""전체 구독자의 관심 종목 합집합을 한 번만 조회·채점하여 종목별 추천 아이템 생성"""
+	items: Dict[str, Dict[str, Any]] = dict(known or {})
+	todo = sorted(set(tickers) - set(items))
+	kr = {t: fetch_kr_price_history(t) for t in todo if is_kr_ticker(t)}
+	us = {t: fetch_us_price_history(t) for t in todo if not is_kr_ticker(t)}
+	for ticker, df, meta in screen_tickers(kr, top_k=len(kr)):
+		items[ticker] = build_reco_item_kr(ticker, {**meta})
+	for ticker, df, meta in screen_tickers(us, top_k=len(us)):
+		items[ticker] = build_reco_item_us(ticker, {**meta})
+	return items
+
+
+def render_reports(subscribers: List[Subscriber], data: Dict[str, Any],
+                   watch_items: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, str]:
+	"""시장 계산 결과 하나로 모든 구독자의 리포트 렌더링 (subscriber_ids 키 → 리포트)"""
+	renderer = ReportRenderer(
+		data["kr_items"], data["us_items"], data["news_summary"],
+		watch_items=watch_items, now=data.get("last_update"),
+	)
+	return {key: renderer.render(sub.name, sub.market, sub.watchlist)
+	        for key, sub in zip(subscriber_ids(subscribers), subscribers)}
+
+
+def run_batch(subscribers: Optional[List[Subscriber]] = None, send: bool = False) -> Dict[str, str]:
+	from data_manager import data_manager
+
+	subscribers = subscribers if subscribers is not None else load_subscribers()
+	if not subscribers:
+		print("❌ 구독자가 없습니다 (subscribers.json 확인)")
+		return {}
+
+	print(f"👥 구독자 {len(subscribers)}명 리포트 생성 중...")
+	data = data_manager.get_fresh_data()
+	# 추천 종목은 이미 계산된 아이템을 재사용
+	known = {it["ticker"]: it for it in data["kr_items"] + data["us_items"]}
+	watch_items = collect_watch_items((t for sub in subscribers for t in sub.watchlist), known)
+
+	started = time.perf_counter()
+	reports = render_reports(subscribers, data, watch_items)
+	print(f"📝 {len(reports)}개 리포트 렌더링: {time.perf_counter() - started:.2f}s")
+
+	stamp = datetime.now(KST).strftime('%Y%m%d_%H%M%S')
+	out_dir = os.path.join(REPORTS_DIR, "batch", stamp)
+	os.makedirs(out_dir, exist_ok=True)
+	for key, text in reports.items():
+		with open(os.path.join(out_dir, f"{key}.txt"), "w", encoding="utf-8") as f:
+			f.write(text)
+	print("💾 리포트 저장:", out_dir)
+
+	if send:
+		from kakao import KakaoClient
+		client = KakaoClient(AppConfig.load())
+		for key, sub in zip(subscriber_ids(subscribers), subscribers):
+			if not sub.kakao_uuid:
+				continue
+			try:
+				client.send_to_friend([sub.kakao_uuid], reports[key], link_path=f"/reports/batch/{stamp}/{key}.txt")
+			except Exception as e:
+				print(f"❌ {sub.name} 전송 실패: {e}")
+	return reports
+
+
+if __name__ == "__main__":
+	import argparse
+	import random
+
+	parser = argparse.ArgumentParser(description="구독자별 리포트 일괄 생성")
+	parser.add_argument("--send", action="store_true", help="kakao_uuid 가 있는 구독자에게 전송")
+	parser.add_argument("--bench", type=int, default=0, help="가상 구독자 N명으로 렌더링 속도 측정")
+	args = parser.parse_args()
+
+	if not args.bench:
+		run_batch(send=args.send)
+	else:
+		item = {"ticker": "005930", "name": "삼성전자", "reason": "-", "entry": "-", "exit": "-",
+		        "close": 70000.0, "low_52w": 50000.0, "high_52w": 90000.0}
+		watch = {f"{i:06d}": {**item, "ticker": f"{i:06d}"} for i in range(200)}
+		data = {"kr_items": [item] * 3, "us_items": [item] * 3, "news_summary": "뉴스 요약"}
+		subs = [Subscriber(f"user{i}", random.sample(list(watch), 5), random.choice(["all", "kr", "us"]))
+		        for i in range(args.bench)]
+		started = time.perf_counter()
+		reports = render_reports(subs, data, watch)
+		elapsed = time.perf_counter() - started
+		print(f"📝 {len(reports):,}개 리포트 렌더링: {elapsed:.3f}s ({len(reports) / elapsed:,.0f}개/s)")
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from price_panel import DATA_DIR
+
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR") or os.path.join(DATA_DIR, "checkpoints")
+RESUME_WINDOW = float(os.getenv("CHECKPOINT_RESUME_MIN", "60")) * 60  # 이 시간 안에 진행된 미완료 실행만 이어서 진행
+KEEP_SECONDS = 3 * 86400  # 미완료 실행이라도 이보다 오래되면 삭제
+
+
+class Checkpoint:
+	"""실행(run_id) 하나의 단계별 출력 저장소
+
+	단계가 끝날 때마다 data/checkpoints/<run_id>/<단계>.pkl 로 원자적으로 저장하고,
+	재시도 시에는 저장된 출력을 Pipeline.run(initial=...) 에 넘겨 끝난 단계를 건너뛴다.
+	"""
+
+	def __init__(self, run_id: str, directory: str = CHECKPOINT_DIR) -> None:
+		self.run_id = run_id
+		self.path = os.path.join(directory, run_id)
+		os.makedirs(self.path, exist_ok=True)
+
+	def _file(self, name: str) -> str:
+		return os.path.join(self.path, f"{name}.pkl")
+
+	def __contains__(self, name: str) -> bool:
+		return os.path.exists(self._file(name))
+
+	def get(self, name: str, default: Any = None) -> Any:
+		try:
+			with open(self._file(name), "rb") as f:
+				return pickle.load(f)
+		except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+			if not isinstance(e, FileNotFoundError):
+				print(f"⚠️ 체크포인트 읽기 실패 ({self.run_id}/{name}): {e}")
+			return default
+
+	def load(self) -> Dict[str, Any]:
+		"""저장된 모든 단계 출력"""
+		outputs = {}
+		missing = object()
+		for name in self.completed():
+			value = self.get(name, missing)
+			if value is not missing:
+				outputs[name] = value
+		return outputs
+
+	def save(self, name: str, value: Any) -> None:
+		"""단계 출력 저장 (저장할 수 없는 값이면 건너뛰고 재시도 때 다시 계산)"""
+		tmp = f"{self._file(name)}.tmp{os.getpid()}"
+		try:
+			with open(tmp, "wb") as f:
+				pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+			os.replace(tmp, self._file(name))
+		except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+			print(f"⚠️ 체크포인트 저장 생략 ({name}): {e}")
+			if os.path.exists(tmp):
+				os.remove(tmp)
+
+	def completed(self) -> List[str]:
+		return sorted(f[:-4] for f in os.listdir(self.path) if f.endswith(".pkl"))
+
+	def finish(self) -> None:
+		"""실행이 끝까지 성공하면 체크포인트 삭제"""
+		shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _runs(directory: str) -> List[str]:
+	try:
+		return sorted(d for d in os.listdir(directory) if os.path.isdir(os.path.join(directory, d)))
+	except FileNotFoundError:
+		return []
+
+
+def resume_or_start(run_id: Optional[str] = None, directory: str = CHECKPOINT_DIR,
+                    window: float = RESUME_WINDOW) -> Checkpoint:
+	"""run_id 를 주면 그 실행을, 아니면 window 안에 마지막으로 진행된 미완료 실행을 이어서 진행
+
+	이어갈 실행이 없으면 새 run_id(시작 시각)로 시작한다. 오래된 체크포인트는 여기서 정리한다.
+	"""
+	cleanup(directory)
+	if run_id is None:
+		now = time.time()
+		for candidate in reversed(_runs(directory)):
+			if now - os.path.getmtime(os.path.join(directory, candidate)) < window:
+				run_id = candidate
+				break
+	if run_id is not None and os.path.isdir(os.path.join(directory, run_id)):
+		cp = Checkpoint(run_id, directory)
+		print(f"♻️ 실행 {run_id} 이어서 진행 (완료된 단계: {', '.join(cp.completed()) or '없음'})")
+		return cp
+	return Checkpoint(run_id or datetime.now().strftime("%Y%m%d_%H%M%S"), directory)
+
+
+def cleanup(directory: str = CHECKPOINT_DIR, keep: float = KEEP_SECONDS) -> int:
+	"""keep 초보다 오래된 실행 디렉터리 삭제"""
+	removed = 0
+	now = time.time()
+	for run_id in _runs(directory):
+		path = os.path.join(directory, run_id)
+		if now - os.path.getmtime(path) > keep:
+			shutil.rmtree(path, ignore_errors=True)
+			removed += 1
+	return removed
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="파이프라인 체크포인트 조회/정리")
+	parser.add_argument("--clean", action="store_true", help="오래된 체크포인트 삭제")
+	args = parser.parse_args()
+
+	if args.clean:
+		print(f"🧹 체크포인트 {cleanup()}개 삭제")
+	for run_id in _runs(CHECKPOINT_DIR):
+		print(f"{run_id}: {', '.join(Checkpoint(run_id).completed())}")
@@ -1,12 +1,13 @@
 import os
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
 TOKEN_STORE_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "token_store.json"))
+SUBSCRIBERS_PATH = os.getenv("SUBSCRIBERS_PATH") or os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "subscribers.json"))
 
 
 def _load_list_from_env(name: str, default: List[str]) -> List[str]:
@@ -16,6 +17,15 @@ def _load_list_from_env(name: str, default: List[str]) -> List[str]:
 	return [v.strip() for v in value.split(",") if v.strip()]
 
 
+def _load_optional_float(name: str, default: Optional[float]) -> Optional[float]:
+	value = os.getenv(name)
+	if value is None or value == "":
+		return default
+	if value.lower() in ("none", "off"):
+		return None
+	return float(value)
+
+
 @dataclass
 class AppConfig:
 	user_name: str
@@ -27,6 +37,12 @@ class AppConfig:
 	kakao_access_token: Optional[str]
 	kakao_refresh_token: Optional[str]
 	ngrok_url: str
+	kr_funnel_size: int = 30
+	max_pair_corr: Optional[float] = 0.7
+	memory_budget_mb: Optional[float] = None
+	memory_profile: bool = False
+	feature_export: bool = True
+	notify_mode: str = "auto"
 
 	@staticmethod
 	def load() -> "AppConfig":
@@ -40,9 +56,32 @@ class AppConfig:
 			kakao_access_token=os.getenv("KAKAO_ACCESS_TOKEN"),
 			kakao_refresh_token=os.getenv("KAKAO_REFRESH_TOKEN"),
 			ngrok_url=os.getenv("NGROK_URL", ""),
+			kr_funnel_size=int(os.getenv("KR_FUNNEL_SIZE", "30")),  # 1단계 필터 통과 후 시세 조회할 종목 수
+			max_pair_corr=_load_optional_float("MAX_PAIR_CORR", 0.7),  # 추천 종목 간 최대 수익률 상관 (none 이면 점수순)
+			memory_budget_mb=_load_optional_float("MEMORY_BUDGET_MB", None),  # RSS 상한 (넘을 것 같으면 나눠 처리, 넘으면 중단)
+			memory_profile=os.getenv("MEMORY_PROFILE", "").lower() in ("1", "true", "yes"),  # 단계별 tracemalloc 리포트
+			feature_export=os.getenv("FEATURE_EXPORT", "1").lower() not in ("0", "false", "no"),  # 스크리닝 지표 Parquet 저장 (pyarrow 설치 시)
+			notify_mode=os.getenv("NOTIFY_MODE", "auto").lower(),  # full / changes / auto (같은 날 재전송은 변경 요약)
 		)
 
 
+@dataclass
+class Subscriber:
+	name: str
+	watchlist: List[str] = field(default_factory=list)
+	market: str = "all"  # all / kr / us
+	kakao_uuid: Optional[str] = None  # 친구 메시지 전송용 (없으면 파일만 생성)
+	id: Optional[str] = None  # 리포트 파일명/링크 키 (없으면 이름에서 생성)
+
+
+def load_subscribers(path: str = SUBSCRIBERS_PATH) -> List[Subscriber]:
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			return [Subscriber(**item) for item in json.load(f)]
+	except FileNotFoundError:
+		return []
+
+
 def load_token_store() -> dict:
 	try:
 		with open(TOKEN_STORE_PATH, "r", encoding="utf-8") as f:
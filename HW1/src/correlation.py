@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from price_panel import PricePanel
+
+DEFAULT_WINDOW = 120  # 상관계수 계산에 쓰는 최근 수익률 개수 (약 6개월)
+BLOCK_ROWS = 512  # 블록 단위 행렬 곱의 행 수 (임시 메모리 ≈ BLOCK_ROWS × N × 8 bytes)
+
+
+def return_matrix(ticker_to_df: Mapping[str, pd.DataFrame], tickers: Sequence[str],
+                  window: int = DEFAULT_WINDOW) -> np.ndarray:
+	"""공통 날짜축 기준 최근 window 개 로그 수익률 (종목 수, window)
+
+	가격 패널이면 매핑된 종가 배열에서 바로 잘라내고, 아니면 종가를 날짜로 정렬한다.
+	거래가 없던 날의 수익률은 0 으로 둔다.
+	"""
+	if isinstance(ticker_to_df, PricePanel):
+		close = ticker_to_df.array("Close")
+		row_of = {t: i for i, t in enumerate(ticker_to_df.tickers)}
+		rows = [row_of[t] for t in tickers]
+		prices = np.asarray(close[rows, -(window + 1):], dtype=np.float64)
+	else:
+		frame = pd.concat({t: ticker_to_df[t]["Close"] for t in tickers}, axis=1, sort=True)
+		prices = frame.tail(window + 1).to_numpy(dtype=np.float64).T
+	if prices.size == 0:
+		return np.zeros((len(tickers), 0))
+	prices = pd.DataFrame(prices.T).ffill().to_numpy().T  # 중간 결측은 직전 종가 유지
+	with np.errstate(divide="ignore", invalid="ignore"):
+		rets = np.diff(np.log(prices), axis=1)
+	return np.nan_to_num(rets, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+class RollingCorrelation:
+	"""최근 window 개 수익률에 대한 N×N 상관행렬
+
+	합(Σx), 제곱합(Σx²), 교차곱(Σxxᵀ)만 유지하므로 새 봉이 들어오면
+	가장 오래된 수익률을 빼고 새 수익률을 더하는 rank-1 갱신으로 끝난다.
+	교차곱 초기 계산과 상관행렬 변환은 BLOCK_ROWS 행 단위 블록으로 나눠 임시 메모리를 제한한다.
+	"""
+
+	def __init__(self, tickers: Sequence[str], window: int = DEFAULT_WINDOW, block_rows: int = BLOCK_ROWS) -> None:
+		self.tickers: List[str] = list(tickers)
+		self.index: Dict[str, int] = {t: i for i, t in enumerate(self.tickers)}
+		self.window = window
+		self.block_rows = block_rows
+		n = len(self.tickers)
+		self._rets: Deque[np.ndarray] = deque()
+		self._sum = np.zeros(n)
+		self._sumsq = np.zeros(n)
+		self._cross = np.zeros((n, n))
+
+	@classmethod
+	def from_returns(cls, tickers: Sequence[str], returns: np.ndarray, window: Optional[int] = None,
+	                 block_rows: int = BLOCK_ROWS) -> "RollingCorrelation":
+		"""(종목 수, 기간) 수익률 행렬로 초기화"""
+		window = window or returns.shape[1]
+		rc = cls(tickers, window, block_rows)
+		returns = np.ascontiguousarray(returns[:, -window:], dtype=np.float64)
+		rc._rets.extend(returns.T.copy())
+		rc._sum = returns.sum(axis=1)
+		rc._sumsq = np.einsum("ij,ij->i", returns, returns)
+		for lo in range(0, len(rc.tickers), block_rows):
+			hi = lo + block_rows
+			rc._cross[lo:hi] = returns[lo:hi] @ returns.T
+		return rc
+
+	def __len__(self) -> int:
+		return len(self._rets)
+
+	def push(self, returns: np.ndarray) -> None:
+		"""새 봉의 종목별 수익률 (N,) 또는 여러 봉 (N, b) 반영"""
+		new = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+		if new.ndim == 1:
+			new = new[:, None]
+		cols = [new[:, j] for j in range(new.shape[1])]
+		signs = [1.0] * len(cols)
+		for col in cols:
+			self._rets.append(col)
+		while len(self._rets) > self.window:
+			cols.append(self._rets.popleft())
+			signs.append(-1.0)
+		update = np.stack(cols, axis=1)
+		weighted = update * np.asarray(signs)
+		self._sum += weighted.sum(axis=1)
+		self._sumsq += np.einsum("ij,ij->i", weighted, update)
+		# 추가/제거되는 봉을 한 번에 반영: Σxxᵀ += U·diag(s)·Uᵀ (블록 단위 제자리 갱신)
+		for lo in range(0, len(self.tickers), self.block_rows):
+			hi = lo + self.block_rows
+			self._cross[lo:hi] += weighted[lo:hi] @ update.T
+
+	def _stats(self):
+		n = max(len(self._rets), 1)
+		mean = self._sum / n
+		var = np.maximum(self._sumsq / n - mean * mean, 0.0)
+		std = np.sqrt(var)
+		return n, mean, np.where(std > 1e-12, std, np.inf)  # 변동이 없는 종목은 상관 0
+
+	def rows(self, idx: Sequence[int]) -> np.ndarray:
+		"""선택한 종목들과 전체 종목 사이의 상관계수 (len(idx), N)"""
+		n, mean, std = self._stats()
+		idx = np.asarray(idx, dtype=np.intp)
+		cov = self._cross[idx] / n - np.outer(mean[idx], mean)
+		return cov / np.outer(std[idx], std)
+
+	def matrix(self, dtype=np.float32) -> np.ndarray:
+		"""전체 N×N 상관행렬 (블록 단위로 변환)"""
+		n_t = len(self.tickers)
+		out = np.empty((n_t, n_t), dtype=dtype)
+		for lo in range(0, n_t, self.block_rows):
+			idx = np.arange(lo, min(lo + self.block_rows, n_t))
+			out[lo:lo + len(idx)] = self.rows(idx)
+		return out
+
+
+def greedy_decorrelated(order: Sequence[str], corr: RollingCorrelation, k: int, max_corr: float = 0.7) -> List[str]:
+	"""점수 순서대로 보면서 이미 고른 종목과의 상관이 max_corr 이하인 종목만 채택
+
+	조건을 만족하는 종목이 k 개가 안 되면 남은 자리는 점수 순으로 채운다.
+	"""
+	chosen: List[str] = []
+	chosen_rows: List[np.ndarray] = []
+	for ticker in order:
+		if len(chosen) >= k:
+			break
+		i = corr.index[ticker]
+		if any(row[i] > max_corr for row in chosen_rows):
+			continue
+		chosen.append(ticker)
+		chosen_rows.append(corr.rows([i])[0])
+	if len(chosen) < k:
+		chosen += [t for t in order if t not in chosen][:k - len(chosen)]
+	return chosen
+
+
+if __name__ == "__main__":
+	import time
+
+	rng = np.random.default_rng(0)
+	n_tickers, n_days, n_sectors = 3000, DEFAULT_WINDOW, 30
+	sector = rng.integers(0, n_sectors, n_tickers)
+	factors = rng.normal(0, 0.01, (n_sectors, n_days + 20))
+	rets = factors[sector] + rng.normal(0, 0.006, (n_tickers, n_days + 20))
+	tickers = [f"{i:06d}" for i in range(n_tickers)]
+
+	started = time.perf_counter()
+	rc = RollingCorrelation.from_returns(tickers, rets[:, :n_days])
+	print(f"🧮 {n_tickers:,}×{n_tickers:,} 교차곱 초기화: {time.perf_counter() - started:.2f}s")
+
+	started = time.perf_counter()
+	for j in range(n_days, n_days + 20):
+		rc.push(rets[:, j])
+	print(f"➕ 봉 20개 증분 갱신: {time.perf_counter() - started:.2f}s")
+
+	started = time.perf_counter()
+	mat = rc.matrix()
+	print(f"📐 상관행렬 변환: {time.perf_counter() - started:.2f}s ({mat.nbytes / 1e6:.0f}MB)")
+	ref = np.corrcoef(rets[:, -n_days:])
+	print(f"✅ np.corrcoef 대비 최대 오차: {np.abs(mat - ref).max():.2e}")
+
+	order = [str(t) for t in rng.permutation(tickers)]
+	picked = greedy_decorrelated(order, rc, k=10, max_corr=0.5)
+	print("🎯 선택:", picked, "섹터:", sorted({int(sector[rc.index[t]]) for t in picked}))
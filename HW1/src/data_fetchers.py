@@ -1,43 +1,123 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Tuple
+from typing import Optional, Tuple
 
 import FinanceDataReader as fdr
 import pandas as pd
 import yfinance as yf
 
+import provider_health
+from http_client import replayable
+from price_panel import history_path, open_panel
 
-def fetch_kr_price_history(ticker: str, period_days: int = 260) -> pd.DataFrame:
+EMPTY_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _from_history(market: str, ticker: str, start: dt.date, as_of: dt.date) -> Optional[pd.DataFrame]:
+	"""로컬 히스토리 패널에서 [start, as_of] 구간 시세 (없으면 None)"""
+	panel = open_panel(history_path(market))
+	if panel is None or ticker not in panel:
+		return None
+	df = panel.as_of(as_of).frame(ticker)
+	return df[df.index >= pd.Timestamp(start)]
+
+
+@replayable("kr_history")
+def fetch_kr_price_history(ticker: str, period_days: int = 260, as_of: Optional[dt.date] = None) -> pd.DataFrame:
 	"""Fetch KRX daily price history using FinanceDataReader.
 
+	as_of 를 주면 그 날짜(포함)까지의 봉만 반환하며, 로컬 히스토리 패널에 있으면 네트워크 없이 읽는다.
 	Returns columns: [Open, High, Low, Close, Volume]
 	"""
-	end = dt.date.today()
+	end = as_of or dt.date.today()
 	start = end - dt.timedelta(days=period_days * 2)
-	df = fdr.DataReader(ticker, start, end)
+	if as_of is not None:
+		df = _from_history("kr", ticker, start, as_of)
+		if df is not None:
+			return df
+	try:
+		# 차단기 + 적응형 타임아웃: 느린 응답 하나가 전체 새로고침을 붙잡지 않도록
+		df = provider_health.call("fdr_kr", fdr.DataReader, ticker, start, end)
+	except provider_health.ProviderUnavailable as e:
+		print(f"⚠️ KR 시세 조회 실패 ({ticker}): {e}")
+		df = None
 	if df is None or df.empty:
-		return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+		return pd.DataFrame(columns=EMPTY_COLUMNS)
 	df = df.rename(columns={"Open": "Open", "High": "High", "Low": "Low", "Close": "Close", "Volume": "Volume"})
 	df = df[["Open", "High", "Low", "Close", "Volume"]].dropna()
 	return df
 
 
-def fetch_us_price_history(ticker: str, period_days: int = 260) -> pd.DataFrame:
-	"""Fetch US daily price history using yfinance."""
-	period = f"{period_days}d"
+def _us_history_yf(ticker: str, period_days: int, as_of: Optional[dt.date] = None) -> pd.DataFrame:
 	yt = yf.Ticker(ticker)
-	df = yt.history(period=period, interval="1d", auto_adjust=False)
+	if as_of is None:
+		df = yt.history(period=f"{period_days}d", interval="1d", auto_adjust=False)
+	else:
+		start = as_of - dt.timedelta(days=period_days)
+		df = yt.history(start=start, end=as_of + dt.timedelta(days=1), interval="1d", auto_adjust=False)
 	if df is None or df.empty:
-		return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+		return pd.DataFrame(columns=EMPTY_COLUMNS)
 	df = df.rename(columns={"Open": "Open", "High": "High", "Low": "Low", "Close": "Close", "Volume": "Volume"})
 	df = df[["Open", "High", "Low", "Close", "Volume"]].dropna()
 	return df
 
 
+def _us_history_fdr(ticker: str, period_days: int, as_of: Optional[dt.date] = None) -> pd.DataFrame:
+	end = as_of or dt.date.today()
+	start = end - dt.timedelta(days=period_days)
+	df = fdr.DataReader(ticker, start, end)
+	if df is None or df.empty:
+		return pd.DataFrame(columns=EMPTY_COLUMNS)
+	return df[["Open", "High", "Low", "Close", "Volume"]].dropna()
+
+
+@replayable("us_history")
+def fetch_us_price_history(ticker: str, period_days: int = 260, as_of: Optional[dt.date] = None) -> pd.DataFrame:
+	"""Fetch US daily price history using yfinance.
+
+	yfinance 가 평소보다 느리거나 실패하면 FinanceDataReader 에 hedged 요청을 보내
+	먼저 도착한 유효한 결과를 사용한다. as_of 는 fetch_kr_price_history 와 같다.
+	"""
+	if as_of is not None:
+		df = _from_history("us", ticker, as_of - dt.timedelta(days=period_days), as_of)
+		if df is not None:
+			return df
+	try:
+		return provider_health.hedged(
+			[("yfinance", lambda: _us_history_yf(ticker, period_days, as_of)),
+			 ("fdr_us", lambda: _us_history_fdr(ticker, period_days, as_of))],
+			accept=lambda df: df is not None and not df.empty,
+		)
+	except provider_health.ProviderUnavailable as e:
+		print(f"⚠️ US 시세 조회 실패 ({ticker}): {e}")
+		return pd.DataFrame(columns=EMPTY_COLUMNS)
+
+
+@replayable("krx_listing")
+def get_krx_listing() -> pd.DataFrame:
+	"""KRX 전체 상장 목록 (FinanceDataReader)"""
+	return fdr.StockListing("KRX")
+
+
+@replayable("yf_info")
+def get_yf_info(ticker: str) -> dict:
+	"""yfinance 종목 정보 (시가총액, 현재가 등)"""
+	return yf.Ticker(ticker).info or {}
+
+
 def get_kr_ticker_name(ticker: str) -> str:
 	try:
-		info = fdr.StockListing("KRX")
+		from ticker_search import get_index  # 상장 목록 스냅샷으로 만든 인덱스 (코드 → 이름 O(1))
+
+		name = get_index().name(ticker, "kr")
+		if name:
+			return name
+	except Exception:
+		pass
+	try:
+		# 스냅샷 이후 신규 상장 등 인덱스에 없는 종목만 목록을 직접 조회
+		info = get_krx_listing()
 		row = info[info["Code"] == ticker]
 		if not row.empty:
 			return str(row.iloc[0]["Name"])
@@ -48,8 +128,7 @@ def get_kr_ticker_name(ticker: str) -> str:
 
 def get_us_ticker_name(ticker: str) -> str:
 	try:
-		info = yf.Ticker(ticker)
-		name = info.info.get("shortName") if hasattr(info, "info") else None
+		name = get_yf_info(ticker).get("shortName")
 		return name or ticker
 	except Exception:
 		return ticker
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import sqlite3
+
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Mapping, Optional
 import pytz
 
 from config import AppConfig
 from data_fetchers import fetch_kr_price_history, fetch_us_price_history
-from screener import screen_tickers
-from report import build_report, build_reco_item_kr, build_reco_item_us
+from screener import screen_tickers, screen_chunked, enriched_frames
+from report import Report, build_reco_item_kr, build_reco_item_us
 from news import fetch_market_headlines, summarize_news_openai
-from stock_selector import select_diverse_stocks
+from stock_selector import select_kr_candidates, get_us_top_stocks
+from pipeline import Pipeline, Stage
+from price_panel import write_panel, open_panel, panel_path
+from market_calendar import CALENDARS
+from reco_history import reco_history
+from memory_budget import MemoryBudget, MemoryBudgetExceeded
+from checkpoint import Checkpoint
+from feature_store import export_features, available as feature_store_available
+from snapshot_diff import build_snapshot, headlines_hash, load_snapshot, reuse_item
 
 
 class DataManager:
@@ -19,34 +29,139 @@ class DataManager:
     def __init__(self):
         self.cached_data = None
         self.last_update = None
-        self.cache_duration = timedelta(minutes=5)  # 5분 캐시
+        self.expires_at = None
+        self.cache_duration = timedelta(minutes=5)  # 장중 5분 캐시
+    
+    def _next_expiry(self, now: datetime) -> datetime:
+        """장중에는 5분, 장 마감 후·휴장일에는 다음 일봉 반영 시각까지 캐시 유지"""
+        return min(cal.cache_expiry(now, self.cache_duration) for cal in CALENDARS.values())
     
     def is_expired(self) -> bool:
         """캐시가 만료되었는지 확인"""
-        if not self.last_update:
+        if not self.last_update or not self.expires_at:
             return True
-        return datetime.now(pytz.timezone('Asia/Seoul')) - self.last_update > self.cache_duration
+        return datetime.now(pytz.timezone('Asia/Seoul')) >= self.expires_at
     
-    def get_fresh_data(self) -> Dict[str, Any]:
-        """최신 데이터를 가져오기 (캐시 사용)"""
+    def get_fresh_data(self, checkpoint: Optional[Checkpoint] = None) -> Dict[str, Any]:
+        """최신 데이터를 가져오기 (캐시 사용)
+
+        checkpoint 를 주면 단계별 출력을 저장하고, 이전 시도에서 끝난 단계는 건너뛴다.
+        """
         if not self.cached_data or self.is_expired():
             print("🔄 새로운 데이터 수집 중...")
-            self.cached_data = self._collect_data()
+            self.cached_data = self._collect_data(checkpoint)
             self.last_update = datetime.now(pytz.timezone('Asia/Seoul'))
-            print("✅ 데이터 수집 완료")
+            self.expires_at = self._next_expiry(self.last_update)
+            print(f"✅ 데이터 수집 완료 (캐시 만료: {self.expires_at:%m-%d %H:%M})")
         else:
             print("📋 캐시된 데이터 사용")
         
         return self.cached_data
     
-    def _collect_data(self) -> Dict[str, Any]:
-        """실제 데이터 수집 로직"""
+    @staticmethod
+    def _to_panel(market: str, ticker_to_df: Dict[str, pd.DataFrame]) -> Mapping[str, pd.DataFrame]:
+        """시세를 공유 패널 파일로 저장하고 읽기 전용으로 매핑 (웹/스케줄러와 공유)"""
+        try:
+            path = write_panel(panel_path(market), ticker_to_df)
+            return open_panel(path) or ticker_to_df
+        except OSError as e:
+            print(f"⚠️ 가격 패널 저장 실패 ({market}): {e}")
+            return ticker_to_df
+
+    def _build_pipeline(self, config: AppConfig, budget: Optional[MemoryBudget] = None,
+                        previous: Optional[Dict[str, Any]] = None) -> Pipeline:
+        """KR / US / 뉴스 분기를 독립 단계로 선언
+
+        previous(직전 발행 스냅샷)와 같은 종목·수치면 추천 아이템을, 같은 헤드라인이면 뉴스 요약을 재사용한다.
+        """
+        def build_items(selected, builder, market):
+            items = []
+            for ticker, df, meta in selected[:3]:
+                item, name = reuse_item(previous, market, ticker, meta)
+                items.append(item if item is not None else builder(ticker, {**meta}, name=name))
+            return items
+
+        def summarize(headlines):
+            if previous and previous.get("news_summary") and previous.get("headlines") == headlines_hash(headlines):
+                print("♻️ 헤드라인 변경 없음 - 직전 뉴스 요약 사용")
+                return previous["news_summary"]
+            return summarize_news_openai(headlines, config.openai_api_key)
+
+        check = budget.check if budget is not None and budget.budget is not None else None
+
+        def fetch_all(fetch, tickers):
+            prices = {}
+            for t in tickers:
+                if check is not None:
+                    check("시세 조회")  # 단계 도중에도 예산 초과 시 중단
+                prices[t] = fetch(t)
+            return prices
+
+        def market_stages(market: str, tickers_stage: Stage, fetch, n_tickers: int) -> List[Stage]:
+            chunk = budget.chunk_size(n_tickers) if budget else None
+            if chunk:
+                # 메모리 예산 모드: 전체 시세를 한꺼번에 들지 않고 청크 단위로 조회·채점 (가격 패널 갱신 생략)
+                print(f"🧠 메모리 예산: {market.upper()} 시세를 {chunk}개씩 나눠 처리")
+                screening = [Stage(f"{market}_selected", lambda ts: screen_chunked(
+                    fetch, ts, chunk, top_k=3, max_corr=config.max_pair_corr, check=check), (f"{market}_tickers",))]
+            else:
+                screening = [
+                    Stage(f"{market}_prices", lambda ts: fetch_all(fetch, ts), (f"{market}_tickers",)),
+                    Stage(f"{market}_panel", lambda m: self._to_panel(market, m), (f"{market}_prices",),
+                          checkpoint=False),  # 메모리 매핑 패널은 저장된 시세로 다시 만듦
+                    Stage(f"{market}_selected", lambda m: screen_tickers(m, top_k=3, max_corr=config.max_pair_corr),
+                          (f"{market}_panel",)),
+                ]
+                if config.feature_export and feature_store_available():
+                    # 분석용: 스크리닝한 모든 종목의 지표를 Parquet/Arrow 로 저장 (실패해도 리포트는 계속)
+                    screening.append(Stage(
+                        f"{market}_features",
+                        lambda m, sel: export_features(market, enriched_frames(m), [t for t, _, _ in sel]),
+                        (f"{market}_panel", f"{market}_selected"), optional=True))
+            builder = build_reco_item_kr if market == "kr" else build_reco_item_us
+            items = Stage(f"{market}_items", lambda sel: build_items(sel, builder, market), (f"{market}_selected",))
+            return [tickers_stage] + screening + [items]
+
+        stages = [
+            # 🇰🇷 KR 분기: 상장 목록 1단계 필터 → 시세 → 스크리닝 → 종목명 조회
+            *market_stages("kr", Stage("kr_tickers", lambda: select_kr_candidates(config.kr_funnel_size)),
+                           fetch_kr_price_history, config.kr_funnel_size),
+            # 🇺🇸 US 분기
+            *market_stages("us", Stage("us_tickers", lambda: get_us_top_stocks(15)), fetch_us_price_history, 15),
+            # 📰 뉴스 분기 (실패해도 뉴스 없이 리포트 생성)
+            Stage("headlines", fetch_market_headlines, optional=True, default=[]),
+            Stage("news_summary", summarize, ("headlines",), optional=True, default="뉴스 수집 실패"),
+        ]
+        if budget is not None:
+            for stage in stages:
+                stage.func = budget.wrap(stage.name, stage.func)
+        return Pipeline(stages)
+
+    def _collect_data(self, checkpoint: Optional[Checkpoint] = None) -> Dict[str, Any]:
+        """실제 데이터 수집 로직 (분기별 병렬 실행)"""
         config = AppConfig.load()
+        if checkpoint is not None and "collected" in checkpoint:
+            collected = checkpoint.get("collected")
+            if collected:
+                print("♻️ 체크포인트의 수집 결과 사용")
+                return collected
         
-        # 자동으로 종목 선별
         print("🔍 시장에서 종목을 자동 선별 중...")
-        kr_tickers, us_tickers = select_diverse_stocks(kr_limit=15, us_limit=15)
+        budget = MemoryBudget(config.memory_budget_mb, config.memory_profile)
+        # 프로파일링 시에는 단계별 할당이 섞이지 않도록 순차 실행
+        result = self._build_pipeline(config, budget, load_snapshot()).run(
+            initial=checkpoint.load() if checkpoint is not None else None,
+            max_workers=1 if budget.profile else 3,
+            on_complete=checkpoint.save if checkpoint is not None else None)
+        for name, seconds in result.timings.items():
+            print(f"⏱️ {name}: {seconds:.2f}s")
+        if budget.enabled:
+            print("🧠 메모리 리포트 저장:", budget.write_report())
+        if budget.tripped:
+            raise MemoryBudgetExceeded(budget.tripped)
         
+        kr_tickers = result.outputs.get("kr_tickers") or []
+        us_tickers = result.outputs.get("us_tickers") or []
         if not kr_tickers and not us_tickers:
             print("❌ 종목 선별에 실패했습니다.")
             return {
@@ -59,45 +174,50 @@ class DataManager:
         
         print(f"📊 한국 종목 {len(kr_tickers)}개, 미국 종목 {len(us_tickers)}개 선별 완료")
         
-        # 데이터 수집
-        kr_ticker_to_df = {t: fetch_kr_price_history(t) for t in kr_tickers}
-        us_ticker_to_df = {t: fetch_us_price_history(t) for t in us_tickers}
-        
-        # 스크리닝
-        kr_selected = screen_tickers(kr_ticker_to_df, top_k=3)
-        us_selected = screen_tickers(us_ticker_to_df, top_k=3)
+        # 한쪽 분기가 실패해도 나머지 결과로 리포트 생성
+        kr_items = result.outputs.get("kr_items") or []
+        us_items = result.outputs.get("us_items") or []
+        news_summary = result.outputs.get("news_summary") or "뉴스 수집 실패"
         
-        # 추천 아이템 생성
-        kr_items = []
-        for ticker, df, meta in kr_selected:
-            item = build_reco_item_kr(ticker, {**meta})
-            kr_items.append(item)
+        # 리포트 생성 (구조화된 모델 → 형식별 렌더링은 발행 시 한 번)
+        now = datetime.now(pytz.timezone('Asia/Seoul'))
+        report = Report(config.user_name, now, kr_items, us_items, news_summary)
+        self._record_picks(now, result.outputs, kr_items, us_items)
         
-        us_items = []
-        for ticker, df, meta in us_selected:
-            item = build_reco_item_us(ticker, {**meta})
-            us_items.append(item)
-        
-        # 뉴스 요약
-        headlines = fetch_market_headlines()
-        news_summary = summarize_news_openai(headlines, config.openai_api_key)
-        
-        # 리포트 생성
-        report_text = build_report(config.user_name, kr_items[:3], us_items[:3], news_summary)
-        
-        return {
-            'last_update': datetime.now(pytz.timezone('Asia/Seoul')),
-            'kr_items': kr_items[:3],
-            'us_items': us_items[:3],
+        collected = {
+            'last_update': now,
+            'kr_items': kr_items,
+            'us_items': us_items,
             'news_summary': news_summary,
-            'report_text': report_text
+            'report': report,
+            'report_text': report.to_text(),
+            # 직전 발행본과 비교해 변경분만 알리기 위한 스냅샷 (main.run_once)
+            'snapshot': build_snapshot(now, result.outputs, {"kr": kr_items, "us": us_items}, news_summary),
         }
+        if checkpoint is not None:
+            checkpoint.save("collected", collected)
+        return collected
+    
+    @staticmethod
+    def _record_picks(now: datetime, outputs: Dict[str, Any], kr_items: List[Dict[str, Any]],
+                      us_items: List[Dict[str, Any]]) -> None:
+        """추천 결과를 이력 저장소에 구조화해 저장하고 지난 추천의 수익률 갱신 (실패해도 리포트는 계속)"""
+        try:
+            reco_history.record(now, "kr", outputs.get("kr_selected") or [], kr_items)
+            reco_history.record(now, "us", outputs.get("us_selected") or [], us_items)
+            # 오늘 후보에서 빠진 지난 추천 종목의 시세도 받아 두어 수익률이 비지 않게 함
+            reco_history.update_prices("kr", fetch_kr_price_history, now)
+            reco_history.update_prices("us", fetch_us_price_history, now)
+            reco_history.evaluate(now)
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️ 추천 이력 저장 실패: {e}")
     
     def force_refresh(self) -> Dict[str, Any]:
         """강제로 데이터 새로고침"""
         print("🔄 강제 데이터 새로고침...")
         self.cached_data = None
         self.last_update = None
+        self.expires_at = None
         return self.get_fresh_data()
 
 
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+from price_panel import DATA_DIR
+
+try:
+	import pyarrow as pa  # type: ignore  # pyarrow (선택)
+	import pyarrow.dataset as ds  # type: ignore
+	import pyarrow.ipc as ipc  # type: ignore
+	import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover
+	pa = ds = ipc = pq = None  # type: ignore
+
+FEATURES_DIR = os.getenv("FEATURES_DIR") or os.path.join(DATA_DIR, "features")
+KEEP_SNAPSHOTS = 30  # 시장별로 남겨둘 스냅샷(일) 수
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+# 프로세스 안에서 바로 넘겨받을 수 있는 최신 특징 테이블 (시장 → pyarrow.Table)
+_latest: Dict[str, Any] = {}
+_latest_lock = threading.Lock()
+_warned = False
+
+
+def available() -> bool:
+	return pa is not None
+
+
+def _require() -> None:
+	if pa is None:
+		raise RuntimeError("pyarrow 가 설치되어 있지 않습니다 (pip install pyarrow)")
+
+
+def to_frame(frames: Mapping[str, pd.DataFrame], market: str, selected: Iterable[str] = ()) -> pd.DataFrame:
+	"""종목별 지표 프레임 → 긴 형식 한 장 (ticker, market, Date, selected + 지표 열)"""
+	picked = set(selected)
+	parts = []
+	for ticker, df in frames.items():
+		if df is None or df.empty:
+			continue
+		index = pd.DatetimeIndex(df.index)
+		part = df.reset_index(drop=True)
+		part.insert(0, "Date", index.tz_localize(None) if index.tz is not None else index)
+		part.insert(0, "selected", ticker in picked)
+		part.insert(0, "market", market)
+		part.insert(0, "ticker", ticker)
+		parts.append(part)
+	if not parts:
+		return pd.DataFrame(columns=["ticker", "market", "selected", "Date"])
+	out = pd.concat(parts, ignore_index=True)
+	out["Date"] = out["Date"].astype("datetime64[ns]")
+	return out
+
+
+def to_table(frames: Mapping[str, pd.DataFrame], market: str, selected: Iterable[str] = ()) -> "pa.Table":
+	_require()
+	return pa.Table.from_pandas(to_frame(frames, market, selected), preserve_index=False)
+
+
+def to_ipc(table: "pa.Table") -> "pa.Buffer":
+	"""Arrow IPC 스트림 버퍼 (from_ipc 로 복사 없이 다시 읽음)"""
+	_require()
+	sink = pa.BufferOutputStream()
+	with ipc.new_stream(sink, table.schema) as writer:
+		writer.write_table(table)
+	return sink.getvalue()
+
+
+def from_ipc(source: Union["pa.Buffer", bytes, str]) -> "pa.Table":
+	"""IPC 버퍼 또는 .arrows 파일 → 테이블 (파일은 메모리 매핑하므로 열 데이터를 복사하지 않음)"""
+	_require()
+	if isinstance(source, str):
+		source = pa.memory_map(source, "r")
+	return ipc.open_stream(source).read_all()
+
+
+def latest_table(market: str) -> Optional["pa.Table"]:
+	"""같은 프로세스에서 마지막으로 내보낸 테이블 (디스크를 거치지 않음)"""
+	with _latest_lock:
+		return _latest.get(market)
+
+
+def _snapshot_dir(market: str, day: DateLike, root: str) -> str:
+	return os.path.join(root, f"market={market}", f"snapshot={pd.Timestamp(day):%Y-%m-%d}")
+
+
+def _migrate(market: str, root: str) -> None:
+	"""예전 date=<스냅샷> 디렉터리를 snapshot=<스냅샷> 으로 이름 변경 (행 날짜로 오인되지 않도록)"""
+	base = os.path.join(root, f"market={market}")
+	try:
+		names = os.listdir(base)
+	except FileNotFoundError:
+		return
+	for name in names:
+		if name.startswith("date="):
+			target = os.path.join(base, "snapshot=" + name[len("date="):])
+			if os.path.exists(target):
+				shutil.rmtree(os.path.join(base, name), ignore_errors=True)
+			else:
+				os.replace(os.path.join(base, name), target)
+
+
+def _atomic(path: str, write) -> None:
+	tmp = f"{path}.tmp{os.getpid()}"
+	try:
+		write(tmp)
+		os.replace(tmp, path)
+	finally:
+		if os.path.exists(tmp):
+			os.remove(tmp)
+
+
+def export_features(market: str, frames: Mapping[str, pd.DataFrame], selected: Iterable[str] = (),
+                    root: str = FEATURES_DIR) -> Optional[str]:
+	"""스크리닝한 모든 종목의 지표 프레임을 Parquet 스냅샷 + Arrow IPC 스트림으로 저장
+
+	<root>/market=<시장>/snapshot=<마지막 봉 날짜>/part-0.parquet — 같은 날 다시 실행하면 덮어쓰고,
+	<root>/<시장>_latest.arrows 는 노트북에서 메모리 매핑으로 바로 여는 최신본이다.
+	스냅샷 하나에 전체 히스토리가 들어 있으므로 snapshot 은 행 날짜(Date)가 아니라 내보낸 날이며,
+	디렉터리 전체를 hive 형식으로 읽으면 스냅샷 수만큼 행이 중복된다 — 스냅샷 하나만 읽을 것.
+	"""
+	global _warned
+	if pa is None:
+		if not _warned:
+			print("⚠️ pyarrow 가 없어 특징 내보내기를 건너뜁니다 (pip install pyarrow)")
+			_warned = True
+		return None
+	frame = to_frame(frames, market, selected)
+	if frame.empty:
+		return None
+	day = frame["Date"].max()
+	# 날짜 범위 조회 시 행 그룹 통계로 건너뛸 수 있도록 날짜순으로 저장
+	frame = frame.sort_values(["Date", "ticker"], kind="stable", ignore_index=True)
+	table = pa.Table.from_pandas(frame, preserve_index=False)
+	with _latest_lock:
+		_latest[market] = table
+
+	_migrate(market, root)
+	directory = _snapshot_dir(market, day, root)
+	os.makedirs(directory, exist_ok=True)
+	path = os.path.join(directory, "part-0.parquet")
+	_atomic(path, lambda tmp: pq.write_table(table, tmp, compression="zstd", row_group_size=16384))
+
+	def write_stream(tmp: str) -> None:
+		with pa.OSFile(tmp, "wb") as sink, ipc.new_stream(sink, table.schema) as writer:
+			writer.write_table(table)
+
+	_atomic(os.path.join(root, f"{market}_latest.arrows"), write_stream)
+	_prune(market, root)
+	return path
+
+
+def _prune(market: str, root: str, keep: int = KEEP_SNAPSHOTS) -> None:
+	for day in snapshots(market, root)[:-keep]:
+		shutil.rmtree(_snapshot_dir(market, day, root), ignore_errors=True)
+
+
+def snapshots(market: str, root: str = FEATURES_DIR) -> List[str]:
+	"""저장된 스냅샷 날짜 (오래된 순)"""
+	try:
+		names = os.listdir(os.path.join(root, f"market={market}"))
+	except FileNotFoundError:
+		return []
+	return sorted(n[len("snapshot="):] for n in names if n.startswith("snapshot="))
+
+
+def load_features(market: str = "kr", columns: Optional[Sequence[str]] = None, start: Optional[DateLike] = None,
+                  end: Optional[DateLike] = None, tickers: Optional[Sequence[str]] = None,
+                  snapshot: Optional[DateLike] = None, root: str = FEATURES_DIR,
+                  as_arrow: bool = False) -> Union[pd.DataFrame, "pa.Table"]:
+	"""저장된 특징에서 필요한 열·기간·종목만 읽기 (데이터 제공자 호출 없음)
+
+	스냅샷마다 그날 스크리닝한 종목의 전체 히스토리가 들어 있으므로 기본은 snapshot 날짜 이전의
+	가장 최근 스냅샷 하나를 읽는다. 열은 Parquet 열 단위로, 기간/종목은 행 그룹 통계로 걸러
+	필요한 부분만 디스크에서 읽는다.
+	"""
+	_require()
+	days = [d for d in snapshots(market, root) if snapshot is None or d <= f"{pd.Timestamp(snapshot):%Y-%m-%d}"]
+	if not days:
+		raise FileNotFoundError(f"{market} 특징 스냅샷이 없습니다: {root}")
+	dataset = ds.dataset(os.path.join(_snapshot_dir(market, days[-1], root), "part-0.parquet"), format="parquet")
+
+	cond = None
+	for expr in (ds.field("Date") >= pd.Timestamp(start).to_pydatetime() if start is not None else None,
+	             ds.field("Date") <= pd.Timestamp(end).to_pydatetime() if end is not None else None,
+	             ds.field("ticker").isin(list(tickers)) if tickers else None):
+		if expr is not None:
+			cond = expr if cond is None else cond & expr
+	if columns is not None:
+		# 어느 종목·날짜의 값인지는 항상 함께 돌려줌
+		columns = list(dict.fromkeys(["ticker", "Date", *columns]))
+	table = dataset.to_table(columns=columns, filter=cond)
+	return table if as_arrow else table.to_pandas()
+
+
+if __name__ == "__main__":
+	import argparse
+	import time
+
+	parser = argparse.ArgumentParser(description="저장된 지표 특징 조회 (Parquet / Arrow IPC)")
+	parser.add_argument("--market", default="kr", choices=["kr", "us"])
+	parser.add_argument("--columns", help="쉼표로 구분한 열 (기본: 전체)")
+	parser.add_argument("--start")
+	parser.add_argument("--end")
+	parser.add_argument("--tickers", help="쉼표로 구분한 종목 코드")
+	parser.add_argument("--snapshot", help="이 날짜 이전의 최신 스냅샷 (기본: 가장 최근)")
+	parser.add_argument("--ipc", action="store_true", help="Parquet 대신 <시장>_latest.arrows 를 메모리 매핑으로 읽기")
+	args = parser.parse_args()
+
+	print(f"📦 {args.market.upper()} 스냅샷: {', '.join(snapshots(args.market)) or '없음'}")
+	started = time.perf_counter()
+	if args.ipc:
+		result = from_ipc(os.path.join(FEATURES_DIR, f"{args.market}_latest.arrows")).to_pandas()
+	else:
+		result = load_features(args.market, args.columns.split(",") if args.columns else None, args.start, args.end,
+		                       args.tickers.split(",") if args.tickers else None, args.snapshot)
+	print(f"⏱️ {len(result):,}행 × {result.shape[1]}열 읽기: {(time.perf_counter() - started) * 1000:.0f}ms")
+	print(result.tail(10).to_string())
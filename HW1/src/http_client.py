@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.getenv("HTTP_CACHE_DIR") or os.path.join(ROOT_DIR, "data", "http_cache")
+FIXTURES_DIR = os.getenv("HTTP_FIXTURES_DIR") or os.path.join(ROOT_DIR, "fixtures")
+
+# live: 실제 네트워크 / record: 실제 응답을 fixture 로 저장 / replay: fixture 만 사용 (오프라인)
+MODE = os.getenv("HTTP_MODE", "live").lower()
+
+# 토큰이 오가는 요청은 기록하지 않음 (fixture 가 공유·커밋될 수 있으므로)
+AUTH_HOSTS = ("kauth.kakao.com",)
+SECRET_FIELDS = ("access_token", "refresh_token", "client_secret", "password")
+
+DEFAULT_TIMEOUT = 10
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+class ReplayMissError(requests.ConnectionError):
+	"""replay 모드에서 기록된 fixture 가 없을 때"""
+
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def session_for(url: str) -> requests.Session:
+	"""호스트별로 재사용되는 커넥션 풀 세션"""
+	host = urlsplit(url).netloc
+	with _sessions_lock:
+		sess = _sessions.get(host)
+		if sess is None:
+			sess = requests.Session()
+			adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+			sess.mount("https://", adapter)
+			sess.mount("http://", adapter)
+			sess.headers["User-Agent"] = USER_AGENT
+			_sessions[host] = sess
+		return sess
+
+
+def _request_key(method: str, url: str, params: Any = None, data: Any = None) -> str:
+	payload = json.dumps([method.upper(), url, params, data], sort_keys=True, default=str, ensure_ascii=False)
+	return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def is_sensitive(url: str, headers: Optional[Dict[str, str]] = None, data: Any = None) -> bool:
+	"""인증 호스트, Authorization 헤더, 토큰/비밀번호 필드를 담은 요청"""
+	if urlsplit(url).hostname in AUTH_HOSTS:
+		return True
+	if headers and any(k.lower() == "authorization" for k in headers):
+		return True
+	return isinstance(data, dict) and any(k in data for k in SECRET_FIELDS)
+
+
+def _returns_secret(resp: requests.Response) -> bool:
+	"""응답 본문(JSON)에 토큰 필드가 있는지"""
+	if "json" not in resp.headers.get("Content-Type", "") and not resp.content.lstrip().startswith(b"{"):
+		return False
+	try:
+		payload = resp.json()
+	except ValueError:
+		return False
+	return isinstance(payload, dict) and any(k in payload for k in SECRET_FIELDS)
+
+
+def _to_response(entry: Dict[str, Any], from_cache: bool = False) -> requests.Response:
+	resp = requests.Response()
+	resp.from_cache = from_cache  # 네트워크를 거치지 않은 응답 (지연 시간 통계에서 제외)
+	resp.status_code = entry["status"]
+	resp.headers = CaseInsensitiveDict(entry["headers"])
+	resp._content = base64.b64decode(entry["content"])
+	resp.url = entry["url"]
+	resp.encoding = entry.get("encoding")
+	return resp
+
+
+def _to_entry(resp: requests.Response) -> Dict[str, Any]:
+	return {
+		"status": resp.status_code,
+		"headers": dict(resp.headers),
+		"content": base64.b64encode(resp.content).decode("ascii"),
+		"url": resp.url,
+		"encoding": resp.encoding,
+		"stored_at": time.time(),
+	}
+
+
+def _json_default(value: Any) -> Any:
+	if isinstance(value, (pd.Timestamp, np.datetime64)):
+		return pd.Timestamp(value).isoformat()
+	if isinstance(value, np.generic):
+		return value.item()
+	return str(value)
+
+
+def _encode(value: Any) -> Any:
+	"""호출 결과 → JSON 값 (DataFrame 은 열/인덱스/dtype 을 함께 저장)"""
+	if isinstance(value, pd.DataFrame):
+		index = value.index
+		is_dates = isinstance(index, pd.DatetimeIndex)
+		return {"__frame__": {
+			"columns": list(value.columns),
+			"dtypes": [str(t) for t in value.dtypes],
+			"index": [ts.isoformat() for ts in index] if is_dates else index.tolist(),
+			"index_name": index.name,
+			"dates": is_dates,
+			"data": value.astype(object).where(value.notna(), None).values.tolist(),
+		}}
+	return value
+
+
+def _decode(value: Any) -> Any:
+	if not (isinstance(value, dict) and "__frame__" in value):
+		return value
+	spec = value["__frame__"]
+	index = pd.DatetimeIndex(spec["index"], name=spec["index_name"]) if spec["dates"] \
+		else pd.Index(spec["index"], name=spec["index_name"])
+	df = pd.DataFrame(spec["data"], columns=spec["columns"], index=index)
+	for column, dtype in zip(spec["columns"], spec["dtypes"]):
+		try:
+			df[column] = df[column].astype(dtype)
+		except (TypeError, ValueError):
+			pass
+	return df
+
+
+def _read_json(path: str) -> Optional[Any]:
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			return json.load(f)
+	except (OSError, ValueError):
+		return None
+
+
+def _write_json(path: str, value: Any) -> None:
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	tmp = f"{path}.tmp{os.getpid()}"
+	with open(tmp, "w", encoding="utf-8") as f:
+		json.dump(value, f, ensure_ascii=False, default=_json_default)
+	os.replace(tmp, path)
+
+
+def _freshness(headers: Dict[str, str], stored_at: float) -> Tuple[float, bool]:
+	"""(만료 시각, 저장 가능 여부) - Cache-Control / Expires 헤더 기준"""
+	cc = {}
+	for part in headers.get("Cache-Control", headers.get("cache-control", "")).split(","):
+		k, _, v = part.strip().partition("=")
+		if k:
+			cc[k.lower()] = v.strip('"')
+	if "no-store" in cc:
+		return stored_at, False
+	if "no-cache" in cc:
+		return stored_at, True
+	if "max-age" in cc:
+		try:
+			return stored_at + int(cc["max-age"]), True
+		except ValueError:
+			pass
+	expires = headers.get("Expires") or headers.get("expires")
+	if expires:
+		try:
+			return parsedate_to_datetime(expires).timestamp(), True
+		except (TypeError, ValueError):
+			pass
+	return stored_at, True
+
+
+def _fixture_path(key: str) -> str:
+	return os.path.join(FIXTURES_DIR, "http", f"{key}.json")
+
+
+def _send(method: str, url: str, key: str, **kwargs: Any) -> requests.Response:
+	sensitive = is_sensitive(url, kwargs.get("headers"), kwargs.get("data"))
+	if MODE == "replay":
+		if sensitive:
+			raise ReplayMissError(f"인증 요청은 기록/재생하지 않습니다: {method} {url}")
+		entry = _read_json(_fixture_path(key))
+		if entry is None:
+			raise ReplayMissError(f"기록된 응답 없음: {method} {url}")
+		return _to_response(entry, from_cache=True)
+	resp = session_for(url).request(method, url, **kwargs)
+	if MODE == "record" and not sensitive and not _returns_secret(resp):
+		_write_json(_fixture_path(key), _to_entry(resp))
+	return resp
+
+
+def get(url: str, headers: Optional[Dict[str, str]] = None, params: Any = None,
+        timeout: float = DEFAULT_TIMEOUT, min_ttl: float = 0.0, cache: bool = True) -> requests.Response:
+	"""디스크 캐시를 거치는 GET
+
+	응답의 Cache-Control/Expires 로 신선도를 판단하고, 만료된 항목은 ETag/Last-Modified 로
+	조건부 요청을 보낸다. min_ttl 을 주면 헤더와 관계없이 그 시간 동안은 캐시를 사용한다.
+	네트워크 없이 캐시/fixture 에서 돌려준 응답은 resp.from_cache 가 True 다.
+	record 모드에서는 디스크 캐시를 읽지 않고 매번 요청해 fixture 를 남긴다.
+	"""
+	key = _request_key("GET", url, params)
+	if MODE == "replay":
+		return _send("GET", url, key)
+	if not cache or is_sensitive(url, headers):
+		# 인증된 요청은 사용자별 응답이므로 디스크에 저장하지 않음
+		return _send("GET", url, key, headers=headers, params=params, timeout=timeout)
+	cache_path = os.path.join(CACHE_DIR, f"{key}.json")
+	# record 모드는 캐시 적중/304 로 fixture 가 빠지지 않도록 항상 전체 응답을 받아 기록 (캐시는 갱신)
+	cached = _read_json(cache_path) if MODE != "record" else None
+	now = time.time()
+	req_headers = dict(headers or {})
+	if cached:
+		expires_at = max(cached["expires_at"], cached["stored_at"] + min_ttl)
+		if now < expires_at:
+			return _to_response(cached, from_cache=True)
+		if cached["headers"].get("ETag"):
+			req_headers["If-None-Match"] = cached["headers"]["ETag"]
+		if cached["headers"].get("Last-Modified"):
+			req_headers["If-Modified-Since"] = cached["headers"]["Last-Modified"]
+
+	resp = _send("GET", url, key, headers=req_headers, params=params, timeout=timeout)
+	if resp.status_code == 304 and cached:
+		cached["stored_at"] = now
+		cached["expires_at"], _ = _freshness(dict(resp.headers) or cached["headers"], now)
+		_write_json(cache_path, cached)
+		return _to_response(cached)
+	if resp.status_code == 200:
+		entry = _to_entry(resp)
+		entry["expires_at"], storable = _freshness(entry["headers"], entry["stored_at"])
+		if storable:
+			try:
+				_write_json(cache_path, entry)
+			except OSError as e:
+				print(f"⚠️ HTTP 캐시 저장 실패: {e}")
+	return resp
+
+
+def post(url: str, headers: Optional[Dict[str, str]] = None, data: Any = None,
+         timeout: float = DEFAULT_TIMEOUT) -> requests.Response:
+	"""캐시하지 않는 POST (커넥션 재사용 + record/replay 만 적용)"""
+	key = _request_key("POST", url, None, data)
+	return _send("POST", url, key, headers=headers, data=data, timeout=timeout)
+
+
+def replayable(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+	"""HTTP 를 직접 다루지 않는 라이브러리 호출(fdr, yfinance)의 결과를 record/replay
+
+	인자로 키를 만들어 반환값을 JSON 으로 저장/재생한다. live 모드에서는 아무 일도 하지 않는다.
+	"""
+	def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+		@functools.wraps(func)
+		def wrapper(*args: Any, **kwargs: Any) -> Any:
+			if MODE not in ("record", "replay"):
+				return func(*args, **kwargs)
+			key = _request_key("CALL", name, list(args), kwargs)
+			path = os.path.join(FIXTURES_DIR, "calls", name, f"{key}.json")
+			if MODE == "replay":
+				stored = _read_json(path)
+				if stored is None:
+					raise ReplayMissError(f"기록된 호출 결과 없음: {name}{args}")
+				return _decode(stored["value"])
+			value = func(*args, **kwargs)
+			_write_json(path, {"value": _encode(value)})
+			return value
+		return wrapper
+	return decorator
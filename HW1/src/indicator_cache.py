@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+TAIL_ROWS = 64  # 해시에 포함할 최근 봉 개수
+
+
+def make_key(ticker: str, df: pd.DataFrame, params: Any) -> str:
+	"""(종목, 마지막 봉 시각, 최근 봉 내용 해시, 지표 파라미터) 캐시 키"""
+	h = hashlib.sha1()
+	h.update(ticker.encode("utf-8"))
+	h.update(str(len(df)).encode())
+	h.update(str(df.index[-1]).encode() if len(df) else b"")
+	cols = [c for c in ("Open", "High", "Low", "Close", "Volume") if c in df.columns]
+	tail = np.ascontiguousarray(df[cols].tail(TAIL_ROWS).to_numpy(dtype=np.float64))
+	h.update(tail.tobytes())
+	h.update(repr(params).encode("utf-8"))
+	return h.hexdigest()
+
+
+class IndicatorCache:
+	"""메모리 LRU + (선택) 디스크 2단계 지표 캐시
+
+	일봉은 장 마감 전에는 바뀌지 않으므로, 같은 히스토리에 대한 반복 새로고침은
+	지표 재계산 없이 캐시에서 바로 응답한다.
+	"""
+
+	def __init__(self, max_entries: int = 2048, disk_dir: Optional[str] = None) -> None:
+		self.max_entries = max_entries
+		self.disk_dir = disk_dir
+		self._mem: "OrderedDict[str, Any]" = OrderedDict()
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+		if disk_dir:
+			os.makedirs(disk_dir, exist_ok=True)
+
+	def _disk_path(self, key: str) -> str:
+		return os.path.join(self.disk_dir or "", f"{key}.pkl")
+
+	def get(self, key: str) -> Optional[Any]:
+		with self._lock:
+			if key in self._mem:
+				self._mem.move_to_end(key)
+				self.hits += 1
+				return self._mem[key]
+		if self.disk_dir:
+			try:
+				with open(self._disk_path(key), "rb") as f:
+					value = pickle.load(f)
+			except (OSError, pickle.UnpicklingError, EOFError):
+				value = None
+			if value is not None:
+				self._put_mem(key, value)
+				self.hits += 1
+				return value
+		self.misses += 1
+		return None
+
+	def put(self, key: str, value: Any) -> None:
+		self._put_mem(key, value)
+		if self.disk_dir:
+			tmp = f"{self._disk_path(key)}.tmp{os.getpid()}"
+			try:
+				with open(tmp, "wb") as f:
+					pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+				os.replace(tmp, self._disk_path(key))
+			except OSError as e:
+				print(f"⚠️ 지표 캐시 디스크 저장 실패: {e}")
+
+	def _put_mem(self, key: str, value: Any) -> None:
+		with self._lock:
+			self._mem[key] = value
+			self._mem.move_to_end(key)
+			while len(self._mem) > self.max_entries:
+				self._mem.popitem(last=False)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._mem.clear()
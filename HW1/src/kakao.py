@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import time
 from typing import Optional, Dict, Any
-import requests
+import http_client
 
 from config import AppConfig, load_token_store, save_token_store
 
@@ -31,7 +31,7 @@ class KakaoClient:
 			"client_id": self.config.kakao_client_id,
 			"refresh_token": refresh_token,
 		}
-		resp = requests.post(f"{KAKAO_AUTH_HOST}/oauth/token", data=data, timeout=10)
+		resp = http_client.post(f"{KAKAO_AUTH_HOST}/oauth/token", data=data, timeout=10)
 		resp.raise_for_status()
 		payload = resp.json()
 		access_token = payload.get("access_token")
@@ -102,19 +102,19 @@ class KakaoClient:
 		
 		# form-data 형식으로 전송
 		data = {"template_object": json_dumps(payload)}
-		resp = requests.post(url, headers=headers, data=data, timeout=10)
+		resp = http_client.post(url, headers=headers, data=data, timeout=10)
 		
 		if resp.status_code == 401:
 			self._refresh_access_token()
 			headers = self._get_auth_header()
 			headers["Content-Type"] = "application/x-www-form-urlencoded"
-			resp = requests.post(url, headers=headers, data=data, timeout=10)
+			resp = http_client.post(url, headers=headers, data=data, timeout=10)
 		resp.raise_for_status()
 
 	def list_friends(self) -> Any:
 		url = f"{KAKAO_API_HOST}/v1/api/talk/friends"
 		headers = self._get_auth_header()
-		resp = requests.get(url, headers=headers, timeout=10)
+		resp = http_client.get(url, headers=headers, timeout=10, cache=False)
 		resp.raise_for_status()
 		return resp.json()
 
@@ -138,11 +138,11 @@ class KakaoClient:
 			
 		headers = self._get_auth_header()
 		data = {"receiver_uuids": json_dumps(uuids), "template_object": json_dumps(payload)}
-		resp = requests.post(url, headers=headers, data=data, timeout=10)
+		resp = http_client.post(url, headers=headers, data=data, timeout=10)
 		if resp.status_code == 401:
 			self._refresh_access_token()
 			headers = self._get_auth_header()
-			resp = requests.post(url, headers=headers, data=data, timeout=10)
+			resp = http_client.post(url, headers=headers, data=data, timeout=10)
 		resp.raise_for_status()
 
 
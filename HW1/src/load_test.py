@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+
+REPORTS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "reports"))
+CONCURRENCY = (1, 10, 50, 100)
+
+
+def latest_report_path() -> Optional[str]:
+	"""reports/ 에서 가장 최근 개별 리포트 (.txt) 의 URL 경로"""
+	try:
+		names = [n for n in os.listdir(REPORTS_DIR) if n.endswith(".txt")]
+	except FileNotFoundError:
+		return None
+	if not names:
+		return None
+	latest = max(names, key=lambda n: os.path.getmtime(os.path.join(REPORTS_DIR, n)))
+	return f"/reports/{latest}"
+
+
+async def _worker(client: httpx.AsyncClient, path: str, deadline: float, latencies: List[float], errors: List[int]) -> None:
+	while time.perf_counter() < deadline:
+		started = time.perf_counter()
+		try:
+			res = await client.get(path)
+			await res.aread()
+			ok = res.status_code == 200
+		except httpx.HTTPError:
+			ok = False
+		if ok:
+			latencies.append(time.perf_counter() - started)
+		else:
+			errors.append(1)
+
+
+async def run_level(client: httpx.AsyncClient, path: str, concurrency: int, duration: float) -> Dict[str, float]:
+	"""concurrency 개 연결이 duration 초 동안 path 를 반복 요청"""
+	latencies: List[float] = []
+	errors: List[int] = []
+	started = time.perf_counter()
+	deadline = started + duration
+	await asyncio.gather(*[_worker(client, path, deadline, latencies, errors) for _ in range(concurrency)])
+	elapsed = time.perf_counter() - started
+	lat = np.array(latencies) * 1000 if latencies else np.array([np.nan])
+	return {
+		"requests": len(latencies),
+		"errors": len(errors),
+		"rps": len(latencies) / elapsed,
+		"p50_ms": float(np.percentile(lat, 50)),
+		"p99_ms": float(np.percentile(lat, 99)),
+	}
+
+
+async def load_test(base_url: str, paths: Sequence[str], levels: Sequence[int] = CONCURRENCY, duration: float = 5.0,
+                    transport: Optional[httpx.AsyncBaseTransport] = None) -> List[Dict]:
+	"""경로 × 동시 연결 수마다 p50/p99 지연과 처리량을 측정"""
+	limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+	results = []
+	async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30, transport=transport) as client:
+		for path in paths:
+			await client.get(path)  # 워밍업 (서버 캐시 적재)
+			for level in levels:
+				row = {"path": path, "concurrency": level, **await run_level(client, path, level, duration)}
+				results.append(row)
+				print(f"  {path:<32} c={level:<4} {row['rps']:>9,.0f} req/s  p50 {row['p50_ms']:7.2f}ms  "
+				      f"p99 {row['p99_ms']:7.2f}ms  오류 {row['errors']}")
+	return results
+
+
+async def _in_process(paths: Sequence[str], levels: Sequence[int], duration: float) -> List[Dict]:
+	"""서버를 띄우지 않고 ASGI 앱을 같은 프로세스에서 직접 호출 (네트워크 비용 제외)"""
+	from asgi_app import app
+
+	inbox: asyncio.Queue = asyncio.Queue()
+	outbox: asyncio.Queue = asyncio.Queue()
+	await inbox.put({"type": "lifespan.startup"})
+	lifespan = asyncio.create_task(app({"type": "lifespan"}, inbox.get, outbox.put))
+	await outbox.get()
+	try:
+		return await load_test("http://testserver", paths, levels, duration, transport=httpx.ASGITransport(app=app))
+	finally:
+		await inbox.put({"type": "lifespan.shutdown"})
+		await lifespan
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="리포트 웹 서버 부하 테스트 (p50/p99 지연, 처리량)")
+	parser.add_argument("--url", default="http://127.0.0.1:5000", help="대상 서버 (Flask 또는 asgi_app)")
+	parser.add_argument("--levels", default=",".join(map(str, CONCURRENCY)), help="동시 연결 수 목록")
+	parser.add_argument("--duration", type=float, default=5.0, help="단계별 측정 시간 (초)")
+	parser.add_argument("--path", action="append", help="측정 경로 (기본: /report.txt 와 최신 /reports/<파일>)")
+	parser.add_argument("--in-process", action="store_true", help="서버 없이 asgi_app 을 직접 호출")
+	args = parser.parse_args()
+
+	levels = [int(x) for x in args.levels.split(",")]
+	paths = args.path or ["/report.txt"] + [p for p in [latest_report_path()] if p]
+	target = "asgi_app (in-process)" if args.in_process else args.url
+	print(f"🔥 부하 테스트: {target}, 단계별 {args.duration:.0f}초")
+	if args.in_process:
+		asyncio.run(_in_process(paths, levels, args.duration))
+	else:
+		asyncio.run(load_test(args.url, paths, levels, args.duration))
@@ -3,33 +3,88 @@ from __future__ import annotations
 from data_manager import data_manager
 from config import AppConfig
 from kakao import KakaoClient
+from report import publish_report
+from checkpoint import resume_or_start
+from snapshot_diff import diff_snapshots, load_snapshot, save_snapshot
 from datetime import datetime
+from typing import Optional
 import os
 
 
-def run_once() -> None:
+def _use_changes_message(mode: str, previous: Optional[dict], now: datetime) -> bool:
+	"""변경 요약을 보낼지 (auto: 같은 날 이미 전체 리포트를 보냈으면 변경분만)"""
+	if mode == "changes":
+		return previous is not None
+	if mode != "auto" or previous is None:
+		return False
+	try:
+		return datetime.fromisoformat(previous["created_at"]).date() == now.date()
+	except (KeyError, TypeError, ValueError):
+		return False
+
+
+def run_once(run_id: Optional[str] = None, force: bool = False, full: bool = False) -> None:
 	config = AppConfig.load()
+	# 직전 시도가 중간에 실패했으면 끝난 단계부터 이어서 진행
+	checkpoint = resume_or_start(run_id)
 	
 	# 공통 데이터 관리자에서 최신 데이터 가져오기
 	print("📋 최신 데이터 가져오는 중...")
-	data = data_manager.get_fresh_data()
+	data = data_manager.get_fresh_data(checkpoint)
+	
+	# 직전 전송본과 비교해 의미 있는 변경이 없으면 발행/전송 생략
+	previous = load_snapshot()
+	snapshot = data.get('snapshot')
+	diff = diff_snapshots(previous, snapshot) if snapshot is not None else None
+	if diff is not None and not diff.material and not force:
+		print(f"⏸️ 직전 전송 이후 의미 있는 변경 없음 ({diff.summary()}) - 발행/전송 생략")
+		checkpoint.finish()
+		return
+	if diff is not None:
+		print(f"🔎 직전 전송 대비: {diff.summary()}")
 	
 	# 리포트를 개별 파일로 저장 (카카오톡 메시지별 고유 링크)
+	# 텍스트/HTML/JSON 은 여기서 한 번만 렌더링되고, 웹 서버는 저장된 파일을 그대로 제공
 	report_text = data['report_text']
-	reports_dir = os.path.join(os.path.dirname(__file__), '..', 'reports')
-	os.makedirs(reports_dir, exist_ok=True)
-	filename = datetime.now().strftime('%Y%m%d_%H%M%S') + '.txt'
-	file_path = os.path.normpath(os.path.join(reports_dir, filename))
-	with open(file_path, 'w', encoding='utf-8') as f:
-		f.write(report_text)
-	print("💾 리포트 파일 저장:", file_path)
+	published = checkpoint.get("published")
+	if published is None:
+		reports_dir = os.path.join(os.path.dirname(__file__), '..', 'reports')
+		stem = datetime.now().strftime('%Y%m%d_%H%M%S')
+		filename = stem + '.txt'
+		report = data.get('report')
+		if report is not None:
+			paths = publish_report(report, reports_dir, stem)
+			publish_report(report, os.path.join(os.path.dirname(__file__), '..'), 'report')  # 최신 리포트
+			file_path = paths['text']
+		else:
+			os.makedirs(reports_dir, exist_ok=True)
+			file_path = os.path.normpath(os.path.join(reports_dir, filename))
+			with open(file_path, 'w', encoding='utf-8') as f:
+				f.write(report_text)
+		published = {'filename': filename, 'file_path': file_path}
+		checkpoint.save("published", published)
+	print("💾 리포트 파일 저장:", published['file_path'])
 	
 	# 카카오톡으로 리포트 전송 (해당 파일에 대한 링크 포함)
 	client = KakaoClient(config)
-	link_path = f"/reports/{filename}"
-	client.send_self_memo(report_text, link_path=link_path)
+	link_path = f"/reports/{published['filename']}"
+	message = report_text
+	if diff is not None and not full and _use_changes_message(config.notify_mode, previous, data['last_update']):
+		message = diff.to_message(data['last_update'])
+	client.send_self_memo(message, link_path=link_path)
 	print("✅ 카카오톡 리포트 전송 완료")
+	if snapshot is not None:
+		save_snapshot(snapshot)
+	# 전송까지 끝난 실행의 체크포인트는 삭제
+	checkpoint.finish()
 
 
 if __name__ == "__main__":
-	run_once()
+	import argparse
+
+	parser = argparse.ArgumentParser(description="리포트 생성 및 카카오톡 전송")
+	parser.add_argument("--run-id", default=None, help="이어서 진행할 실행 ID (기본: 최근 미완료 실행 자동 선택)")
+	parser.add_argument("--force", action="store_true", help="변경이 없어도 발행/전송")
+	parser.add_argument("--full", action="store_true", help="변경 요약 대신 전체 리포트 전송")
+	args = parser.parse_args()
+	run_once(args.run_id, args.force, args.full)
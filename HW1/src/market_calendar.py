@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+
+import pytz
+
+YEARS = range(2020, 2031)
+
+# KRX 휴장일 (거래소 공지 기준, 연말 휴장일은 아래에서 자동 추가)
+# 설/추석/석가탄신일 등 음력 공휴일과 선거일·임시공휴일은 규칙으로 계산할 수 없어 목록으로 관리
+_KRX_HOLIDAYS = [
+	# 2020
+	"2020-01-01", "2020-01-24", "2020-01-27", "2020-04-15", "2020-04-30", "2020-05-01",
+	"2020-05-05", "2020-08-17", "2020-09-30", "2020-10-01", "2020-10-02", "2020-10-09",
+	"2020-12-25",
+	# 2021
+	"2021-01-01", "2021-02-11", "2021-02-12", "2021-03-01", "2021-05-05", "2021-05-19",
+	"2021-08-16", "2021-09-20", "2021-09-21", "2021-09-22", "2021-10-04", "2021-10-11",
+	# 2022
+	"2022-01-31", "2022-02-01", "2022-02-02", "2022-03-01", "2022-03-09", "2022-05-05",
+	"2022-06-01", "2022-06-06", "2022-08-15", "2022-09-09", "2022-09-12", "2022-10-03",
+	"2022-10-10",
+	# 2023
+	"2023-01-23", "2023-01-24", "2023-03-01", "2023-05-01", "2023-05-05", "2023-05-29",
+	"2023-06-06", "2023-08-15", "2023-09-28", "2023-09-29", "2023-10-02", "2023-10-03",
+	"2023-10-09", "2023-12-25",
+	# 2024
+	"2024-01-01", "2024-02-09", "2024-02-12", "2024-03-01", "2024-04-10", "2024-05-01",
+	"2024-05-06", "2024-05-15", "2024-06-06", "2024-08-15", "2024-09-16", "2024-09-17",
+	"2024-09-18", "2024-10-01", "2024-10-03", "2024-10-09", "2024-12-25",
+	# 2025
+	"2025-01-01", "2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30", "2025-03-03",
+	"2025-05-01", "2025-05-05", "2025-05-06", "2025-06-03", "2025-06-06", "2025-08-15",
+	"2025-10-03", "2025-10-06", "2025-10-07", "2025-10-08", "2025-10-09", "2025-12-25",
+	# 2026
+	"2026-01-01", "2026-02-16", "2026-02-17", "2026-02-18", "2026-03-02", "2026-05-01",
+	"2026-05-05", "2026-05-25", "2026-06-03", "2026-08-17", "2026-09-24", "2026-09-25",
+	"2026-10-05", "2026-10-09", "2026-12-25",
+	# 2027
+	"2027-01-01", "2027-02-08", "2027-02-09", "2027-03-01", "2027-05-05", "2027-05-13",
+	"2027-08-16", "2027-09-14", "2027-09-15", "2027-09-16", "2027-10-04", "2027-10-11",
+	"2027-12-27",
+]
+# 휴장일 목록이 있는 연도 (이 밖의 연도는 음력 공휴일을 알 수 없음)
+KRX_YEARS = range(2020, 2028)
+
+# NYSE 특별 휴장 (규칙 외)
+_NYSE_SPECIAL_CLOSURES = ["2025-01-09"]
+
+
+def _easter(year: int) -> dt.date:
+	"""그레고리력 부활절 (Anonymous Gregorian algorithm)"""
+	a = year % 19
+	b, c = divmod(year, 100)
+	d, e = divmod(b, 4)
+	f = (b + 8) // 25
+	g = (b - f + 1) // 3
+	h = (19 * a + b - d - g + 15) % 30
+	i, k = divmod(c, 4)
+	l = (32 + 2 * e + 2 * i - h - k) % 7
+	m = (a + 11 * h + 22 * l) // 451
+	month, day = divmod(h + l - 7 * m + 114, 31)
+	return dt.date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> dt.date:
+	if n > 0:
+		first = dt.date(year, month, 1)
+		return first + dt.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+	last = dt.date(year + (month == 12), month % 12 + 1, 1) - dt.timedelta(days=1)
+	return last - dt.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: dt.date) -> Optional[dt.date]:
+	if day.weekday() == 5:
+		# 토요일 휴일은 금요일에 쉬지만, 신정은 전년도 12/31 로 당기지 않음 (NYSE Rule 7.2)
+		return None if (day.month, day.day) == (1, 1) else day - dt.timedelta(days=1)
+	if day.weekday() == 6:
+		return day + dt.timedelta(days=1)
+	return day
+
+
+def _nyse_holidays(years: Iterable[int]) -> FrozenSet[dt.date]:
+	days = set()
+	for y in years:
+		fixed = [dt.date(y, 1, 1), dt.date(y, 7, 4), dt.date(y, 12, 25)]
+		if y >= 2022:
+			fixed.append(dt.date(y, 6, 19))
+		for d in fixed:
+			obs = _observed(d)
+			if obs:
+				days.add(obs)
+		days.add(_nth_weekday(y, 1, 0, 3))   # MLK Day
+		days.add(_nth_weekday(y, 2, 0, 3))   # Presidents' Day
+		days.add(_easter(y) - dt.timedelta(days=2))  # Good Friday
+		days.add(_nth_weekday(y, 5, 0, -1))  # Memorial Day
+		days.add(_nth_weekday(y, 9, 0, 1))   # Labor Day
+		days.add(_nth_weekday(y, 11, 3, 4))  # Thanksgiving
+	days.update(dt.date.fromisoformat(d) for d in _NYSE_SPECIAL_CLOSURES)
+	return frozenset(days)
+
+
+def _nyse_early_closes(years: Iterable[int], holidays: FrozenSet[dt.date]) -> FrozenSet[dt.date]:
+	days = set()
+	for y in years:
+		days.add(_nth_weekday(y, 11, 3, 4) + dt.timedelta(days=1))  # 추수감사절 다음날
+		for d in (dt.date(y, 7, 3), dt.date(y, 12, 24)):
+			if d.weekday() < 5 and d not in holidays:
+				days.add(d)
+	return frozenset(days)
+
+
+def _krx_holidays(years: Iterable[int]) -> FrozenSet[dt.date]:
+	days = {dt.date.fromisoformat(d) for d in _KRX_HOLIDAYS}
+	for y in years:
+		# 연말 휴장일: 그해 마지막 평일
+		last = dt.date(y, 12, 31)
+		while last.weekday() >= 5 or last in days:
+			last -= dt.timedelta(days=1)
+		days.add(last)
+	return frozenset(days)
+
+
+class TradingCalendar:
+	"""거래소 세션/휴장일 달력 (오프라인 사용 가능)"""
+
+	def __init__(self, name: str, tz: str, open_time: dt.time, close_time: dt.time,
+	             data_delay: dt.timedelta, holidays: FrozenSet[dt.date],
+	             early_closes: FrozenSet[dt.date] = frozenset(),
+	             early_close_time: Optional[dt.time] = None, years: Optional[Iterable[int]] = None) -> None:
+		self.name = name
+		self.tz = pytz.timezone(tz)
+		self.open_time = open_time
+		self.close_time = close_time
+		self.data_delay = data_delay  # 장 마감 후 일봉이 데이터 제공처에 반영되기까지의 지연
+		self.holidays = holidays
+		self.early_closes = early_closes
+		self.early_close_time = early_close_time
+		self.years = frozenset(years) if years is not None else None  # 휴장일이 정확한 연도
+		self._warned: Set[int] = set()
+
+	def is_session(self, day: dt.date) -> bool:
+		if self.years is not None and day.year not in self.years and day.year not in self._warned:
+			self._warned.add(day.year)
+			print(f"⚠️ {self.name} 휴장일 목록에 {day.year}년이 없어 주말만 휴장으로 처리합니다 (market_calendar.py 갱신 필요)")
+		return day.weekday() < 5 and day not in self.holidays
+
+	def next_session(self, day: dt.date, inclusive: bool = True) -> dt.date:
+		d = day if inclusive else day + dt.timedelta(days=1)
+		while not self.is_session(d):
+			d += dt.timedelta(days=1)
+		return d
+
+	def previous_session(self, day: dt.date, inclusive: bool = True) -> dt.date:
+		d = day if inclusive else day - dt.timedelta(days=1)
+		while not self.is_session(d):
+			d -= dt.timedelta(days=1)
+		return d
+
+	def session_open(self, day: dt.date) -> dt.datetime:
+		return self.tz.localize(dt.datetime.combine(day, self.open_time))
+
+	def session_close(self, day: dt.date) -> dt.datetime:
+		close = self.early_close_time if day in self.early_closes and self.early_close_time else self.close_time
+		return self.tz.localize(dt.datetime.combine(day, close))
+
+	def local_date(self, now: dt.datetime) -> dt.date:
+		return now.astimezone(self.tz).date()
+
+	def is_open(self, now: dt.datetime) -> bool:
+		day = self.local_date(now)
+		return self.is_session(day) and self.session_open(day) <= now < self.session_close(day)
+
+	def next_data_ready(self, now: dt.datetime) -> dt.datetime:
+		"""now 이후 처음으로 새 일봉이 반영되는 시각 (세션 마감 + 지연)"""
+		day = self.next_session(self.local_date(now))
+		ready = self.session_close(day) + self.data_delay
+		if ready <= now:
+			ready = self.session_close(self.next_session(day, inclusive=False)) + self.data_delay
+		return ready
+
+	def cache_expiry(self, now: dt.datetime, intraday_ttl: dt.timedelta) -> dt.datetime:
+		"""장중에는 짧은 TTL, 장 마감 후·휴장일에는 다음 일봉 반영 시각까지 유지"""
+		ready = self.next_data_ready(now)
+		if self.is_open(now):
+			return min(now + intraday_ttl, ready)
+		return ready
+
+
+KRX = TradingCalendar(
+	"KRX", "Asia/Seoul", dt.time(9, 0), dt.time(15, 30),
+	data_delay=dt.timedelta(minutes=30),
+	holidays=_krx_holidays(YEARS),
+	years=KRX_YEARS,
+)
+
+_nyse_hol = _nyse_holidays(YEARS)
+NYSE = TradingCalendar(
+	"NYSE", "America/New_York", dt.time(9, 30), dt.time(16, 0),
+	data_delay=dt.timedelta(minutes=30),
+	holidays=_nyse_hol,
+	early_closes=_nyse_early_closes(YEARS, _nyse_hol),
+	early_close_time=dt.time(13, 0),
+	years=YEARS,
+)
+
+CALENDARS: Dict[str, TradingCalendar] = {"kr": KRX, "us": NYSE}
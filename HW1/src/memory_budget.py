@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import functools
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+REPORTS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "reports", "memory"))
+# 종목 하나를 시세 조회 → 지표 계산까지 들고 있을 때의 대략적인 메모리 (1년 일봉 + 지표 열 + 복사본)
+BYTES_PER_TICKER = int(os.getenv("MEMORY_BYTES_PER_TICKER", str(256 * 1024)))
+MB = 1024 * 1024
+SAMPLE_INTERVAL = 0.02  # 단계 실행 중 RSS 샘플링 간격 (초)
+
+
+class MemoryBudgetExceeded(RuntimeError):
+	"""RSS 가 메모리 예산을 넘어 파이프라인을 중단"""
+
+
+def current_rss() -> int:
+	"""현재 RSS (bytes). /proc 이 없으면 최대 RSS 로 대신"""
+	try:
+		with open("/proc/self/statm", "r") as f:
+			return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+	except (OSError, ValueError, IndexError):
+		return peak_rss()
+
+
+def peak_rss() -> int:
+	"""프로세스 최대 RSS (bytes, macOS 는 bytes / Linux 는 KB 단위로 보고됨)"""
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageMemory:
+	name: str
+	seconds: float
+	rss_before: int
+	rss_after: int
+	peak_rss: int  # 이 단계 실행 중 샘플링한 최대 RSS
+	traced_peak: int = 0  # 단계 중 tracemalloc 최대 사용량
+	top: List[str] = field(default_factory=list)  # 순증가 상위 할당 위치
+
+
+class MemoryBudget:
+	"""파이프라인 단계별 메모리 측정 + 예산 가드
+
+	- profile=True: 단계 전후 tracemalloc 스냅샷을 비교해 순증가 상위 할당 위치를 기록
+	- 단계가 실행되는 동안 감시 스레드가 RSS 를 샘플링해 단계별 최대 RSS 를 기록한다
+	  (동시에 실행 중인 단계들은 같은 프로세스 RSS 를 공유한다)
+	- budget_mb: 단계 시작/종료 시 RSS 가 예산을 넘으면 MemoryBudgetExceeded 로 즉시 중단하고,
+	  이후 단계도 시작하지 않는다. 단계 도중 감시 스레드가 초과를 발견하면 tripped 를 기록하고,
+	  단계 안의 루프가 check() 를 부를 때 중단된다. 시작 전 예상 사용량이 예산에 가까우면
+	  chunk_size 로 나눠 처리하게 한다.
+
+	단계들이 스레드에서 동시에 실행되면 스냅샷 차이에 다른 단계의 할당이 섞이므로
+	profile 모드에서는 파이프라인을 순차 실행하는 것이 정확하다.
+	"""
+
+	def __init__(self, budget_mb: Optional[float] = None, profile: bool = False, top_n: int = 10) -> None:
+		self.budget = int(budget_mb * MB) if budget_mb else None
+		self.profile = profile
+		self.top_n = top_n
+		self.stages: List[StageMemory] = []
+		self.tripped: Optional[str] = None
+		self._lock = threading.Lock()
+		self._active: Dict[str, int] = {}  # 실행 중인 단계 → 지금까지의 최대 RSS
+		self._watcher: Optional[threading.Thread] = None
+		if profile and not tracemalloc.is_tracing():
+			tracemalloc.start()
+
+	@property
+	def enabled(self) -> bool:
+		return self.profile or self.budget is not None
+
+	def check(self, where: str) -> None:
+		"""예산 초과(또는 이미 다른 단계가 초과)면 중단"""
+		if self.tripped:
+			raise MemoryBudgetExceeded(f"{where}: 메모리 예산 초과로 중단됨 ({self.tripped})")
+		if self.budget is None:
+			return
+		rss = current_rss()
+		if rss > self.budget:
+			self.tripped = f"{where} RSS {rss / MB:,.0f}MB > 예산 {self.budget / MB:,.0f}MB"
+			raise MemoryBudgetExceeded(self.tripped)
+
+	def _watch(self) -> None:
+		"""실행 중인 단계가 있는 동안 RSS 샘플링 (단계가 모두 끝나면 종료)"""
+		while True:
+			time.sleep(SAMPLE_INTERVAL)
+			rss = current_rss()
+			with self._lock:
+				if not self._active:
+					self._watcher = None
+					return
+				for name, peak in self._active.items():
+					self._active[name] = max(peak, rss)
+				if self.budget is not None and rss > self.budget and not self.tripped:
+					self.tripped = f"{', '.join(self._active)} 실행 중 RSS {rss / MB:,.0f}MB > 예산 {self.budget / MB:,.0f}MB"
+
+	def chunk_size(self, n_items: int, bytes_per_item: int = BYTES_PER_TICKER, safety: float = 0.7) -> Optional[int]:
+		"""n_items 를 한 번에 들고 있으면 예산의 safety 비율을 넘을 때 한 번에 처리할 개수 (넘지 않으면 None)"""
+		if self.budget is None or n_items == 0:
+			return None
+		headroom = self.budget * safety - current_rss()
+		if n_items * bytes_per_item <= headroom:
+			return None
+		if headroom < bytes_per_item:
+			self.check("시작 전")  # 예산을 이미 넘었으면 여기서 중단
+			return 1
+		return max(1, int(headroom // bytes_per_item))
+
+	def run_stage(self, name: str, func: Callable[..., Any], *args: Any) -> Any:
+		self.check(name)
+		before = current_rss()
+		with self._lock:
+			self._active[name] = before
+			if self._watcher is None:
+				self._watcher = threading.Thread(target=self._watch, name="rss-watch", daemon=True)
+				self._watcher.start()
+		snapshot = None
+		if self.profile:
+			with self._lock:
+				tracemalloc.reset_peak()
+				snapshot = tracemalloc.take_snapshot()
+		started = time.perf_counter()
+		try:
+			result = func(*args)
+		finally:
+			after = current_rss()
+			with self._lock:
+				peak = max(self._active.pop(name, before), after)
+			record = StageMemory(name, time.perf_counter() - started, before, after, peak)
+			if snapshot is not None:
+				with self._lock:
+					record.traced_peak = tracemalloc.get_traced_memory()[1]
+					diff = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+				record.top = [str(stat) for stat in diff[:self.top_n] if stat.size_diff > 0]
+			with self._lock:
+				self.stages.append(record)
+		# 단계가 예외로 끝났으면 그 예외를 그대로 올리고, 정상 종료한 단계만 예산을 검사
+		self.check(name)
+		return result
+
+	def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+		"""Stage.func 를 측정/가드로 감싼 함수"""
+		if not self.enabled:
+			return func
+		return functools.wraps(func)(lambda *args: self.run_stage(name, func, *args))
+
+	def report(self) -> str:
+		lines = [f"🧠 메모리 리포트 ({datetime.now():%Y-%m-%d %H:%M:%S})"]
+		if self.budget:
+			lines.append(f"예산: {self.budget / MB:,.0f}MB" + (f" / 중단: {self.tripped}" if self.tripped else ""))
+		lines.append(f"{'단계':<16}{'시간':>8}{'RSS 전':>10}{'RSS 후':>10}{'최대 RSS':>10}{'추적 최대':>10}")
+		for s in self.stages:
+			lines.append(f"{s.name:<16}{s.seconds:>7.2f}s{s.rss_before / MB:>9.0f}M{s.rss_after / MB:>9.0f}M"
+			             f"{s.peak_rss / MB:>9.0f}M{s.traced_peak / MB:>9.1f}M")
+		for s in self.stages:
+			if s.top:
+				lines.append("")
+				lines.append(f"[{s.name}] 순증가 상위 할당 위치")
+				lines.extend(f"  {t}" for t in s.top)
+		return "\n".join(lines)
+
+	def write_report(self, directory: str = REPORTS_DIR) -> str:
+		os.makedirs(directory, exist_ok=True)
+		path = os.path.join(directory, f"{datetime.now():%Y%m%d_%H%M%S}.txt")
+		with open(path, "w", encoding="utf-8") as f:
+			f.write(self.report() + "\n")
+		return path
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import datetime as dt
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
+from urllib.parse import urlsplit
 
-import requests
+import http_client
+import provider_health
 
 try:
 	from openai import OpenAI  # type: ignore
@@ -23,26 +26,30 @@ def fetch_market_headlines() -> List[str]:
 		"https://rss.cnn.com/rss/money_news_international.rss",
 		"https://feeds.reuters.com/reuters/businessNews",
 	]
-	headlines: List[str] = []
-	
-	for url in sources:
+	# User-Agent 헤더 추가로 403 오류 방지
+	headers = {
+		'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+	}
+
+	def fetch(url: str) -> List[str]:
 		try:
-			# User-Agent 헤더 추가로 403 오류 방지
-			headers = {
-				'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-			}
-			resp = requests.get(url, headers=headers, timeout=10)
-			resp.raise_for_status()  # HTTP 오류 확인
-			
-			text = resp.text
-			for line in text.splitlines():
-				if "<title>" in line and "</title>" in line:
-					t = line.split("<title>")[-1].split("</title>")[0].strip()
-					if t and t.lower() not in ["yahoo news - latest news & headlines", "rss feed"]:
-						headlines.append(t)
+			# 피드별 차단기 + 관측 지연 기반 타임아웃 (죽은 피드는 건너뜀)
+			resp = provider_health.call(f"news:{urlsplit(url).netloc}", http_client.get, url, headers=headers,
+			                            pass_timeout=True, accept=lambda r: r.status_code < 400)
 		except Exception as e:
 			print(f"뉴스 수집 실패 ({url}): {e}")
-			continue
+			return []
+		titles = []
+		for line in resp.text.splitlines():
+			if "<title>" in line and "</title>" in line:
+				t = line.split("<title>")[-1].split("</title>")[0].strip()
+				if t and t.lower() not in ["yahoo news - latest news & headlines", "rss feed"]:
+					titles.append(t)
+		return titles
+
+	# 피드를 동시에 조회하므로 전체 소요 시간은 가장 느린 (차단되지 않은) 피드의 타임아웃으로 제한
+	with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+		headlines: List[str] = [t for titles in pool.map(fetch, sources) for t in titles]
 	
 	# 뉴스가 없으면 기본 메시지
 	if not headlines:
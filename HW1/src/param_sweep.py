@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from price_panel import open_panel, panel_path
+from screener import INDICATOR_PARAMS, ScoreParams
+from timeframes import period_codes, timeframe_arrays
+
+REPORTS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "reports"))
+
+# 지표 윈도우 후보 (특징 배열은 조합마다 한 번만 계산)
+WINDOW_GRID: Dict[str, List[Any]] = {
+	"sma": [(5, 20, 60), (10, 20, 60), (5, 10, 30), (10, 30, 120)],
+	"rsi": [9, 14, 21],
+	"macd": [(12, 26, 9), (8, 17, 9)],
+}
+
+# 가중치/임계값 후보 (윈도우 조합마다 전체 곱집합을 벡터 연산으로 평가)
+SCORE_GRID: Dict[str, List[float]] = {
+	"w_trend_short": [0.0, 0.5, 1.0],
+	"w_trend_long": [0.0, 0.5, 1.0],
+	"rsi_band": [(40.0, 65.0), (30.0, 60.0), (45.0, 70.0)],
+	"w_rsi": [0.0, 0.5, 1.0],
+	"rsi_oversold": [25.0, 30.0],
+	"w_oversold": [0.0, 0.3],
+	"w_macd": [0.0, 0.7, 1.4],
+	"vol_ratio": [1.2, 1.5, 2.0],
+	"w_volume": [0.0, 0.7],
+}
+
+CONFIG_BLOCK = 64  # 한 번에 점수를 계산할 설정 수 (메모리 ≈ CONFIG_BLOCK × 표본 크기 × 4 bytes)
+
+
+def iter_score_params(grid: Mapping[str, Sequence[Any]] = SCORE_GRID) -> Iterator[ScoreParams]:
+	keys = list(grid)
+	for combo in itertools.product(*(grid[k] for k in keys)):
+		values = dict(zip(keys, combo))
+		low, high = values.pop("rsi_band")
+		yield ScoreParams(rsi_low=low, rsi_high=high, **values)
+
+
+def _sma(close: np.ndarray, window: int) -> np.ndarray:
+	return pd.DataFrame(close).rolling(window, min_periods=window).mean().to_numpy()
+
+
+def _ema(close: np.ndarray, span: int) -> np.ndarray:
+	return pd.DataFrame(close).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def compute_features(close: np.ndarray, volume: np.ndarray, windows: Mapping[str, Any],
+                     dates: Optional[pd.DatetimeIndex] = None) -> Dict[str, np.ndarray]:
+	"""(날짜, 종목) 종가/거래량 → score_row 가 보는 조건들의 원재료 배열
+
+	screener.enrich_indicators 와 같은 식을 종목 축 전체에 한 번에 적용한다.
+	dates 를 주면 주봉/월봉 추세 조건도 만든다 (상위 봉 가중치는 탐색하지 않고 기본값으로 반영).
+	"""
+	short, mid, long_ = windows["sma"]
+	sma_s, sma_m, sma_l = _sma(close, short), _sma(close, mid), _sma(close, long_)
+	has_sma = ~(np.isnan(sma_s) | np.isnan(sma_m) | np.isnan(sma_l))
+
+	delta = np.diff(close, axis=0, prepend=np.nan)
+	n = windows["rsi"]
+	avg_gain = _sma(np.clip(delta, 0, None), n)
+	avg_loss = _sma(-np.clip(delta, None, 0), n)
+	with np.errstate(divide="ignore", invalid="ignore"):
+		rs = avg_gain / np.where(avg_loss == 0, 1e-9, avg_loss)
+	rsi = 100 - 100 / (1 + rs)
+
+	fast, slow, signal = windows["macd"]
+	macd = _ema(close, fast) - _ema(close, slow)
+	macd_signal = pd.DataFrame(macd).ewm(span=signal, adjust=False).mean().to_numpy()
+
+	vol = volume.astype(np.float64)
+	vol_avg = _sma(vol, INDICATOR_PARAMS["vol_avg"])
+	with np.errstate(divide="ignore", invalid="ignore"):
+		vol_ratio = np.where(vol_avg > 0, vol / vol_avg, np.nan)
+
+	features = {
+		"trend_short": has_sma & (sma_s > sma_m),
+		"trend_long": has_sma & (sma_m > sma_l),
+		"rsi": rsi,
+		"macd_up": macd > macd_signal,
+		"vol_ratio": vol_ratio,
+	}
+	if dates is not None and len(dates):
+		for tf, name, (fast, slow) in (("W", "weekly_trend", (10, 20)), ("M", "monthly_trend", (3, 6))):
+			params = INDICATOR_PARAMS["timeframes"].get(tf)
+			if params and {fast, slow} <= set(params["sma"]):
+				cols = timeframe_arrays(close, period_codes(dates, tf), tf, {"sma": (fast, slow)})
+				with np.errstate(invalid="ignore"):
+					features[name] = (close > cols[f"{tf}_SMA_{fast}"]) & (cols[f"{tf}_SMA_{fast}"] > cols[f"{tf}_SMA_{slow}"])
+	return features
+
+
+def forward_returns(close: np.ndarray, horizon: int) -> np.ndarray:
+	out = np.full_like(close, np.nan, dtype=np.float64)
+	with np.errstate(divide="ignore", invalid="ignore"):
+		out[:-horizon] = close[horizon:] / close[:-horizon] - 1
+	return out
+
+
+def evaluate(features: Mapping[str, np.ndarray], fwd: np.ndarray, valid: np.ndarray,
+             params: Sequence[ScoreParams], top_k: int = 3) -> np.ndarray:
+	"""설정별 (평균 수익률, 승률, 표본 수) — 표본 날짜마다 점수 상위 top_k 종목의 forward 수익률
+
+	features/fwd/valid 는 (표본 날짜, 종목) 배열. 설정 블록 단위로
+	점수 = Σ 가중치 × 조건 을 (설정, 날짜, 종목) 텐서로 한 번에 계산한다.
+	"""
+	rsi = features["rsi"]
+	vol_ratio = np.nan_to_num(features["vol_ratio"], nan=0.0)
+	fixed = {k: features[k].astype(np.float32)
+	         for k in ("trend_short", "trend_long", "macd_up", "weekly_trend", "monthly_trend") if k in features}
+	# 점수 동점은 screen_tickers 처럼 거래량 비율로 정렬
+	tiebreak = (np.minimum(vol_ratio, 100.0) * 1e-4).astype(np.float32)
+	mask = np.where(valid, 0.0, -np.inf).astype(np.float32)
+
+	out = np.empty((len(params), 3))
+	for lo in range(0, len(params), CONFIG_BLOCK):
+		block = params[lo:lo + CONFIG_BLOCK]
+
+		def col(name: str) -> np.ndarray:
+			return np.array([getattr(p, name) for p in block], dtype=np.float32)[:, None, None]
+
+		score = (col("w_trend_short") * fixed["trend_short"] + col("w_trend_long") * fixed["trend_long"]
+		         + col("w_macd") * fixed["macd_up"])
+		in_band = (rsi >= col("rsi_low")) & (rsi <= col("rsi_high"))
+		oversold = ~in_band & (rsi < col("rsi_oversold"))
+		score += col("w_rsi") * in_band + col("w_oversold") * oversold
+		score += col("w_volume") * (vol_ratio >= col("vol_ratio"))
+		for name, weight in (("weekly_trend", "w_weekly_trend"), ("monthly_trend", "w_monthly_trend")):
+			if name in fixed:
+				score += col(weight) * fixed[name]
+		score += tiebreak + mask
+
+		k = min(top_k, score.shape[2])
+		top = np.argpartition(-score, k - 1, axis=2)[:, :, :k]
+		picked = np.take_along_axis(np.broadcast_to(fwd, score.shape), top, axis=2)
+		ok = np.take_along_axis(np.broadcast_to(valid, score.shape), top, axis=2)
+		picked = np.where(ok, picked, np.nan)
+		with np.errstate(invalid="ignore"):
+			out[lo:lo + len(block), 0] = np.nanmean(picked, axis=(1, 2))
+			out[lo:lo + len(block), 1] = np.nanmean(np.where(ok, picked > 0, np.nan), axis=(1, 2))
+		out[lo:lo + len(block), 2] = ok.sum(axis=(1, 2))
+	return out
+
+
+def _sweep_windows(path: str, windows: Dict[str, Any], horizon: int, top_k: int, step: int) -> List[Dict[str, Any]]:
+	"""워커: 한 윈도우 조합의 특징을 계산하고 모든 가중치/임계값 조합을 평가"""
+	panel = open_panel(path)
+	close = np.asarray(panel.array("Close"), dtype=np.float64).T  # (날짜, 종목)
+	volume = np.asarray(panel.array("Volume")).T
+	feats = compute_features(close, volume, windows, panel.dates)
+	fwd = forward_returns(close, horizon)
+
+	# 지표가 안정된 이후 날짜만 step 간격으로 표본 추출 (forward 수익률이 있는 날까지)
+	start = max(max(windows["sma"]), windows["macd"][1] * 3)
+	rows = np.arange(start, close.shape[0] - horizon, step)
+	sampled = {k: v[rows] for k, v in feats.items()}
+	valid = ~np.isnan(fwd[rows]) & ~np.isnan(close[rows])
+
+	params = list(iter_score_params())
+	stats = evaluate(sampled, fwd[rows], valid, params, top_k)
+	base = {"sma": "/".join(map(str, windows["sma"])), "rsi_window": windows["rsi"],
+	        "macd": "/".join(map(str, windows["macd"]))}
+	return [{**base, **asdict(p), "mean_return": s[0], "hit_rate": s[1], "samples": int(s[2])}
+	        for p, s in zip(params, stats)]
+
+
+def run_sweep(market: str = "kr", horizon: int = 5, top_k: int = 3, step: int = 5,
+              workers: Optional[int] = None, out_path: Optional[str] = None) -> Optional[pd.DataFrame]:
+	path = panel_path(market)
+	panel = open_panel(path)
+	if panel is None or len(panel) == 0:
+		print(f"❌ 가격 패널이 없습니다: {path} (먼저 데이터 수집을 실행하세요)")
+		return None
+
+	window_sets = [dict(zip(WINDOW_GRID, combo)) for combo in itertools.product(*WINDOW_GRID.values())]
+	n_configs = len(window_sets) * sum(1 for _ in iter_score_params())
+	print(f"🧪 {market.upper()} 종목 {len(panel)}개 × 날짜 {len(panel.dates)}개, 설정 {n_configs:,}개 평가 중...")
+
+	started = time.perf_counter()
+	rows: List[Dict[str, Any]] = []
+	# 워커는 같은 패널 파일을 각자 매핑하므로 가격 배열을 주고받지 않는다
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		futures = [pool.submit(_sweep_windows, path, w, horizon, top_k, step) for w in window_sets]
+		for fut in futures:
+			rows.extend(fut.result())
+	elapsed = time.perf_counter() - started
+
+	table = pd.DataFrame(rows).sort_values(["mean_return", "hit_rate"], ascending=False).reset_index(drop=True)
+	if out_path is None:
+		stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+		out_path = os.path.join(REPORTS_DIR, "sweeps", f"{market}_{stamp}.csv")
+	os.makedirs(os.path.dirname(out_path), exist_ok=True)
+	table.to_csv(out_path, index=False)
+	print(f"⏱️ {n_configs:,}개 설정 평가: {elapsed:.1f}s ({n_configs / elapsed:,.0f}개/s)")
+	print("💾 결과 저장:", out_path)
+	return table
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="스크리너 가중치/지표 윈도우 파라미터 탐색")
+	parser.add_argument("--market", default="kr", choices=["kr", "us"])
+	parser.add_argument("--horizon", type=int, default=5, help="forward 수익률 기간 (거래일)")
+	parser.add_argument("--top-k", type=int, default=3)
+	parser.add_argument("--step", type=int, default=5, help="표본 날짜 간격 (거래일)")
+	parser.add_argument("--workers", type=int, default=None)
+	parser.add_argument("--out", default=None, help="결과 CSV 경로")
+	args = parser.parse_args()
+
+	table = run_sweep(args.market, args.horizon, args.top_k, args.step, workers=args.workers, out_path=args.out)
+	if table is not None:
+		default = {f.name: getattr(ScoreParams(), f.name) for f in fields(ScoreParams)}
+		print(table.head(10).to_string())
+		print("기본 설정:", default)
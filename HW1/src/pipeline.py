@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Stage:
+	"""파이프라인 단계 정의
+
+	name 이 곧 출력 이름이며, inputs 에 적힌 다른 단계(또는 초기값)의 출력을
+	같은 순서대로 위치 인자로 받는다.
+	"""
+	name: str
+	func: Callable[..., Any]
+	inputs: Tuple[str, ...] = ()
+	optional: bool = False  # 실패해도 default 값으로 대체하고 계속 진행
+	default: Any = None
+	checkpoint: bool = True  # 출력을 체크포인트로 저장 (다시 만드는 비용이 작거나 저장할 수 없는 출력은 False)
+
+
+@dataclass
+class PipelineResult:
+	outputs: Dict[str, Any] = field(default_factory=dict)
+	errors: Dict[str, BaseException] = field(default_factory=dict)
+	skipped: List[str] = field(default_factory=list)
+	timings: Dict[str, float] = field(default_factory=dict)
+
+	def ok(self, name: str) -> bool:
+		return name in self.outputs and name not in self.errors
+
+
+class Pipeline:
+	"""의존성 그래프(DAG) 기반 단계 실행기
+
+	입력이 모두 준비된 단계부터 스레드 풀에서 동시에 실행하므로, 서로 독립적인
+	분기(KR / US / 뉴스)의 총 소요 시간은 가장 느린 분기에 맞춰진다.
+	"""
+
+	def __init__(self, stages: List[Stage]) -> None:
+		self.stages: Dict[str, Stage] = {}
+		for stage in stages:
+			if stage.name in self.stages:
+				raise ValueError(f"중복된 단계 이름: {stage.name}")
+			self.stages[stage.name] = stage
+		self._check_acyclic()
+
+	def _check_acyclic(self) -> None:
+		visiting, done = set(), set()
+
+		def visit(name: str) -> None:
+			if name in done or name not in self.stages:
+				return
+			if name in visiting:
+				raise ValueError(f"순환 의존성 발견: {name}")
+			visiting.add(name)
+			for dep in self.stages[name].inputs:
+				visit(dep)
+			visiting.discard(name)
+			done.add(name)
+
+		for name in self.stages:
+			visit(name)
+
+	def run(self, initial: Optional[Dict[str, Any]] = None, max_workers: int = 4,
+	        on_complete: Optional[Callable[[str, Any], None]] = None) -> PipelineResult:
+		"""모든 단계를 실행한다. initial 에 이미 있는 출력은 다시 계산하지 않는다.
+
+		on_complete(name, output) 는 성공한 단계마다 호출된다 (실패 후 default 로 대체된 단계는 제외).
+		"""
+		result = PipelineResult(outputs=dict(initial or {}))
+		for stage in self.stages.values():
+			missing = [d for d in stage.inputs if d not in self.stages and d not in result.outputs]
+			if missing:
+				raise ValueError(f"{stage.name}: 알 수 없는 입력 {missing}")
+
+		pending = {n: s for n, s in self.stages.items() if n not in result.outputs}
+		running: Dict[Any, Tuple[str, float]] = {}
+		failed: set = set()
+
+		with ThreadPoolExecutor(max_workers=max_workers) as pool:
+			while pending or running:
+				for name, stage in list(pending.items()):
+					if any(d in failed for d in stage.inputs):
+						# 필수 입력이 실패했으면 하위 단계는 건너뜀
+						del pending[name]
+						failed.add(name)
+						result.skipped.append(name)
+						continue
+					if all(d in result.outputs for d in stage.inputs):
+						del pending[name]
+						args = [result.outputs[d] for d in stage.inputs]
+						running[pool.submit(stage.func, *args)] = (name, time.perf_counter())
+
+				if not running:
+					break
+				done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+				for fut in done:
+					name, started = running.pop(fut)
+					stage = self.stages[name]
+					result.timings[name] = time.perf_counter() - started
+					try:
+						result.outputs[name] = fut.result()
+						if on_complete is not None and stage.checkpoint:
+							on_complete(name, result.outputs[name])
+					except Exception as e:
+						result.errors[name] = e
+						print(f"⚠️ 단계 실패 ({name}): {e}")
+						if stage.optional:
+							result.outputs[name] = stage.default
+						else:
+							failed.add(name)
+		return result
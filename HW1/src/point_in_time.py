@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from config import AppConfig
+from data_fetchers import fetch_kr_price_history, fetch_us_price_history, get_krx_listing, get_us_ticker_name
+from market_calendar import KRX, NYSE
+from price_panel import PricePanel, history_path, open_panel, write_panel
+from reco_history import reco_history
+from report import Report, build_reco_item_kr, build_reco_item_us, publish_report
+from screener import screen_tickers
+from stock_selector import get_us_top_stocks, prefilter_kr_listing
+
+KST = pytz.timezone("Asia/Seoul")
+REPORTS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "reports"))
+REPORT_TIME = dt.time(8, 30)  # 스케줄러 실행 시각 (KST)
+NO_NEWS = "과거 시점 재생: 뉴스 요약 없음"
+
+
+def build_history(market: str, universe: int = 500, years: int = 3, workers: int = 8) -> Optional[str]:
+	"""재생에 쓸 장기 히스토리 패널 생성 (네트워크 필요, 한 번만 실행)
+
+	과거 상장 목록은 구할 수 없으므로 현재 기준 상위 universe 개 종목으로 고정한다.
+	"""
+	days = years * 365
+	if market == "kr":
+		listing = get_krx_listing()
+		listing = listing[listing["Code"].astype(str).str.zfill(6).str.endswith("0")]
+		listing = listing.sort_values("Marcap", ascending=False).head(universe)
+		tickers = [str(c).zfill(6) for c in listing["Code"]]
+		names = dict(zip(tickers, listing["Name"].astype(str)))
+		fetch = lambda t: fetch_kr_price_history(t, period_days=days // 2)  # 조회 구간은 period_days × 2
+	else:
+		tickers = get_us_top_stocks(universe)
+		with ThreadPoolExecutor(max_workers=workers) as pool:
+			names = dict(zip(tickers, pool.map(get_us_ticker_name, tickers)))
+		fetch = lambda t: fetch_us_price_history(t, period_days=days)
+
+	print(f"📥 {market.upper()} {len(tickers)}개 종목 {years}년 시세 수집 중...")
+	with ThreadPoolExecutor(max_workers=workers) as pool:
+		frames = dict(zip(tickers, pool.map(fetch, tickers)))
+	path = write_panel(history_path(market), frames, names=names)
+	print("💾 히스토리 저장:", path)
+	return path
+
+
+def data_dates(report_day: dt.date) -> Tuple[dt.date, dt.date]:
+	"""report_day 08:30 KST 리포트에 반영되는 (KRX, NYSE) 마지막 거래일"""
+	return KRX.previous_session(report_day, inclusive=False), NYSE.previous_session(report_day, inclusive=False)
+
+
+def is_report_day(day: dt.date) -> bool:
+	"""scheduler_job.should_run 과 같은 기준 (08:30 KST 의 뉴욕 현지 날짜는 전날)"""
+	return KRX.is_session(day) or NYSE.is_session(day - dt.timedelta(days=1))
+
+
+def kr_candidates_as_of(panel: PricePanel, funnel_size: int = 30) -> List[str]:
+	"""그 날까지의 시세만으로 만든 상장 목록 대용표를 1단계 필터에 통과
+
+	과거 시가총액은 저장되지 않으므로 60일 평균 거래대금을 규모 지표로 쓴다
+	(회전율 = 당일 거래대금 / 평균 거래대금).
+	"""
+	close = np.asarray(panel.array("Close")[:, -61:], dtype=np.float64)
+	volume = np.asarray(panel.array("Volume")[:, -61:], dtype=np.float64)
+	if close.shape[1] < 2:
+		return []
+	amount = close * volume
+	with np.errstate(invalid="ignore", divide="ignore"):
+		listing = pd.DataFrame({
+			"Code": panel.tickers,
+			"Close": close[:, -1],
+			"ChagesRatio": (close[:, -1] / close[:, -2] - 1) * 100,
+			"Volume": volume[:, -1],
+			"Amount": amount[:, -1],
+			"Marcap": np.nanmean(amount[:, :-1], axis=1),
+		})
+	listing = listing[listing["Close"].notna()]  # 그날 거래된 종목만
+	survivors = prefilter_kr_listing(listing, funnel_size=funnel_size, min_marcap=0)
+	return survivors["Code"].tolist()
+
+
+def us_candidates_as_of(panel: PricePanel, limit: int = 15) -> List[str]:
+	"""20일 평균 거래대금 상위 종목 (그날 거래된 종목만)"""
+	close = np.asarray(panel.array("Close")[:, -20:], dtype=np.float64)
+	volume = np.asarray(panel.array("Volume")[:, -20:], dtype=np.float64)
+	if close.shape[1] == 0:
+		return []
+	with np.errstate(invalid="ignore"):
+		dollar_volume = np.nanmean(close * volume, axis=1)
+	dollar_volume[np.isnan(close[:, -1])] = -np.inf
+	order = np.argsort(-dollar_volume)[:limit]
+	return [panel.tickers[i] for i in order if np.isfinite(dollar_volume[i])]
+
+
+def report_as_of(report_day: dt.date, config: Optional[AppConfig] = None, record: bool = False) -> Optional[Report]:
+	"""report_day 아침에 발송되었을 리포트를 로컬 히스토리만으로 재현
+
+	record=True 면 추천 종목을 이력 저장소에 source='replay' 로 저장한다.
+	"""
+	config = config or AppConfig.load()
+	kr_day, us_day = data_dates(report_day)
+	kr_panel, us_panel = open_panel(history_path("kr")), open_panel(history_path("us"))
+	if kr_panel is None and us_panel is None:
+		print("❌ 히스토리 패널이 없습니다 (python src/point_in_time.py --build)")
+		return None
+
+	created_at = KST.localize(dt.datetime.combine(report_day, REPORT_TIME))
+	kr_items: List[Dict] = []
+	if kr_panel is not None:
+		tickers = kr_candidates_as_of(kr_panel.as_of(kr_day), config.kr_funnel_size)
+		selected = screen_tickers({t: fetch_kr_price_history(t, as_of=kr_day) for t in tickers},
+		                          top_k=3, max_corr=config.max_pair_corr)
+		kr_items = [build_reco_item_kr(t, {**meta}, name=kr_panel.names.get(t)) for t, df, meta in selected]
+		if record:
+			reco_history.record(created_at, "kr", selected, kr_items, source="replay")
+
+	us_items: List[Dict] = []
+	if us_panel is not None:
+		tickers = us_candidates_as_of(us_panel.as_of(us_day))
+		selected = screen_tickers({t: fetch_us_price_history(t, as_of=us_day) for t in tickers},
+		                          top_k=3, max_corr=config.max_pair_corr)
+		us_items = [build_reco_item_us(t, {**meta}, name=us_panel.names.get(t)) for t, df, meta in selected]
+		if record:
+			reco_history.record(created_at, "us", selected, us_items, source="replay")
+
+	return Report(config.user_name, created_at, kr_items, us_items, NO_NEWS)
+
+
+def _replay_day(day: dt.date, out_dir: str) -> Tuple[dt.date, List[str]]:
+	report = report_as_of(day, record=True)
+	if report is None:
+		return day, []
+	publish_report(report, out_dir, day.isoformat())
+	return day, [it["ticker"] for it in report.kr_items + report.us_items]
+
+
+def replay(start: dt.date, end: dt.date, workers: Optional[int] = None, out_dir: Optional[str] = None) -> Dict[dt.date, List[str]]:
+	"""start~end 리포트 발송일을 병렬로 재생하여 reports/replay/ 와 추천 이력(source='replay')에 저장"""
+	out_dir = out_dir or os.path.join(REPORTS_DIR, "replay")
+	days = [start + dt.timedelta(days=i) for i in range((end - start).days + 1)]
+	days = [d for d in days if is_report_day(d)]
+	print(f"⏪ {start} ~ {end} 리포트 {len(days)}일 재생 중...")
+	started = time.perf_counter()
+	results: Dict[dt.date, List[str]] = {}
+	# 각 워커는 히스토리 패널을 자체적으로 매핑하므로 날짜만 전달
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		for day, tickers in pool.map(_replay_day, days, [out_dir] * len(days), chunksize=4):
+			results[day] = tickers
+	elapsed = time.perf_counter() - started
+	print(f"⏱️ {len(days)}일 재생: {elapsed:.1f}s ({len(days) / max(elapsed, 1e-9) * 60:,.0f}일/분)")
+	print("💾 리포트 저장:", out_dir)
+	return results
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="과거 시점 리포트 재생 (로컬 히스토리 사용, 네트워크 불필요)")
+	parser.add_argument("--build", action="store_true", help="히스토리 패널 생성 (네트워크 필요)")
+	parser.add_argument("--universe", type=int, default=500, help="--build 시 시장별 종목 수")
+	parser.add_argument("--years", type=int, default=3, help="--build 시 수집 기간 (년)")
+	parser.add_argument("--date", type=dt.date.fromisoformat, help="한 날짜 리포트를 출력")
+	parser.add_argument("--start", type=dt.date.fromisoformat)
+	parser.add_argument("--end", type=dt.date.fromisoformat)
+	parser.add_argument("--workers", type=int, default=None)
+	args = parser.parse_args()
+
+	if args.build:
+		for m in ("kr", "us"):
+			build_history(m, args.universe, args.years)
+	if args.date:
+		report = report_as_of(args.date)
+		if report is not None:
+			print(report.to_text())
+	if args.start:
+		replay(args.start, args.end or args.start, args.workers)
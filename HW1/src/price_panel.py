@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data"))
+
+_MAGIC = b"PPANEL1\0"
+_ALIGN = 64
+PRICE_FIELDS = ["Open", "High", "Low", "Close"]
+
+
+def panel_path(market: str) -> str:
+	return os.path.join(DATA_DIR, f"{market.lower()}_panel.bin")
+
+
+def picks_path(market: str) -> str:
+	"""추천 종목 수익률 평가용 시세 (그날 후보에서 빠진 추천 종목 포함)"""
+	return os.path.join(DATA_DIR, f"{market.lower()}_picks.bin")
+
+
+def history_path(market: str) -> str:
+	"""과거 시점 재생용 장기 히스토리 패널"""
+	return os.path.join(DATA_DIR, f"{market.lower()}_history.bin")
+
+
+def _day_index(df: pd.DataFrame) -> np.ndarray:
+	idx = pd.DatetimeIndex(df.index)
+	if idx.tz is not None:
+		idx = idx.tz_localize(None)
+	return idx.normalize().values.astype("datetime64[D]")
+
+
+def write_panel(path: str, ticker_to_df: Mapping[str, pd.DataFrame], extra_fields: Optional[List[str]] = None,
+                names: Optional[Mapping[str, str]] = None) -> str:
+	"""여러 종목의 일봉을 공통 날짜축을 가진 compact 패널 파일로 저장
+
+	가격(및 추가 지표) 필드는 float32, 거래량은 int64 로 저장하며,
+	각 배열은 (종목 수, 날짜 수) 형태로 종목별 행이 연속되도록 배치한다.
+	"""
+	frames = {t: df for t, df in ticker_to_df.items() if df is not None and not df.empty}
+	fields = PRICE_FIELDS + list(extra_fields or [])
+	tickers = list(frames)
+	day_index = {t: _day_index(df) for t, df in frames.items()}
+	if frames:
+		dates = np.unique(np.concatenate(list(day_index.values())))
+	else:
+		dates = np.array([], dtype="datetime64[D]")
+	n_t, n_d = len(tickers), len(dates)
+
+	arrays: Dict[str, np.ndarray] = {"dates": dates.astype("int64")}
+	for f in fields:
+		arrays[f] = np.full((n_t, n_d), np.nan, dtype=np.float32)
+	arrays["Volume"] = np.zeros((n_t, n_d), dtype=np.int64)
+	for i, t in enumerate(tickers):
+		df = frames[t]
+		pos = np.searchsorted(dates, day_index[t])
+		for f in fields:
+			if f in df.columns:
+				arrays[f][i, pos] = df[f].to_numpy(dtype=np.float32)
+		arrays["Volume"][i, pos] = np.nan_to_num(df["Volume"].to_numpy(dtype=np.float64)).astype(np.int64)
+
+	layout = {}
+	offset = 0
+	for name, arr in arrays.items():
+		layout[name] = {"offset": offset, "dtype": arr.dtype.str, "shape": list(arr.shape)}
+		offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+	meta = {"tickers": tickers, "fields": fields, "arrays": layout}
+	if names:
+		meta["names"] = {t: names[t] for t in tickers if t in names}
+	header = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+	data_start = -(-(len(_MAGIC) + 8 + len(header)) // _ALIGN) * _ALIGN
+
+	os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+	tmp = f"{path}.tmp{os.getpid()}"
+	with open(tmp, "wb") as f:
+		f.write(_MAGIC)
+		f.write(len(header).to_bytes(8, "little"))
+		f.write(header)
+		for name, arr in arrays.items():
+			f.seek(data_start + layout[name]["offset"])
+			f.write(np.ascontiguousarray(arr).tobytes())
+		f.truncate(data_start + offset)
+	# 원자적 교체: 이미 매핑 중인 프로세스는 이전 파일을 계속 본다
+	os.replace(tmp, path)
+	return path
+
+
+class PricePanel(Mapping[str, pd.DataFrame]):
+	"""읽기 전용 메모리 매핑 가격 패널
+
+	Mapping[ticker, DataFrame] 인터페이스를 제공하므로 기존 ``screen_tickers``
+	등에 그대로 넘길 수 있다. DataFrame 은 매핑된 배열 위의 가벼운 뷰다.
+	"""
+
+	def __init__(self, path: str) -> None:
+		self.path = path
+		with open(path, "rb") as f:
+			if f.read(len(_MAGIC)) != _MAGIC:
+				raise ValueError(f"패널 파일 형식이 아닙니다: {path}")
+			header_len = int.from_bytes(f.read(8), "little")
+			header = json.loads(f.read(header_len).decode("utf-8"))
+		data_start = -(-(len(_MAGIC) + 8 + header_len) // _ALIGN) * _ALIGN
+		self.tickers: List[str] = header["tickers"]
+		self.fields: List[str] = header["fields"]
+		self.names: Dict[str, str] = header.get("names", {})
+		self._row = {t: i for i, t in enumerate(self.tickers)}
+		self._arrays: Dict[str, np.ndarray] = {}
+		for name, spec in header["arrays"].items():
+			shape = tuple(spec["shape"])
+			if 0 in shape:
+				self._arrays[name] = np.empty(shape, dtype=spec["dtype"])
+			else:
+				self._arrays[name] = np.memmap(path, mode="r", dtype=spec["dtype"], offset=data_start + spec["offset"], shape=shape)
+		self.dates = pd.DatetimeIndex(np.asarray(self._arrays["dates"]).astype("datetime64[D]").astype("datetime64[ns]"))
+
+	def as_of(self, day) -> "PricePanel":
+		"""day(포함)까지의 봉만 보이는 뷰 (배열 복사 없음)"""
+		cutoff = np.datetime64(pd.Timestamp(day).date(), "D").astype("int64")
+		hi = int(np.searchsorted(self._arrays["dates"], cutoff, side="right"))
+		view = copy.copy(self)
+		view._arrays = {name: (arr[:hi] if arr.ndim == 1 else arr[:, :hi]) for name, arr in self._arrays.items()}
+		view.dates = self.dates[:hi]
+		return view
+
+	def array(self, field: str) -> np.ndarray:
+		"""(종목 수, 날짜 수) 형태의 읽기 전용 배열"""
+		return self._arrays[field]
+
+	def _valid_range(self, row: int) -> Tuple[int, int]:
+		valid = np.flatnonzero(~np.isnan(self._arrays["Close"][row]))
+		if valid.size == 0:
+			return 0, 0
+		return int(valid[0]), int(valid[-1]) + 1
+
+	def frame(self, ticker: str) -> pd.DataFrame:
+		row = self._row[ticker]
+		lo, hi = self._valid_range(row)
+		cols = {f: self._arrays[f][row, lo:hi] for f in self.fields}
+		cols["Volume"] = self._arrays["Volume"][row, lo:hi]
+		df = pd.DataFrame(cols, index=self.dates[lo:hi], copy=False)
+		# 공통 날짜축이라 중간에 거래가 없던 날은 제외
+		if df["Close"].isna().any():
+			df = df[df["Close"].notna()]
+		return df
+
+	def __getitem__(self, ticker: str) -> pd.DataFrame:
+		return self.frame(ticker)
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self.tickers)
+
+	def __len__(self) -> int:
+		return len(self.tickers)
+
+	def __contains__(self, ticker: object) -> bool:
+		return ticker in self._row
+
+	@property
+	def nbytes(self) -> int:
+		return sum(a.nbytes for a in self._arrays.values())
+
+
+_open_panels: Dict[str, Tuple[float, PricePanel]] = {}
+
+
+def open_panel(path: str) -> Optional[PricePanel]:
+	"""프로세스당 한 번만 매핑 (파일이 교체되면 다시 매핑)"""
+	try:
+		mtime = os.path.getmtime(path)
+	except OSError:
+		return None
+	cached = _open_panels.get(path)
+	if cached and cached[0] == mtime:
+		return cached[1]
+	panel = PricePanel(path)
+	_open_panels[path] = (mtime, panel)
+	return panel
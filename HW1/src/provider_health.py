@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED, TimeoutError as FutureTimeout
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+# hedged 요청의 조율용 (call 이 공급자 풀을 기다리므로 같은 풀을 쓰면 교착 가능)
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+class ProviderUnavailable(RuntimeError):
+	"""회로 차단기가 열려 있거나 모든 대체 공급자가 실패했을 때"""
+
+
+class InvalidResponse(ProviderUnavailable):
+	"""공급자는 응답했지만 결과가 비었거나 accept 를 통과하지 못함 (차단기에는 반영하지 않음)"""
+
+
+class ProviderHealth:
+	"""공급자별 지연 시간 통계 + 회로 차단기
+
+	- 최근 성공 지연 시간의 백분위로 적응형 타임아웃을 계산
+	- 연속 실패가 threshold 를 넘으면 reset_after 초 동안 호출을 차단(open),
+	  이후 한 번 시험 호출(half-open)에 성공하면 다시 허용 (시험 호출은 동시에 하나만)
+	- 호출은 공급자별 풀에서 실행해, 응답 없는 공급자가 붙잡은 스레드가 다른 공급자를 막지 않게 함
+	"""
+
+	def __init__(self, name: str, default_timeout: float = 10.0, min_timeout: float = 1.0,
+	             max_timeout: float = 15.0, failure_threshold: int = 3, reset_after: float = 300.0,
+	             max_workers: int = 16) -> None:
+		self.name = name
+		self.default_timeout = default_timeout
+		self.min_timeout = min_timeout
+		self.max_timeout = max_timeout
+		self.failure_threshold = failure_threshold
+		self.reset_after = reset_after
+		self.latencies: Deque[float] = deque(maxlen=100)
+		self.consecutive_failures = 0
+		self.opened_at: Optional[float] = None
+		self.max_workers = max_workers
+		self.abandoned = 0  # 타임아웃으로 버렸지만 아직 실행 중인 호출
+		# 느린 호출을 기다리지 않고 버릴 수 있도록 별도 풀에서 실행
+		self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"provider-{name}")
+		self._trial = False  # half-open 시험 호출 진행 중
+		self._lock = threading.Lock()
+
+	def percentile(self, q: float) -> Optional[float]:
+		with self._lock:
+			if len(self.latencies) < 5:
+				return None
+			data = sorted(self.latencies)
+		return data[min(len(data) - 1, int(q * len(data)))]
+
+	def timeout(self) -> float:
+		p95 = self.percentile(0.95)
+		if p95 is None:
+			return self.default_timeout
+		return max(self.min_timeout, min(self.max_timeout, p95 * 2))
+
+	def _cooled_down(self) -> bool:
+		return time.monotonic() - self.opened_at >= self.reset_after
+
+	def available(self) -> bool:
+		"""호출할 수 있는 상태인지 (시험 호출 자리를 차지하지 않음)"""
+		with self._lock:
+			return self.opened_at is None or (self._cooled_down() and not self._trial)
+
+	def allow(self) -> bool:
+		"""호출 허용 여부 - half-open 이면 첫 호출 하나만 시험 호출로 통과"""
+		with self._lock:
+			if self.opened_at is None:
+				return True
+			if self._trial or not self._cooled_down():
+				return False
+			self._trial = True
+			return True
+
+	def abandon(self, future: Future) -> None:
+		"""타임아웃으로 버린 호출 - 끝날 때까지 풀의 스레드를 차지한 것으로 셈"""
+		with self._lock:
+			self.abandoned += 1
+		future.add_done_callback(self._release)
+
+	def _release(self, _future: Future) -> None:
+		with self._lock:
+			self.abandoned -= 1
+
+	def saturated(self) -> bool:
+		"""버린 호출이 풀을 모두 차지해 새 호출이 대기열에서 타임아웃될 상태"""
+		with self._lock:
+			return self.abandoned >= self.max_workers
+
+	def record_success(self, latency: float) -> None:
+		with self._lock:
+			self.latencies.append(latency)
+			self.consecutive_failures = 0
+			self.opened_at = None
+			self._trial = False
+
+	def record_failure(self) -> None:
+		with self._lock:
+			self._trial = False
+			self.consecutive_failures += 1
+			if self.consecutive_failures >= self.failure_threshold:
+				if self.opened_at is None:
+					print(f"🚧 공급자 차단: {self.name} (연속 실패 {self.consecutive_failures}회)")
+				self.opened_at = time.monotonic()
+
+	@property
+	def state(self) -> str:
+		if self.opened_at is None:
+			return "closed"
+		return "half-open" if self._trial or self.available() else "open"
+
+
+_registry: Dict[str, ProviderHealth] = {}
+_registry_lock = threading.Lock()
+
+
+def provider(name: str, **kwargs: Any) -> ProviderHealth:
+	with _registry_lock:
+		if name not in _registry:
+			_registry[name] = ProviderHealth(name, **kwargs)
+		return _registry[name]
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+	"""공급자별 상태 요약 (모니터링용)"""
+	return {
+		name: {"state": h.state, "p50": h.percentile(0.5), "p95": h.percentile(0.95), "timeout": h.timeout()}
+		for name, h in list(_registry.items())
+	}
+
+
+def call(name: str, fn: Callable[..., Any], *args: Any, accept: Optional[Callable[[Any], bool]] = None,
+         pass_timeout: bool = False, **kwargs: Any) -> Any:
+	"""차단기/적응형 타임아웃을 적용해 공급자 호출
+
+	pass_timeout=True 면 fn 에 timeout 키워드로 전달(HTTP), 아니면 결과 대기 시간을 제한한다.
+	"""
+	health = provider(name)
+	if health.saturated():
+		raise ProviderUnavailable(f"{name} 응답 없는 호출 {health.abandoned}건이 작업 스레드를 모두 점유 중")
+	if not health.allow():
+		raise ProviderUnavailable(f"{name} 차단 중")
+	timeout = health.timeout()
+	if pass_timeout:
+		kwargs["timeout"] = timeout
+	started = time.perf_counter()
+	future = health.pool.submit(fn, *args, **kwargs)
+	try:
+		result = future.result(timeout=timeout + (1.0 if pass_timeout else 0.0))
+	except FutureTimeout:
+		health.abandon(future)
+		health.record_failure()
+		raise ProviderUnavailable(f"{name} 응답 지연 ({timeout:.1f}s 초과)")
+	except Exception:
+		health.record_failure()
+		raise
+	if not getattr(result, "from_cache", False):
+		# 디스크 캐시/재생 응답의 지연 시간은 공급자 상태와 무관하므로 통계에서 제외
+		health.record_success(time.perf_counter() - started)
+	if accept is not None and not accept(result):
+		# 상장폐지 종목의 빈 결과처럼 이번 호출만의 문제 → 다른 공급자로 넘어가되 차단하지 않음
+		raise InvalidResponse(f"{name} 유효하지 않은 응답")
+	return result
+
+
+def hedged(calls: Sequence[Tuple[str, Callable[[], Any]]], accept: Optional[Callable[[Any], bool]] = None,
+           hedge_after: Optional[float] = None) -> Any:
+	"""대체 공급자에 대한 hedged 요청
+
+	첫 공급자를 호출하고, 평소 지연(p90)을 넘기거나 실패하면 다음 공급자를 추가로 호출한다.
+	가장 먼저 성공한 결과를 반환하므로 꼬리 지연은 대략 min(공급자 지연) + hedge 지연으로 제한된다.
+	"""
+	pending: Dict[Future, str] = {}
+	queue: List[Tuple[str, Callable[[], Any]]] = [c for c in calls if provider(c[0]).available()]
+	if not queue:
+		raise ProviderUnavailable("사용 가능한 공급자 없음: " + ", ".join(n for n, _ in calls))
+	errors: List[str] = []
+
+	def launch() -> None:
+		name, fn = queue.pop(0)
+		pending[_hedge_pool.submit(call, name, fn, accept=accept)] = name
+
+	launch()
+	while pending:
+		delay = hedge_after
+		if delay is None:
+			p90 = provider(pending[next(iter(pending))]).percentile(0.9)
+			delay = p90 * 1.5 if p90 else 2.0
+		done, _ = wait(list(pending), timeout=delay if queue else None, return_when=FIRST_COMPLETED)
+		if not done:
+			launch()  # 지연 → 다음 공급자 동시 호출
+			continue
+		for fut in done:
+			name = pending.pop(fut)
+			try:
+				return fut.result()
+			except Exception as e:
+				errors.append(f"{name}: {e}")
+				if queue:
+					launch()
+	raise ProviderUnavailable("모든 공급자 실패 (" + "; ".join(errors) + ")")
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+MODEL_PATH = os.getenv("RANKER_MODEL") or os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "models", "ranker.npz"))
+
+# _screen_one 의 meta 에서 만드는 모델 입력 특징
+FEATURES = ("trend_5_20", "trend_20_60", "price_sma5", "rsi", "macd_gap", "bb_pos", "vol_ratio", "range_pos")
+_META_KEYS = ("close", "sma5", "sma20", "sma60", "rsi", "macd", "macd_signal", "bb_lower", "bb_upper",
+              "vol", "vol_avg20", "low_52w", "high_52w")
+
+
+def feature_matrix(metas: Sequence[Dict[str, Any]]) -> np.ndarray:
+	"""후보 전체의 meta → (종목 수, 특징 수) 행렬 (결측은 NaN)"""
+	raw = np.array([[m.get(k, np.nan) for k in _META_KEYS] for m in metas], dtype=np.float64).reshape(len(metas), len(_META_KEYS))
+	close, sma5, sma20, sma60, rsi, macd, signal, bb_lo, bb_hi, vol, vol_avg, low, high = raw.T
+	with np.errstate(divide="ignore", invalid="ignore"):
+		cols = [
+			sma5 / sma20 - 1,
+			sma20 / sma60 - 1,
+			close / sma5 - 1,
+			rsi / 100,
+			(macd - signal) / close,
+			(close - bb_lo) / (bb_hi - bb_lo),
+			np.log(vol / vol_avg),
+			(close - low) / (high - low),
+		]
+	out = np.stack(cols, axis=1)
+	out[~np.isfinite(out)] = np.nan
+	return out
+
+
+class RuleRanker:
+	"""기존 score_row 점수를 그대로 사용 (모델이 없을 때의 기본값)"""
+	name = "rule"
+
+	def score(self, metas: Sequence[Dict[str, Any]]) -> np.ndarray:
+		return np.array([m.get("score", 0.0) for m in metas], dtype=np.float64)
+
+
+class NumpyRanker:
+	"""NumPy 로 내보낸 로지스틱 회귀 / 소형 MLP
+
+	.npz 구성: features, mean, std, W0, b0, W1, b1, ... (마지막 층 출력 1개).
+	은닉층은 ReLU, 출력은 시그모이드로 "forward 수익률이 양수일 확률"을 낸다.
+	"""
+	name = "numpy"
+
+	def __init__(self, params: Mapping[str, np.ndarray]) -> None:
+		features = tuple(str(f) for f in params["features"])
+		if features != FEATURES:
+			raise ValueError(f"모델 특징이 다릅니다: {features}")
+		self.mean = params["mean"].astype(np.float32)
+		self.std = params["std"].astype(np.float32)
+		n_layers = sum(1 for k in params if k.startswith("W"))
+		self.layers = [(params[f"W{i}"].astype(np.float32), params[f"b{i}"].astype(np.float32)) for i in range(n_layers)]
+
+	@classmethod
+	def load(cls, path: str) -> "NumpyRanker":
+		with np.load(path) as data:
+			return cls({k: data[k] for k in data.files})
+
+	def score(self, metas: Sequence[Dict[str, Any]]) -> np.ndarray:
+		x = (feature_matrix(metas).astype(np.float32) - self.mean) / self.std
+		x = np.nan_to_num(x, nan=0.0)  # 결측 특징은 평균값으로
+		for i, (w, b) in enumerate(self.layers):
+			x = x @ w + b
+			if i < len(self.layers) - 1:
+				np.maximum(x, 0, out=x)
+		return 1 / (1 + np.exp(-x[:, 0].astype(np.float64)))
+
+
+class OnnxRanker:
+	"""ONNX 모델 (onnxruntime 필요). 입력은 FEATURES 순서의 float32 행렬"""
+	name = "onnx"
+
+	def __init__(self, path: str) -> None:
+		import onnxruntime  # 선택 의존성
+
+		self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+		self.input_name = self.session.get_inputs()[0].name
+
+	def score(self, metas: Sequence[Dict[str, Any]]) -> np.ndarray:
+		x = np.nan_to_num(feature_matrix(metas).astype(np.float32), nan=0.0)
+		out = self.session.run(None, {self.input_name: x})[0]
+		return np.asarray(out, dtype=np.float64).reshape(len(metas), -1)[:, -1]
+
+
+def load_ranker(path: Optional[str] = MODEL_PATH):
+	"""모델 파일이 있으면 모델 랭커, 없거나 읽을 수 없으면 규칙 랭커"""
+	if not path or not os.path.exists(path):
+		return RuleRanker()
+	try:
+		return OnnxRanker(path) if path.endswith(".onnx") else NumpyRanker.load(path)
+	except Exception as e:
+		print(f"⚠️ 랭킹 모델 로드 실패 ({path}): {e} → 규칙 점수 사용")
+		return RuleRanker()
+
+
+_ranker = None
+
+
+def get_ranker():
+	"""프로세스당 한 번만 로드"""
+	global _ranker
+	if _ranker is None:
+		_ranker = load_ranker()
+	return _ranker
+
+
+def rank_metas(metas: List[Dict[str, Any]], ranker=None) -> None:
+	"""후보 전체를 한 번에 채점해 meta["score"] 갱신 (규칙 점수는 rule_score 로 보존)
+
+	모델 추론이 실패하거나 한 후보라도 NaN/inf 를 내면 배치 전체가 규칙 점수를 그대로 쓴다
+	(모델 확률 0~1 과 규칙 점수 0~5 가 한 순위에 섞이지 않도록).
+	이미 채점된 후보를 다시 넣으면 규칙 점수로 되돌린 뒤 채점하므로, 청크/샤드별로 채점한 후보를
+	합친 풀 전체를 다시 채점하는 데 쓸 수 있다.
+	"""
+	ranker = ranker or get_ranker()
+	for meta in metas:
+		if "rule_score" in meta:
+			meta["score"] = meta.pop("rule_score")
+			meta.pop("ranker", None)
+	if not metas or isinstance(ranker, RuleRanker):
+		return
+	try:
+		scores = ranker.score(metas)
+	except Exception as e:
+		print(f"⚠️ 모델 추론 실패: {e} → 규칙 점수 사용")
+		return
+	scores = np.asarray(scores, dtype=np.float64)
+	if len(scores) != len(metas) or not np.isfinite(scores).all():
+		print(f"⚠️ 모델 점수에 NaN/inf 가 있어 이번 배치는 규칙 점수 사용 ({ranker.name})")
+		return
+	for meta, score in zip(metas, scores):
+		meta["rule_score"] = meta.get("score")
+		meta["score"] = float(score)
+		meta["ranker"] = ranker.name
+
+
+def train_logistic(x: np.ndarray, y: np.ndarray, hidden: int = 0, epochs: int = 500, lr: float = 0.1,
+                   l2: float = 1e-3, seed: int = 0) -> Dict[str, np.ndarray]:
+	"""특징 행렬/이진 라벨로 로지스틱 회귀(hidden=0) 또는 1층 MLP 학습 → .npz 로 저장할 배열"""
+	rng = np.random.default_rng(seed)
+	mean = np.nanmean(x, axis=0)
+	std = np.nanstd(x, axis=0)
+	std[~(std > 0)] = 1.0
+	z = np.nan_to_num((x - mean) / std)
+	sizes = [z.shape[1]] + ([hidden] if hidden else []) + [1]
+	weights = [rng.normal(0, 1 / np.sqrt(a), (a, b)) for a, b in zip(sizes, sizes[1:])]
+	biases = [np.zeros(b) for b in sizes[1:]]
+	y = y.reshape(-1, 1).astype(np.float64)
+	for _ in range(epochs):
+		acts = [z]
+		for i, (w, b) in enumerate(zip(weights, biases)):
+			h = acts[-1] @ w + b
+			acts.append(np.maximum(h, 0) if i < len(weights) - 1 else 1 / (1 + np.exp(-h)))
+		grad = (acts[-1] - y) / len(y)
+		for i in reversed(range(len(weights))):
+			gw = acts[i].T @ grad + l2 * weights[i]
+			gb = grad.sum(axis=0)
+			if i:
+				grad = (grad @ weights[i].T) * (acts[i] > 0)
+			weights[i] -= lr * gw
+			biases[i] -= lr * gb
+	out = {"features": np.array(FEATURES), "mean": mean, "std": std}
+	for i, (w, b) in enumerate(zip(weights, biases)):
+		out[f"W{i}"], out[f"b{i}"] = w, b
+	return out
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="추천 랭킹 모델 학습/벤치마크")
+	parser.add_argument("--train", action="store_true", help="추천 이력(meta + 5일 수익률)으로 모델 학습")
+	parser.add_argument("--hidden", type=int, default=0, help="은닉 노드 수 (0 이면 로지스틱 회귀)")
+	parser.add_argument("--bench", type=int, default=3000, help="가상 후보 N개 추론 시간 측정")
+	args = parser.parse_args()
+
+	if args.train:
+		from reco_history import reco_history
+
+		reco_history.evaluate()
+		picks = [p for p in reco_history.query(limit=1_000_000) if p["ret_5d"] is not None]
+		if len(picks) < 50:
+			print(f"❌ 학습 표본 부족 ({len(picks)}건) - 과거 시점 재생으로 이력을 먼저 쌓으세요")
+		else:
+			x = feature_matrix([p["meta"] for p in picks])
+			y = np.array([p["ret_5d"] > 0 for p in picks])
+			params = train_logistic(x, y, hidden=args.hidden)
+			os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
+			np.savez(MODEL_PATH, **params)
+			print(f"💾 모델 저장: {MODEL_PATH} (표본 {len(picks):,}건, 양수 비율 {y.mean():.1%})")
+
+	rng = np.random.default_rng(0)
+	metas = [{
+		"score": 2.0, "close": c, "sma5": c * rng.uniform(.95, 1.05), "sma20": c * rng.uniform(.9, 1.1),
+		"sma60": c * rng.uniform(.85, 1.15), "rsi": rng.uniform(10, 90), "macd": rng.normal(), "macd_signal": rng.normal(),
+		"bb_lower": c * .9, "bb_upper": c * 1.1, "vol": rng.uniform(1e5, 1e6), "vol_avg20": 5e5,
+		"low_52w": c * .7, "high_52w": c * 1.3,
+	} for c in rng.uniform(10, 1000, args.bench)]
+	ranker = load_ranker()
+	if isinstance(ranker, RuleRanker):
+		# 모델 파일이 없으면 임의 라벨로 학습한 32노드 MLP 로 추론 비용만 측정
+		x = feature_matrix(metas)
+		ranker = NumpyRanker(train_logistic(x, rng.random(len(x)) > 0.5, hidden=32, epochs=1))
+	started = time.perf_counter()
+	scores = ranker.score(metas)
+	print(f"⚡ {ranker.name} 랭커: 후보 {len(metas):,}개 추론 {(time.perf_counter() - started) * 1000:.1f}ms")
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from price_panel import DATA_DIR, history_path, open_panel, panel_path, picks_path, write_panel
+
+DB_PATH = os.getenv("RECO_DB_PATH") or os.path.join(DATA_DIR, "reco_history.sqlite")
+HORIZONS = (1, 5, 20)  # forward 수익률 기간 (거래일)
+GIVE_UP_DAYS = 60  # 이 기간(달력일)이 지나도 채워지지 않은 수익률은 더 찾지 않음
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS picks (
+	id INTEGER PRIMARY KEY,
+	run_at TEXT NOT NULL,       -- 리포트 생성 시각 (ISO, KST)
+	trade_date TEXT NOT NULL,   -- 채점에 쓴 마지막 봉 날짜
+	market TEXT NOT NULL,
+	rank INTEGER NOT NULL,
+	ticker TEXT NOT NULL,
+	name TEXT,
+	score REAL,
+	close REAL,
+	reason TEXT,
+	entry TEXT,
+	exit TEXT,
+	meta TEXT,
+	source TEXT NOT NULL DEFAULT 'live',
+	{", ".join(f"ret_{h}d REAL" for h in HORIZONS)},
+	eval_done INTEGER NOT NULL DEFAULT 0,  -- 수익률을 다 채웠거나 GIVE_UP_DAYS 가 지남 (evaluate 대상에서 제외)
+	UNIQUE (run_at, market, ticker, source)
+);
+CREATE INDEX IF NOT EXISTS picks_date ON picks (trade_date);
+CREATE INDEX IF NOT EXISTS picks_ticker ON picks (ticker, trade_date);
+CREATE INDEX IF NOT EXISTS picks_market ON picks (market, trade_date);
+"""
+
+
+def _clean(value: Any) -> Any:
+	"""JSON 저장용: NaN → None, numpy 스칼라 → 파이썬 값"""
+	if isinstance(value, (np.floating, np.integer)):
+		value = value.item()
+	if isinstance(value, float) and math.isnan(value):
+		return None
+	return value
+
+
+class RecoHistory:
+	"""실행마다 추천 종목을 구조화해 저장하는 SQLite 저장소
+
+	forward 수익률은 가격 패널에서 (종목 행, 날짜 열) 인덱스로 한 번에 모아 계산한다.
+	"""
+
+	def __init__(self, path: str = DB_PATH) -> None:
+		self.path = path
+		self._local = threading.local()
+
+	def _conn(self) -> sqlite3.Connection:
+		# 스레드마다 연결 하나 (웹 서버 워커 스레드에서도 사용), fork 된 프로세스는 새로 연결
+		conn = getattr(self._local, "conn", None)
+		if conn is None or self._local.pid != os.getpid():
+			os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+			conn = sqlite3.connect(self.path, timeout=30)
+			conn.row_factory = sqlite3.Row
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.executescript(_SCHEMA)
+			_migrate(conn)
+			self._local.conn = conn
+			self._local.pid = os.getpid()
+		return conn
+
+	def record(self, run_at: datetime, market: str, selected: Sequence[Tuple[str, pd.DataFrame, Dict[str, Any]]],
+	           items: Sequence[Dict[str, Any]], source: str = "live") -> int:
+		"""screen_tickers 결과와 리포트 아이템을 함께 저장 (같은 실행은 덮어씀)"""
+		by_ticker = {it["ticker"]: it for it in items}
+		rows = []
+		for rank, (ticker, df, meta) in enumerate(selected, start=1):
+			item = by_ticker.get(ticker, {})
+			trade_date = pd.Timestamp(df.index[-1]).strftime("%Y-%m-%d") if len(df) else run_at.strftime("%Y-%m-%d")
+			rows.append((
+				run_at.isoformat(), trade_date, market, rank, ticker, item.get("name"),
+				_clean(meta.get("score")), _clean(meta.get("close")),
+				item.get("reason"), item.get("entry"), item.get("exit"),
+				json.dumps({k: _clean(v) for k, v in meta.items()}, ensure_ascii=False), source,
+			))
+		with self._conn() as conn:
+			conn.executemany(
+				"INSERT OR REPLACE INTO picks (run_at, trade_date, market, rank, ticker, name, score, close,"
+				" reason, entry, exit, meta, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+		return len(rows)
+
+	def query(self, start: Optional[str] = None, end: Optional[str] = None, ticker: Optional[str] = None,
+	          market: Optional[str] = None, source: Optional[str] = None, limit: int = 500) -> List[Dict[str, Any]]:
+		"""날짜(trade_date, YYYY-MM-DD)·종목·시장 조건으로 추천 이력 조회 (최신순)"""
+		where, args = [], []
+		for cond, value in (("trade_date >= ?", start), ("trade_date <= ?", end), ("ticker = ?", ticker),
+		                    ("market = ?", market), ("source = ?", source)):
+			if value:
+				where.append(cond)
+				args.append(value)
+		sql = "SELECT * FROM picks" + (" WHERE " + " AND ".join(where) if where else "")
+		sql += " ORDER BY trade_date DESC, market, rank LIMIT ?"
+		rows = self._conn().execute(sql, args + [limit]).fetchall()
+		out = []
+		for row in rows:
+			d = dict(row)
+			d["meta"] = json.loads(d["meta"]) if d["meta"] else {}
+			out.append(d)
+		return out
+
+	def pending_tickers(self, market: str, now: Optional[datetime] = None) -> List[str]:
+		"""GIVE_UP_DAYS 안에서 아직 수익률을 다 채우지 못한 추천 종목"""
+		since = _cutoff(now).strftime("%Y-%m-%d")
+		rows = self._conn().execute(
+			"SELECT DISTINCT ticker FROM picks WHERE eval_done = 0 AND market = ? AND trade_date >= ?",
+			(market, since)).fetchall()
+		return sorted(r[0] for r in rows)
+
+	def update_prices(self, market: str, fetch: Callable[[str], pd.DataFrame],
+	                  now: Optional[datetime] = None) -> Optional[str]:
+		"""평가 대기 중인 추천 종목 중 오늘 패널에 없는 종목의 시세를 picks_path 패널에 저장
+
+		매일 패널은 그날 후보 종목만 담으므로, 다음 날 후보에서 빠진 추천 종목도
+		이 패널에서 forward 수익률을 계속 채운다. 저장할 종목이 없으면 None.
+		"""
+		daily = open_panel(panel_path(market))
+		tickers = [t for t in self.pending_tickers(market, now) if daily is None or t not in daily]
+		if not tickers:
+			return None
+		frames = {}
+		for ticker in tickers:
+			try:
+				frames[ticker] = fetch(ticker)
+			except Exception as e:
+				print(f"⚠️ 추천 종목 시세 조회 실패 ({ticker}): {e}")
+		return write_panel(picks_path(market), frames)
+
+	def evaluate(self, now: Optional[datetime] = None) -> int:
+		"""평가가 끝나지 않은 추천의 forward 수익률을 시장별로 한 번에 계산, 새로 채운 추천 수 반환
+
+		수익률을 모두 채웠거나 GIVE_UP_DAYS 가 지난 추천은 eval_done 으로 표시해 다음 평가부터 다시 읽지 않는다.
+		오늘 패널에 없는 종목은 끝난 것으로 보지 않는다 (update_prices 의 시세나 히스토리 패널로 나중에 채움).
+		"""
+		cols = [f"ret_{h}d" for h in HORIZONS]
+		conn = self._conn()
+		pending = pd.read_sql_query(
+			f"SELECT id, market, ticker, trade_date, {', '.join(cols)} FROM picks WHERE eval_done = 0", conn)
+		if pending.empty:
+			return 0
+		cutoff = _cutoff(now)
+		updates: List[Tuple] = []
+		filled = 0
+		for market, group in pending.groupby("market"):
+			known = group[cols].to_numpy(dtype=np.float64)
+			rets = known.copy()
+			# 매일 갱신되는 패널을 먼저 보고, 없는 종목/기간은 추천 종목 패널과 장기 히스토리 패널에서 보충
+			for path in (panel_path(market), picks_path(market), history_path(market)):
+				todo = np.isnan(rets).any(axis=1)
+				if todo.any():
+					found = _forward_returns(path, group[todo], HORIZONS)
+					rets[todo] = np.where(np.isnan(rets[todo]), found, rets[todo])
+			complete = ~np.isnan(rets).any(axis=1)
+			stale = (pd.to_datetime(group["trade_date"]) < cutoff).to_numpy()
+			done = complete | stale
+			new = (np.isnan(known) & ~np.isnan(rets)).any(axis=1)
+			filled += int(new.sum())
+			for pick_id, values, is_done, changed in zip(group["id"], rets, done, new):
+				if changed or is_done:
+					updates.append(tuple(_clean(v) for v in values) + (int(is_done), int(pick_id)))
+		with conn:
+			# 이미 채운 값은 패널에서 종목이 빠져도 지우지 않음
+			conn.executemany(
+				f"UPDATE picks SET {', '.join(f'{c} = COALESCE({c}, ?)' for c in cols)}, eval_done = ? WHERE id = ?",
+				updates)
+		return filled
+
+	def performance(self, market: Optional[str] = None, source: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+		"""기간별 평균 수익률·승률·표본 수 (대시보드용)"""
+		where, args = [], []
+		for cond, value in (("market = ?", market), ("source = ?", source)):
+			if value:
+				where.append(cond)
+				args.append(value)
+		clause = " WHERE " + " AND ".join(where) if where else ""
+		out = {}
+		for h in HORIZONS:
+			c = f"ret_{h}d"
+			row = self._conn().execute(
+				f"SELECT COUNT({c}), AVG({c}), AVG(CASE WHEN {c} > 0 THEN 1.0 ELSE 0.0 END) FROM picks"
+				f"{clause}{' AND' if where else ' WHERE'} {c} IS NOT NULL", args).fetchone()
+			out[f"{h}d"] = {"count": row[0], "mean_return": row[1], "hit_rate": row[2]}
+		return out
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+	"""이전 스키마 DB 에 새 열 추가"""
+	columns = {row[1] for row in conn.execute("PRAGMA table_info(picks)")}
+	if "eval_done" not in columns:
+		conn.execute("ALTER TABLE picks ADD COLUMN eval_done INTEGER NOT NULL DEFAULT 0")
+	conn.execute("CREATE INDEX IF NOT EXISTS picks_pending ON picks (eval_done)")
+
+
+def _cutoff(now: Optional[datetime]) -> pd.Timestamp:
+	"""이 날짜 이전에 추천된 종목은 수익률을 더 찾지 않음"""
+	return pd.Timestamp(now or datetime.now()).tz_localize(None) - pd.Timedelta(days=GIVE_UP_DAYS)
+
+
+def _forward_returns(path: str, picks: pd.DataFrame, horizons: Sequence[int]) -> np.ndarray:
+	"""가격 패널에서 (종목, 거래일) → h 거래일 후 종가 수익률 (len(picks), len(horizons))"""
+	out = np.full((len(picks), len(horizons)), np.nan)
+	panel = open_panel(path)
+	if panel is None or len(panel) == 0:
+		return out
+	row_of = {t: i for i, t in enumerate(panel.tickers)}
+	rows = np.array([row_of.get(t, -1) for t in picks["ticker"]])
+	days = pd.to_datetime(picks["trade_date"]).values.astype("datetime64[D]").astype("int64")
+	dates = np.asarray(panel.array("dates"))
+	cols = np.searchsorted(dates, days)
+	found = (rows >= 0) & (cols < len(dates))
+	found[found] &= dates[cols[found]] == days[found]
+	if not found.any():
+		return out
+	close = panel.array("Close")
+	r, c = rows[found], cols[found]
+	base = close[r, c].astype(np.float64)
+	for j, h in enumerate(horizons):
+		ahead = c + h
+		ok = ahead < len(dates)
+		future = np.full(len(r), np.nan)
+		future[ok] = close[r[ok], ahead[ok]]
+		with np.errstate(invalid="ignore", divide="ignore"):
+			out[found, j] = future / base - 1
+	return out
+
+
+# 전역 인스턴스
+reco_history = RecoHistory()
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="추천 이력 조회 및 forward 수익률 평가")
+	parser.add_argument("--evaluate", action="store_true", help="평가가 끝나지 않은 추천의 forward 수익률 일괄 계산")
+	parser.add_argument("--market", choices=["kr", "us"])
+	parser.add_argument("--ticker")
+	parser.add_argument("--start")
+	parser.add_argument("--end")
+	parser.add_argument("--source", choices=["live", "replay"])
+	args = parser.parse_args()
+
+	if args.evaluate:
+		started = time.perf_counter()
+		n = reco_history.evaluate()
+		print(f"📈 추천 {n:,}건 수익률 갱신: {time.perf_counter() - started:.2f}s")
+	for pick in reco_history.query(args.start, args.end, args.ticker, args.market, args.source, limit=20):
+		rets = " ".join(f"{h}d={pick[f'ret_{h}d']:+.2%}" if pick[f"ret_{h}d"] is not None else f"{h}d=-" for h in HORIZONS)
+		print(f"{pick['trade_date']} {pick['market']} #{pick['rank']} {pick['ticker']} {pick['name'] or ''} (점수 {pick['score']}) {rets}")
+	print(json.dumps(reco_history.performance(args.market, args.source), ensure_ascii=False, indent=2))
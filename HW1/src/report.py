@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import html
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pytz
 
 from data_fetchers import get_kr_ticker_name, get_us_ticker_name
@@ -10,78 +18,275 @@ from data_fetchers import get_kr_ticker_name, get_us_ticker_name
 KST = pytz.timezone("Asia/Seoul")
 
 
+def format_price(value: float, market: str = "kr") -> str:
+	if market == "us":
+		return f"${value:,.2f}"
+	return f"{value:,.0f}원"
+
+
+def format_reco_item(label: str, it: Dict[str, Any]) -> List[str]:
+	"""종목 하나의 추천 블록 (label 예: "🔥 1.")"""
+	name = it["name"]
+	code = it["ticker"]
+	reason = it["reason"]
+	entry = it["entry"]
+	exit_ = it["exit"]
+	close = it["close"]
+	low52 = it["low_52w"]
+	high52 = it["high_52w"]
+	market = it.get("market", "kr")
+	
+	# 이모지와 함께 더 보기 좋게 포맷팅
+	return [
+		f"{label} {name} ({code})",
+		"",
+		f"📊 추천 이유:",
+		f"   {reason}",
+		"",
+		f"📈 매수 시점:",
+		f"   {entry}",
+		"",
+		f"📉 매도 시점:",
+		f"   {exit_}",
+		"",
+		f"💰 가격 정보:",
+		f"   현재가: {format_price(close, market)}",
+		f"   52주 최저: {format_price(low52, market)}",
+		f"   52주 최고: {format_price(high52, market)}",
+		"",
+		"─" * 20,
+		"",
+	]
+
+
 def format_recommendation_block(title: str, items: List[Dict[str, Any]]) -> str:
 	lines = [title]
 	for idx, it in enumerate(items, start=1):
-		name = it["name"]
-		code = it["ticker"]
-		reason = it["reason"]
-		entry = it["entry"]
-		exit_ = it["exit"]
-		close = it["close"]
-		low52 = it["low_52w"]
-		high52 = it["high_52w"]
-		
-		# 이모지와 함께 더 보기 좋게 포맷팅
-		lines.append(f"🔥 {idx}. {name} ({code})")
-		lines.append("")
-		lines.append(f"📊 추천 이유:")
-		lines.append(f"   {reason}")
-		lines.append("")
-		lines.append(f"📈 매수 시점:")
-		lines.append(f"   {entry}")
-		lines.append("")
-		lines.append(f"📉 매도 시점:")
-		lines.append(f"   {exit_}")
-		lines.append("")
-		lines.append(f"💰 가격 정보:")
-		lines.append(f"   현재가: {close:,.0f}원")
-		lines.append(f"   52주 최저: {low52:,.0f}원")
-		lines.append(f"   52주 최고: {high52:,.0f}원")
-		lines.append("")
-		lines.append("─" * 20)
-		lines.append("")
+		lines.extend(format_reco_item(f"🔥 {idx}.", it))
 	return "\n".join(lines).strip()
 
 
+class ReportRenderer:
+	"""한 번 계산한 시장 데이터로 여러 사용자의 리포트를 렌더링
+
+	사용자와 무관한 부분(추천 블록, 뉴스, 주의사항)은 생성 시 한 번만 문자열로 만들어 두고,
+	사용자별로는 이름·시장 선호·관심 종목 부분만 이어 붙인다. 관심 종목 블록은 종목별로 캐시된다.
+	"""
+
+	def __init__(self, kr_recos: List[Dict[str, Any]], us_recos: List[Dict[str, Any]], news_summary: str,
+	             watch_items: Optional[Dict[str, Dict[str, Any]]] = None, now: Optional[datetime] = None) -> None:
+		now_kst = now or datetime.now(KST)
+		stamp = now_kst.strftime("%Y년 %m월 %d일 %H시 %M분")
+		self._head = "=" * 25 + "\n📈 "
+		self._after_name = f"님을 위한 오늘의 주식 보고서 📈\n{'=' * 25}\n📅 보고 날짜: {stamp}\n\n"
+		self._kr = f"🇰🇷 국내 주식 추천 (TOP 3)\n\n{format_recommendation_block('', kr_recos)}\n\n"
+		self._us = f"🇺🇸 해외 주식 추천 (TOP 3)\n\n{format_recommendation_block('', us_recos)}\n\n"
+		self._tail = "\n".join([
+			"📰 시장 뉴스 요약",
+			"─" * 15,
+			news_summary,
+			"",
+			"⚠️ 투자 주의사항",
+			"─" * 15,
+			"• 본 정보는 투자 참고용이며, 투자 결정은 본인의 판단과 책임하에 이루어져야 합니다.",
+			"• 과거 성과가 미래 수익을 보장하지 않습니다.",
+			"• 투자 전 충분한 검토와 리스크 관리가 필요합니다.",
+			"",
+			"=" * 25,
+		])
+		self.watch_items = watch_items or {}
+		self._watch_blocks: Dict[str, str] = {}
+
+	def _watch_block(self, ticker: str) -> Optional[str]:
+		block = self._watch_blocks.get(ticker)
+		if block is None:
+			item = self.watch_items.get(ticker)
+			if item is None:
+				return None
+			block = "\n".join(format_reco_item("⭐", item))
+			self._watch_blocks[ticker] = block
+		return block
+
+	def render(self, user_name: str, market: str = "all", watchlist: Optional[List[str]] = None) -> str:
+		parts = [self._head, user_name, self._after_name]
+		if market in ("all", "kr"):
+			parts.append(self._kr)
+		if market in ("all", "us"):
+			parts.append(self._us)
+		if watchlist:
+			blocks = [b for b in map(self._watch_block, watchlist) if b]
+			if blocks:
+				parts.append("⭐ 관심 종목\n\n" + "\n".join(blocks).strip() + "\n\n")
+		parts.append(self._tail)
+		return "".join(parts)
+
+
 def build_report(user_name: str, kr_recos: List[Dict[str, Any]], us_recos: List[Dict[str, Any]], news_summary: str) -> str:
-	now_kst = datetime.now(KST)
-	header = f"📈 {user_name}님을 위한 오늘의 주식 보고서 📈"
-	stamp = now_kst.strftime("%Y년 %m월 %d일 %H시 %M분")
-	
-	lines: List[str] = [
-		"=" * 25,
-		header,
-		"=" * 25,
-		f"📅 보고 날짜: {stamp}",
-		"",
-		"🇰🇷 국내 주식 추천 (TOP 3)",
-		""
-	]
-	
-	lines.append(format_recommendation_block("", kr_recos))
-	lines.append("")
-	lines.append("🇺🇸 해외 주식 추천 (TOP 3)")
-	lines.append("")
-	lines.append(format_recommendation_block("", us_recos))
-	lines.append("")
-	lines.append("📰 시장 뉴스 요약")
-	lines.append("─" * 15)
-	lines.append(news_summary)
-	lines.append("")
-	lines.append("⚠️ 투자 주의사항")
-	lines.append("─" * 15)
-	lines.append("• 본 정보는 투자 참고용이며, 투자 결정은 본인의 판단과 책임하에 이루어져야 합니다.")
-	lines.append("• 과거 성과가 미래 수익을 보장하지 않습니다.")
-	lines.append("• 투자 전 충분한 검토와 리스크 관리가 필요합니다.")
-	lines.append("")
-	lines.append("=" * 25)
-	
-	return "\n".join([l for l in lines if l is not None])
+	return ReportRenderer(kr_recos, us_recos, news_summary).render(user_name)
+
+
+_HTML_STYLE = (
+	"body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;color:#333;background:#fff;"
+	"margin:0 auto;padding:20px;max-width:760px;line-height:1.6;word-wrap:break-word}"
+	"h1{font-size:1.3em}h2{font-size:1.1em;margin-top:1.6em}"
+	".card{background:#f8f9fa;border:1px solid #e9ecef;border-radius:8px;padding:12px 15px;margin:10px 0}"
+	".card h3{margin:0 0 6px;font-size:1em}.card p{margin:4px 0}.muted{color:#777;font-size:.9em}"
+	"@media (max-width:768px){body{padding:10px;font-size:16px}.card{padding:10px}}"
+)
+
+_RENDER_CACHE: "OrderedDict[str, str]" = OrderedDict()  # "<version>:<형식>" → 렌더링 결과
+_RENDER_CACHE_SIZE = 64
+_RENDER_LOCK = threading.Lock()  # 웹 서버 작업 스레드에서 동시에 렌더링
+
+
+def _json_safe(value: Any) -> Any:
+	if isinstance(value, float) and math.isnan(value):
+		return None
+	if isinstance(value, dict):
+		return {k: _json_safe(v) for k, v in value.items()}
+	if isinstance(value, list):
+		return [_json_safe(v) for v in value]
+	return value
+
+
+@dataclass
+class Report:
+	"""한 스냅샷의 구조화된 리포트
+
+	카카오톡 텍스트, 반응형 HTML, JSON 렌더러가 같은 모델을 공유하며,
+	각 형식은 스냅샷 버전(내용 해시)당 한 번만 렌더링되어 캐시된다.
+	"""
+	user_name: str
+	created_at: datetime
+	kr_items: List[Dict[str, Any]]
+	us_items: List[Dict[str, Any]]
+	news_summary: str
+	market: str = "all"
+	watchlist: List[str] = field(default_factory=list)
+	watch_items: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+	_version: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+	def to_dict(self) -> Dict[str, Any]:
+		return _json_safe({
+			"user_name": self.user_name,
+			"created_at": self.created_at.isoformat(),
+			"market": self.market,
+			"kr_items": self.kr_items if self.market in ("all", "kr") else [],
+			"us_items": self.us_items if self.market in ("all", "us") else [],
+			"watch_items": [self.watch_items[t] for t in self.watchlist if t in self.watch_items],
+			"news_summary": self.news_summary,
+		})
+
+	@property
+	def version(self) -> str:
+		if self._version is None:
+			payload = json.dumps(self.to_dict(), ensure_ascii=False, sort_keys=True)
+			self._version = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+		return self._version
+
+	def render(self, fmt: str) -> str:
+		key = f"{self.version}:{fmt}"
+		with _RENDER_LOCK:
+			cached = _RENDER_CACHE.get(key)
+			if cached is not None:
+				_RENDER_CACHE.move_to_end(key)
+				return cached
+		renderers = {"text": self._render_text, "html": self._render_html, "json": self._render_json}
+		if fmt not in renderers:
+			raise ValueError(f"지원하지 않는 형식: {fmt}")
+		out = renderers[fmt]()
+		with _RENDER_LOCK:
+			_RENDER_CACHE[key] = out
+			while len(_RENDER_CACHE) > _RENDER_CACHE_SIZE:
+				_RENDER_CACHE.popitem(last=False)
+		return out
+
+	def to_text(self) -> str:
+		return self.render("text")
+
+	def to_html(self) -> str:
+		return self.render("html")
+
+	def to_json(self) -> str:
+		return self.render("json")
+
+	def _render_text(self) -> str:
+		renderer = ReportRenderer(self.kr_items, self.us_items, self.news_summary,
+		                          watch_items=self.watch_items, now=self.created_at)
+		return renderer.render(self.user_name, self.market, self.watchlist)
+
+	def _render_json(self) -> str:
+		return json.dumps({"version": self.version, **self.to_dict()}, ensure_ascii=False, indent=2)
+
+	def _render_html(self) -> str:
+		esc = html.escape
+		data = self.to_dict()
+
+		def cards(items: List[Dict[str, Any]], label: str) -> str:
+			out = []
+			for idx, it in enumerate(items, start=1):
+				market = it.get("market", "kr")
+				prices = " · ".join(
+					f"{name} {format_price(it[key], market)}" for name, key in
+					(("현재가", "close"), ("52주 최저", "low_52w"), ("52주 최고", "high_52w"))
+					if it.get(key) is not None
+				)
+				out.append(
+					f"<div class=card><h3>{label or f'🔥 {idx}.'} {esc(str(it['name']))} ({esc(str(it['ticker']))})</h3>"
+					f"<p>📊 {esc(it['reason'])}</p><p>📈 {esc(it['entry'])}</p><p>📉 {esc(it['exit'])}</p>"
+					f"<p class=muted>💰 {prices}</p></div>"
+				)
+			return "".join(out) or "<p class=muted>추천 종목 없음</p>"
+
+		body = [
+			f"<h1>📈 {esc(self.user_name)}님을 위한 오늘의 주식 보고서</h1>",
+			f"<p class=muted>📅 보고 날짜: {self.created_at.strftime('%Y년 %m월 %d일 %H시 %M분')}</p>",
+		]
+		if self.market in ("all", "kr"):
+			body += ["<h2>🇰🇷 국내 주식 추천 (TOP 3)</h2>", cards(data["kr_items"], "")]
+		if self.market in ("all", "us"):
+			body += ["<h2>🇺🇸 해외 주식 추천 (TOP 3)</h2>", cards(data["us_items"], "")]
+		if data["watch_items"]:
+			body += ["<h2>⭐ 관심 종목</h2>", cards(data["watch_items"], "⭐")]
+		body += [
+			"<h2>📰 시장 뉴스 요약</h2>", f"<p>{esc(self.news_summary)}</p>",
+			"<h2>⚠️ 투자 주의사항</h2>",
+			"<p class=muted>본 정보는 투자 참고용이며, 투자 결정은 본인의 판단과 책임하에 이루어져야 합니다. "
+			"과거 성과가 미래 수익을 보장하지 않습니다.</p>",
+		]
+		return (
+			"<!doctype html><html lang=ko><head><meta charset=utf-8>"
+			"<meta name=viewport content=\"width=device-width, initial-scale=1\">"
+			f"<title>주식 분석 리포트</title><style>{_HTML_STYLE}</style></head><body>"
+			+ "".join(body) + "</body></html>"
+		)
+
+
+def publish_report(report: Report, directory: str, basename: str) -> Dict[str, str]:
+	"""발행 시점에 텍스트/HTML/JSON 을 한 번씩 렌더링하여 파일로 저장"""
+	os.makedirs(directory, exist_ok=True)
+	paths = {}
+	for fmt, ext in (("text", "txt"), ("html", "html"), ("json", "json")):
+		path = os.path.normpath(os.path.join(directory, f"{basename}.{ext}"))
+		with open(path, "w", encoding="utf-8") as f:
+			f.write(report.render(fmt))
+		paths[fmt] = path
+	return paths
+
+
+def _timeframe_note(meta: Dict[str, Any]) -> str:
+	"""주봉/월봉 추세 확인 문구 (상위 봉 지표가 없으면 빈 문자열)"""
+	close, w_sma10, m_sma6 = meta.get("close", 0), meta.get("w_sma10", float("nan")), meta.get("m_sma6", float("nan"))
+	notes = []
+	if w_sma10 == w_sma10:
+		notes.append("주봉 SMA10 " + ("위" if close > w_sma10 else "아래"))
+	if m_sma6 == m_sma6:
+		notes.append("월봉 SMA6 " + ("위" if close > m_sma6 else "아래"))
+	return f" ({', '.join(notes)})" if notes else ""
 
 
-def build_reco_item_kr(ticker: str, meta: Dict[str, Any]) -> Dict[str, Any]:
-	name = get_kr_ticker_name(ticker)
+def build_reco_item_kr(ticker: str, meta: Dict[str, Any], name: Optional[str] = None) -> Dict[str, Any]:
+	name = name or get_kr_ticker_name(ticker)
 	rsi = meta.get('rsi', 50)
 	macd = meta.get('macd', 0)
 	macd_signal = meta.get('macd_signal', 0)
@@ -111,11 +316,12 @@ def build_reco_item_kr(ticker: str, meta: Dict[str, Any]) -> Dict[str, Any]:
 	
 	reason = (
 		f"단기 추세 우위(SMA5>SMA20), RSI {rsi:.1f}, MACD 흐름 확인. "
-		f"거래량 {vol_ratio:.1f}배"
+		f"거래량 {vol_ratio:.1f}배{_timeframe_note(meta)}"
 	)
 	
 	return {
 		"ticker": ticker,
+		"market": "kr",
 		"name": name,
 		"reason": reason,
 		"entry": entry_condition,
@@ -126,8 +332,8 @@ def build_reco_item_kr(ticker: str, meta: Dict[str, Any]) -> Dict[str, Any]:
 	}
 
 
-def build_reco_item_us(ticker: str, meta: Dict[str, Any]) -> Dict[str, Any]:
-	name = get_us_ticker_name(ticker)
+def build_reco_item_us(ticker: str, meta: Dict[str, Any], name: Optional[str] = None) -> Dict[str, Any]:
+	name = name or get_us_ticker_name(ticker)
 	rsi = meta.get('rsi', 50)
 	macd = meta.get('macd', 0)
 	macd_signal = meta.get('macd_signal', 0)
@@ -162,11 +368,12 @@ def build_reco_item_us(ticker: str, meta: Dict[str, Any]) -> Dict[str, Any]:
 	
 	reason = (
 		f"상대적 강도(RSI {rsi:.1f})와 거래량 확대로 모멘텀 강화. "
-		f"MACD {macd:.2f}/{macd_signal:.2f}"
+		f"MACD {macd:.2f}/{macd_signal:.2f}{_timeframe_note(meta)}"
 	)
 	
 	return {
 		"ticker": ticker,
+		"market": "us",
 		"name": name,
 		"reason": reason,
 		"entry": entry_condition,
@@ -5,11 +5,21 @@ import pytz
 from apscheduler.schedulers.blocking import BlockingScheduler
 
 from main import run_once
+from market_calendar import KRX, NYSE
 
 KST = pytz.timezone("Asia/Seoul")
 
 
+def should_run(now: datetime) -> bool:
+	"""오늘 KRX 가 열리거나, 직전 미국 거래일(현지 날짜 기준)에 NYSE 가 열렸으면 실행"""
+	return KRX.is_session(KRX.local_date(now)) or NYSE.is_session(NYSE.local_date(now))
+
+
 def _job():
+	now = datetime.now(KST)
+	if not should_run(now):
+		print(f"📅 {now:%Y-%m-%d} 휴장일이라 리포트를 건너뜁니다")
+		return
 	run_once()
 
 
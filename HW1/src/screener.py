@@ -1,84 +1,224 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any, Tuple
+import os
+from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple, Mapping, Optional, Callable, Sequence
 import pandas as pd
 
 from indicators import add_sma, add_rsi, add_macd, add_bbands
+from timeframes import ACTIVE_TIMEFRAMES, TIMEFRAME_PARAMS, add_timeframe_indicators
 from data_fetchers import compute_52w_stats
+from indicator_cache import IndicatorCache, make_key
+from correlation import RollingCorrelation, greedy_decorrelated, return_matrix
+from ranker import rank_metas
+
+# enrich_indicators 에서 사용하는 지표 파라미터 (캐시 키에도 포함)
+INDICATOR_PARAMS: Dict[str, Any] = {
+	"sma": (5, 20, 60),
+	"rsi": 14,
+	"macd": (12, 26, 9),
+	"bbands": (20, 2.0),
+	"vol_avg": 20,
+	# 일봉에서 만든 주봉/월봉 지표 (SCREEN_TIMEFRAMES, 기본 W,M)
+	"timeframes": {tf: TIMEFRAME_PARAMS[tf] for tf in ACTIVE_TIMEFRAMES},
+}
+
+indicator_cache = IndicatorCache(disk_dir=os.getenv("INDICATOR_CACHE_DIR") or None)
 
 
 def enrich_indicators(df: pd.DataFrame) -> pd.DataFrame:
 	out = df.copy()
-	out = add_sma(out, 5)
-	out = add_sma(out, 20)
-	out = add_sma(out, 60)
-	out = add_rsi(out, 14)
-	out = add_macd(out)
-	out = add_bbands(out)
-	return out
+	for window in INDICATOR_PARAMS["sma"]:
+		out = add_sma(out, window)
+	out = add_rsi(out, INDICATOR_PARAMS["rsi"])
+	fast, slow, signal = INDICATOR_PARAMS["macd"]
+	out = add_macd(out, fast=fast, slow=slow, signal=signal)
+	window, num_std = INDICATOR_PARAMS["bbands"]
+	out = add_bbands(out, window=window, num_std=num_std)
+	return add_timeframe_indicators(out, INDICATOR_PARAMS["timeframes"])
+
 
+@dataclass(frozen=True)
+class ScoreParams:
+	"""score_row 의 가중치와 임계값 (param_sweep 으로 탐색)"""
+	w_trend_short: float = 1.0  # SMA 단기 > 중기
+	w_trend_long: float = 0.5  # SMA 중기 > 장기
+	rsi_low: float = 40.0
+	rsi_high: float = 65.0
+	w_rsi: float = 1.0  # RSI 가 [rsi_low, rsi_high] 구간
+	rsi_oversold: float = 30.0
+	w_oversold: float = 0.3  # 과매도 반등 기대
+	w_macd: float = 0.7  # MACD > 시그널
+	vol_ratio: float = 1.5
+	w_volume: float = 0.7  # 거래량이 평균의 vol_ratio 배 이상
+	w_weekly_trend: float = 0.5  # 종가 > 주봉 SMA10 > 주봉 SMA20
+	w_monthly_trend: float = 0.3  # 종가 > 월봉 SMA3 > 월봉 SMA6
 
-def score_row(row: pd.Series) -> float:
+
+SCORE_PARAMS = ScoreParams()
+
+
+def score_row(row: pd.Series, params: ScoreParams = SCORE_PARAMS) -> float:
+	p = params
 	score = 0.0
 	# Trend: short MA above long MA
 	if row.get("SMA_5") and row.get("SMA_20") and row.get("SMA_60"):
 		if row["SMA_5"] > row["SMA_20"]:
-			score += 1.0
+			score += p.w_trend_short
 		if row["SMA_20"] > row["SMA_60"]:
-			score += 0.5
+			score += p.w_trend_long
 	# RSI moderate (40-65) preferred for swing entries
 	rsi = row.get("RSI")
 	if pd.notna(rsi):
-		if 40 <= rsi <= 65:
-			score += 1.0
-		elif rsi < 30:
-			score += 0.3  # potential rebound
+		if p.rsi_low <= rsi <= p.rsi_high:
+			score += p.w_rsi
+		elif rsi < p.rsi_oversold:
+			score += p.w_oversold  # potential rebound
 	# MACD histogram positive or crossing up
 	macd = row.get("MACD")
 	signal = row.get("MACD_SIGNAL")
 	if pd.notna(macd) and pd.notna(signal):
 		if macd > signal:
-			score += 0.7
+			score += p.w_macd
 	# Volume spike vs 20d avg
 	vol = row.get("Volume")
 	vol_avg20 = row.get("VOL_AVG20")
 	if pd.notna(vol) and pd.notna(vol_avg20) and vol_avg20 > 0:
-		if vol / vol_avg20 >= 1.5:
-			score += 0.7
+		if vol / vol_avg20 >= p.vol_ratio:
+			score += p.w_volume
+	# Higher timeframe trend confirmation (columns exist only for enabled timeframes)
+	close = row.get("Close")
+	if pd.notna(close):
+		for fast, slow, weight in (("W_SMA_10", "W_SMA_20", p.w_weekly_trend), ("M_SMA_3", "M_SMA_6", p.w_monthly_trend)):
+			if pd.notna(row.get(fast)) and pd.notna(row.get(slow)) and close > row[fast] > row[slow]:
+				score += weight
 	return score
 
 
-def screen_tickers(ticker_to_df: Dict[str, pd.DataFrame], top_k: int = 3) -> List[Tuple[str, pd.DataFrame, Dict[str, Any]]]:
+def _screen_one(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+	df2 = df.copy()
+	vol_window = INDICATOR_PARAMS["vol_avg"]
+	df2["VOL_AVG20"] = df2["Volume"].rolling(window=vol_window, min_periods=vol_window).mean()
+	df2 = enrich_indicators(df2)
+	last = df2.iloc[-1]
+	score = score_row(last, SCORE_PARAMS)
+	low_52w, high_52w = compute_52w_stats(df2)
+	meta = {
+		"score": score,
+		"close": float(last["Close"]),
+		"rsi": float(last.get("RSI", float("nan"))),
+		"macd": float(last.get("MACD", float("nan"))),
+		"macd_signal": float(last.get("MACD_SIGNAL", float("nan"))),
+		"bb_lower": float(last.get("BB_LOWER", float("nan"))),
+		"bb_upper": float(last.get("BB_UPPER", float("nan"))),
+		"sma5": float(last.get("SMA_5", float("nan"))),
+		"sma20": float(last.get("SMA_20", float("nan"))),
+		"sma60": float(last.get("SMA_60", float("nan"))),
+		"vol": float(last.get("Volume", float("nan"))),
+		"vol_avg20": float(last.get("VOL_AVG20", float("nan"))),
+		"w_sma10": float(last.get("W_SMA_10", float("nan"))),
+		"w_rsi": float(last.get("W_RSI", float("nan"))),
+		"m_sma6": float(last.get("M_SMA_6", float("nan"))),
+		"low_52w": low_52w,
+		"high_52w": high_52w,
+	}
+	return df2, meta
+
+
+def _cache_key(ticker: str, df: pd.DataFrame) -> str:
+	# meta["score"] 도 캐시에 들어가므로 점수 가중치가 바뀌면 다른 키
+	return make_key(ticker, df, (INDICATOR_PARAMS, SCORE_PARAMS))
+
+
+def _rank_key(candidate: Tuple[str, pd.DataFrame, Dict[str, Any]]) -> Tuple[float, float]:
+	# sort by score, then volume spike
+	meta = candidate[2]
+	return meta["score"], meta["vol"] / (meta["vol_avg20"] or 1)
+
+
+def _decorrelate(candidates: List[Tuple[str, pd.DataFrame, Dict[str, Any]]], ticker_to_df: Mapping[str, pd.DataFrame],
+                 top_k: int, max_corr: Optional[float]) -> List[Tuple[str, pd.DataFrame, Dict[str, Any]]]:
+	if max_corr is None or len(candidates) <= top_k:
+		return candidates[:top_k]
+	order = [c[0] for c in candidates]
+	corr = RollingCorrelation.from_returns(order, return_matrix(ticker_to_df, order))
+	picked = set(greedy_decorrelated(order, corr, top_k, max_corr))
+	return [c for c in candidates if c[0] in picked]
+
+
+def screen_tickers(ticker_to_df: Mapping[str, pd.DataFrame], top_k: int = 3,
+                   max_corr: Optional[float] = None, ranker=None,
+                   use_cache: bool = True) -> List[Tuple[str, pd.DataFrame, Dict[str, Any]]]:
+	"""점수 상위 top_k 종목 선택
+
+	점수는 ranker(기본: models/ranker.npz 가 있으면 모델, 없으면 score_row 규칙)가
+	후보 전체를 한 번에 채점해 meta["score"] 에 넣는다.
+	max_corr 를 주면 이미 고른 종목과 수익률 상관이 max_corr 를 넘는 종목은 건너뛰어
+	같은 섹터의 비슷한 종목이 한꺼번에 뽑히지 않게 한다.
+	use_cache=False 면 지표 캐시에 결과를 남기지 않는다 (메모리 예산 모드).
+	"""
 	candidates: List[Tuple[str, pd.DataFrame, Dict[str, Any]]] = []
 	for ticker, df in ticker_to_df.items():
 		if df is None or df.empty:
 			continue
-		df2 = df.copy()
-		df2["VOL_AVG20"] = df2["Volume"].rolling(window=20, min_periods=20).mean()
-		df2 = enrich_indicators(df2)
-		last = df2.iloc[-1]
-		score = score_row(last)
-		low_52w, high_52w = compute_52w_stats(df2)
-		meta = {
-			"score": score,
-			"close": float(last["Close"]),
-			"rsi": float(last.get("RSI", float("nan"))),
-			"macd": float(last.get("MACD", float("nan"))),
-			"macd_signal": float(last.get("MACD_SIGNAL", float("nan"))),
-			"bb_lower": float(last.get("BB_LOWER", float("nan"))),
-			"bb_upper": float(last.get("BB_UPPER", float("nan"))),
-			"sma5": float(last.get("SMA_5", float("nan"))),
-			"sma20": float(last.get("SMA_20", float("nan"))),
-			"sma60": float(last.get("SMA_60", float("nan"))),
-			"vol": float(last.get("Volume", float("nan"))),
-			"vol_avg20": float(last.get("VOL_AVG20", float("nan"))),
-			"low_52w": low_52w,
-			"high_52w": high_52w,
-		}
-		candidates.append((ticker, df2, meta))
-	# sort by score, then volume spike
-	candidates.sort(key=lambda x: (x[2]["score"], x[2]["vol"] / (x[2]["vol_avg20"] or 1)), reverse=True)
-	return candidates[:top_k]
+		# 히스토리가 그대로면 지표/점수를 다시 계산하지 않음
+		key = _cache_key(ticker, df)
+		cached = indicator_cache.get(key)
+		if cached is None:
+			cached = _screen_one(df)
+			if use_cache:
+				indicator_cache.put(key, cached)
+		df2, meta = cached
+		candidates.append((ticker, df2, dict(meta)))
+	rank_metas([c[2] for c in candidates], ranker)
+	candidates.sort(key=_rank_key, reverse=True)
+	return _decorrelate(candidates, ticker_to_df, top_k, max_corr)
+
+
+def enriched_frames(ticker_to_df: Mapping[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+	"""종목별 지표 프레임 (screen_tickers 직후라면 지표 캐시에서 그대로 꺼냄)"""
+	out: Dict[str, pd.DataFrame] = {}
+	for ticker, df in ticker_to_df.items():
+		if df is None or df.empty:
+			continue
+		cached = indicator_cache.get(_cache_key(ticker, df))
+		out[ticker] = cached[0] if cached is not None else _screen_one(df)[0]
+	return out
+
+
+def screen_chunked(fetch: Callable[[str], pd.DataFrame], tickers: Sequence[str], chunk_size: int, top_k: int = 3,
+                   max_corr: Optional[float] = None, ranker=None,
+                   pool_size: Optional[int] = None,
+                   check: Optional[Callable[[str], None]] = None) -> List[Tuple[str, pd.DataFrame, Dict[str, Any]]]:
+	"""chunk_size 개씩 시세 조회 → 채점하고 상위 pool_size 개 후보만 남기는 스트리밍 스크리닝
+
+	한 번에 메모리에 있는 시세는 청크 하나와 후보 풀뿐이다. 상관 필터는 남은 후보 풀 안에서 적용한다.
+	check(위치) 는 청크마다 불러 메모리 예산 초과 시 예외로 중단하게 한다 (MemoryBudget.check).
+	"""
+	pool_size = pool_size or top_k * 5
+	kept: List[Tuple[str, pd.DataFrame, Dict[str, Any]]] = []
+	for lo in range(0, len(tickers), chunk_size):
+		chunk = {t: fetch(t) for t in tickers[lo:lo + chunk_size]}
+		if check is not None:
+			check(f"청크 {lo // chunk_size + 1} 조회")
+		kept = merge_candidates(kept + screen_tickers(chunk, top_k=pool_size, ranker=ranker, use_cache=False),
+		                        pool_size, ranker=ranker)
+		del chunk
+		if check is not None:
+			check(f"청크 {lo // chunk_size + 1} 채점")
+	return merge_candidates(kept, top_k, max_corr, ranker=ranker)
+
+
+def merge_candidates(candidates: List[Tuple[str, pd.DataFrame, Dict[str, Any]]], top_k: int = 3,
+                     max_corr: Optional[float] = None, ranker=None) -> List[Tuple[str, pd.DataFrame, Dict[str, Any]]]:
+	"""이미 채점된 여러 묶음의 후보를 합쳐 상위 top_k 선택 (df 에는 Close 열만 있어도 됨)
+
+	묶음마다 모델/규칙 대체 여부가 다를 수 있으므로 합친 풀 전체를 한 번 더 채점한다
+	(한 후보라도 모델이 실패하면 풀 전체가 규칙 점수).
+	"""
+	rank_metas([c[2] for c in candidates], ranker)
+	candidates = sorted(candidates, key=_rank_key, reverse=True)
+	return _decorrelate(candidates, {t: df for t, df, _ in candidates}, top_k, max_corr)
 
 
 def suggest_entry_exit(meta: Dict[str, Any]) -> Tuple[str, str]:
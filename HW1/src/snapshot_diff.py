@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from price_panel import DATA_DIR
+from report import format_price
+
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH") or os.path.join(DATA_DIR, "last_snapshot.json")
+MARKETS = ("kr", "us")
+# 스냅샷에 남기는 meta 값 (추천 아이템 문구는 이 값들로만 만들어짐)
+META_KEYS = ("score", "close", "rsi", "macd", "macd_signal", "vol", "vol_avg20", "low_52w", "high_52w",
+             "w_sma10", "m_sma6")
+# 이 이상 바뀌어야 "의미 있는 변경" (추천 종목 구성이 바뀌면 항상 의미 있음)
+PRICE_CHANGE = 0.01  # 종가 1%
+RSI_CHANGE = 5.0  # RSI 5pt
+SCORE_CHANGE = 0.5  # 점수 0.5
+
+
+def _round(value: Any) -> Any:
+	if isinstance(value, float):
+		return None if math.isnan(value) else round(value, 6)
+	return value
+
+
+def headlines_hash(headlines: Sequence[Any]) -> str:
+	payload = json.dumps(list(headlines or []), ensure_ascii=False, sort_keys=True, default=str)
+	return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def pick_meta(meta: Dict[str, Any]) -> Dict[str, Any]:
+	return {k: _round(float(meta[k])) for k in META_KEYS if meta.get(k) is not None}
+
+
+def build_snapshot(created_at: datetime, outputs: Dict[str, Any], items: Dict[str, List[Dict[str, Any]]],
+                   news_summary: str) -> Dict[str, Any]:
+	"""파이프라인 출력 → 비교/재사용용 스냅샷 (JSON 저장 가능)"""
+	snapshot: Dict[str, Any] = {
+		"created_at": created_at.isoformat(),
+		"headlines": headlines_hash(outputs.get("headlines") or []),
+		"news_summary": news_summary,
+	}
+	for market in MARKETS:
+		selected = outputs.get(f"{market}_selected") or []
+		snapshot[market] = [{"ticker": ticker, **pick_meta(meta)} for ticker, _, meta in selected][:3]
+		# 아이템은 재사용 시 그대로 렌더링되므로 값을 바꾸지 않음 (NaN 도 JSON 에 그대로 저장)
+		snapshot[f"{market}_items"] = [{k: float(v) if isinstance(v, float) else v for k, v in it.items()}
+		                               for it in items.get(market, [])]
+	return snapshot
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Dict[str, Any]]:
+	"""마지막으로 발행(전송)한 스냅샷"""
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			return json.load(f)
+	except (OSError, ValueError):
+		return None
+
+
+def save_snapshot(snapshot: Dict[str, Any], path: str = SNAPSHOT_PATH) -> None:
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	tmp = f"{path}.tmp{os.getpid()}"
+	with open(tmp, "w", encoding="utf-8") as f:
+		json.dump(snapshot, f, ensure_ascii=False)
+	os.replace(tmp, path)
+
+
+def reuse_item(previous: Optional[Dict[str, Any]], market: str, ticker: str,
+               meta: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+	"""이전 스냅샷의 (그대로 쓸 수 있는 아이템, 종목명)
+
+	meta 가 같으면 아이템을 그대로, 종목만 같으면 이름만 재사용해 종목명 조회를 건너뛴다.
+	"""
+	if not previous:
+		return None, None
+	items = {it.get("ticker"): it for it in previous.get(f"{market}_items") or []}
+	item = items.get(ticker)
+	if item is None:
+		return None, None
+	picks = {p["ticker"]: p for p in previous.get(market) or []}
+	old = picks.get(ticker)
+	if old is not None and {k: v for k, v in old.items() if k != "ticker"} == pick_meta(meta):
+		return item, item.get("name")
+	return None, item.get("name")
+
+
+@dataclass
+class Change:
+	market: str
+	ticker: str
+	name: str
+	field: str  # close / rsi / score
+	old: float
+	new: float
+
+
+@dataclass
+class SnapshotDiff:
+	"""직전 발행 스냅샷과 새 스냅샷의 차이"""
+	first: bool = False  # 비교할 이전 스냅샷이 없음
+	added: Dict[str, List[str]] = field(default_factory=dict)
+	removed: Dict[str, List[str]] = field(default_factory=dict)
+	reordered: List[str] = field(default_factory=list)
+	changes: List[Change] = field(default_factory=list)
+	news_changed: bool = False
+	names: Dict[str, str] = field(default_factory=dict)
+
+	@property
+	def material(self) -> bool:
+		"""발행/전송할 만한 변경인지 (뉴스만 바뀐 경우는 제외)"""
+		return self.first or any(self.added.values()) or any(self.removed.values()) or bool(self.changes)
+
+	def summary(self) -> str:
+		if self.first:
+			return "첫 리포트"
+		parts = [f"{m.upper()} 신규 {len(v)}" for m, v in self.added.items() if v]
+		parts += [f"{m.upper()} 제외 {len(v)}" for m, v in self.removed.items() if v]
+		if self.changes:
+			parts.append(f"수치 변경 {len(self.changes)}")
+		if self.reordered:
+			parts.append("순위 변경")
+		if self.news_changed:
+			parts.append("뉴스 갱신")
+		return ", ".join(parts) or "변경 없음"
+
+	def to_message(self, created_at: datetime) -> str:
+		"""카카오톡용 "무엇이 바뀌었나" 요약"""
+		lines = [f"🔔 추천 변경 알림 ({created_at:%m/%d %H:%M})"]
+		flags = {"kr": "🇰🇷", "us": "🇺🇸"}
+
+		def label(ticker: str) -> str:
+			return f"{self.names.get(ticker, ticker)}({ticker})"
+
+		for market in MARKETS:
+			if self.added.get(market):
+				lines.append(f"{flags[market]} 신규: " + ", ".join(map(label, self.added[market])))
+			if self.removed.get(market):
+				lines.append(f"{flags[market]} 제외: " + ", ".join(map(label, self.removed[market])))
+		for c in self.changes:
+			if c.field == "close":
+				pct = (c.new / c.old - 1) * 100 if c.old else 0.0
+				lines.append(f"📈 {label(c.ticker)} 종가 {format_price(c.old, c.market)} → {format_price(c.new, c.market)} ({pct:+.1f}%)")
+			elif c.field == "rsi":
+				lines.append(f"📊 {label(c.ticker)} RSI {c.old:.1f} → {c.new:.1f}")
+			else:
+				lines.append(f"⭐ {label(c.ticker)} 점수 {c.old:.1f} → {c.new:.1f}")
+		if self.reordered:
+			lines.append("🔀 순위 변경: " + ", ".join(map(label, self.reordered)))
+		if self.news_changed:
+			lines.append("📰 시장 뉴스 요약 갱신")
+		lines.append("전체 리포트는 아래 링크에서 확인하세요.")
+		return "\n".join(lines)
+
+
+def diff_snapshots(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> SnapshotDiff:
+	diff = SnapshotDiff(first=not previous)
+	for market in MARKETS:
+		for it in current.get(f"{market}_items") or []:
+			diff.names[it["ticker"]] = it.get("name") or it["ticker"]
+	if not previous:
+		return diff
+	for market in MARKETS:
+		for it in previous.get(f"{market}_items") or []:
+			diff.names.setdefault(it["ticker"], it.get("name") or it["ticker"])
+		old = {p["ticker"]: p for p in previous.get(market) or []}
+		new = {p["ticker"]: p for p in current.get(market) or []}
+		diff.added[market] = [t for t in new if t not in old]
+		diff.removed[market] = [t for t in old if t not in new]
+		common = [t for t in new if t in old]
+		if common != [t for t in old if t in new]:
+			diff.reordered.extend(common)
+		for t in common:
+			a, b = old[t], new[t]
+			checks = (("close", lambda x, y: abs(y / x - 1) >= PRICE_CHANGE if x else x != y),
+			          ("rsi", lambda x, y: abs(y - x) >= RSI_CHANGE),
+			          ("score", lambda x, y: abs(y - x) >= SCORE_CHANGE))
+			for key, moved in checks:
+				x, y = a.get(key), b.get(key)
+				if x is not None and y is not None and moved(x, y):
+					diff.changes.append(Change(market, t, diff.names.get(t, t), key, x, y))
+	diff.news_changed = previous.get("headlines") != current.get("headlines")
+	return diff
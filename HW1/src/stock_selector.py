@@ -1,43 +1,52 @@
 from __future__ import annotations
 
 import pandas as pd
-from typing import List, Dict, Any
-import FinanceDataReader as fdr
-import yfinance as yf
-import requests
+from typing import List, Dict, Any, Tuple
 from bs4 import BeautifulSoup
 
+import http_client
+import provider_health
+from data_fetchers import get_krx_listing, get_yf_info
+
+
+def get_sp500_listing() -> List[Tuple[str, str]]:
+    """Wikipedia S&P 500 구성 종목 (티커, 회사명) 목록 (실패 시 예외)"""
+    url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    # 구성 종목은 하루 단위로만 바뀌므로 최소 하루 캐시
+    response = provider_health.call("wikipedia", http_client.get, url, headers=headers,
+                                    min_ttl=24 * 3600, pass_timeout=True)
+    response.raise_for_status()
+    
+    # HTML 파싱
+    soup = BeautifulSoup(response.content, 'html.parser')
+    table = soup.find('table', {'id': 'constituents'})
+    
+    if not table:
+        raise ValueError("S&P 500 테이블을 찾을 수 없습니다")
+    
+    listing = []
+    rows = table.find_all('tr')[1:]  # 헤더 제외
+    
+    for row in rows:
+        cells = row.find_all('td')
+        if len(cells) > 0:
+            ticker = cells[0].text.strip()
+            # 특수 문자 제거 및 정리
+            ticker = ticker.replace('.', '-')  # BRK.B -> BRK-B
+            name = cells[1].text.strip() if len(cells) > 1 else ticker
+            listing.append((ticker, name))
+    
+    return listing
+
 
 def get_sp500_tickers() -> List[str]:
     """S&P 500 종목 리스트를 웹에서 동적으로 가져오기"""
     try:
         # 방법 1: Wikipedia에서 S&P 500 종목 리스트 가져오기
-        url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # HTML 파싱
-        soup = BeautifulSoup(response.content, 'html.parser')
-        table = soup.find('table', {'id': 'constituents'})
-        
-        if not table:
-            raise ValueError("S&P 500 테이블을 찾을 수 없습니다")
-        
-        tickers = []
-        rows = table.find_all('tr')[1:]  # 헤더 제외
-        
-        for row in rows:
-            cells = row.find_all('td')
-            if len(cells) > 0:
-                ticker = cells[0].text.strip()
-                # 특수 문자 제거 및 정리
-                ticker = ticker.replace('.', '-')  # BRK.B -> BRK-B
-                tickers.append(ticker)
-        
-        return tickers
+        return [ticker for ticker, _ in get_sp500_listing()]
         
     except Exception as e:
         print(f"Wikipedia S&P 500 수집 실패: {e}")
@@ -77,7 +86,7 @@ def get_popular_stocks_from_exchanges() -> List[str]:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = provider_health.call("yahoo_trending", http_client.get, url, headers=headers, pass_timeout=True)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -112,8 +121,7 @@ def get_popular_stocks_from_exchanges() -> List[str]:
         print("인기 종목들 유효성 검증 중...")
         for ticker in tickers[:50]:  # 상위 50개만 검증
             try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
+                info = get_yf_info(ticker)
                 
                 if (info and 
                     'regularMarketPrice' in info and 
@@ -151,8 +159,7 @@ def get_trending_stocks_from_yfinance() -> List[str]:
         print("ETF 기반 종목 수집 중...")
         for etf in etf_tickers:
             try:
-                stock = yf.Ticker(etf)
-                info = stock.info
+                info = get_yf_info(etf)
                 if (info and 
                     'regularMarketPrice' in info and 
                     info.get('regularMarketPrice', 0) > 0):
@@ -173,8 +180,7 @@ def get_trending_stocks_from_yfinance() -> List[str]:
         # 추가 종목들을 검증
         for ticker in additional_tickers:
             try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
+                info = get_yf_info(ticker)
                 
                 if (info and 
                     'regularMarketPrice' in info and 
@@ -239,7 +245,7 @@ def get_kr_top_stocks(limit: int = 20) -> List[str]:
     """한국 상위 종목들을 자동으로 수집 (다양한 규모 포함)"""
     try:
         # KRX 상장사 목록 가져오기
-        stock_list = fdr.StockListing('KRX')
+        stock_list = get_krx_listing()
         
         # 시가총액 상위 종목 필터링 (상장주식수 * 종가 기준)
         stock_list['market_cap'] = stock_list['Marcap']  # 시가총액
@@ -275,6 +281,51 @@ def get_kr_top_stocks(limit: int = 20) -> List[str]:
         return []
 
 
+def prefilter_kr_listing(stock_list: pd.DataFrame, funnel_size: int = 30,
+                         min_marcap: float = 1e11, min_amount: float = 1e9) -> pd.DataFrame:
+    """1단계 스크리닝: 상장 목록에 이미 있는 필드(시가총액, 거래량, 등락률, 거래대금)만으로
+    후보를 순위화하여 상위 funnel_size 개만 남김 (시세 히스토리 조회 없음)"""
+    # 필요한 열만 복사 (전체 상장 목록 복사본을 들고 있지 않도록)
+    change_col = 'ChagesRatio' if 'ChagesRatio' in stock_list.columns else 'ChangesRatio'
+    df = stock_list[[c for c in ('Code', 'Name', 'Marcap', 'Amount', 'Volume', change_col) if c in stock_list.columns]].copy()
+    for col in ('Marcap', 'Amount', 'Volume', change_col):
+        if col not in df.columns:
+            df[col] = 0.0
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)
+    
+    # 최소 규모/유동성 조건 + 보통주만 (우선주는 코드 끝자리가 0이 아님)
+    df = df[(df['Marcap'] >= min_marcap) & (df['Amount'] >= min_amount)]
+    df = df[df['Code'].astype(str).str.zfill(6).str.endswith('0')]
+    if df.empty:
+        return df
+    
+    # 회전율(거래대금/시가총액)이 높고, 과열되지 않은 상승 종목을 우대
+    turnover = df['Amount'] / df['Marcap']
+    change = df[change_col].clip(-10, 10)
+    overheat = (df[change_col] >= 20).astype(float)
+    df['prefilter_score'] = (
+        0.4 * turnover.rank(pct=True)
+        + 0.3 * df['Amount'].rank(pct=True)
+        + 0.2 * change.rank(pct=True)
+        + 0.1 * df['Marcap'].rank(pct=True)
+        - 0.5 * overheat
+    )
+    return df.sort_values('prefilter_score', ascending=False).head(funnel_size)
+
+
+def select_kr_candidates(funnel_size: int = 30) -> List[str]:
+    """시장 전체를 1단계 필터로 압축한 한국 후보 종목 (2단계 시세/지표 계산 대상)"""
+    try:
+        stock_list = get_krx_listing()
+        survivors = prefilter_kr_listing(stock_list, funnel_size=funnel_size)
+        print(f"🔎 KRX {len(stock_list)}개 중 1단계 통과 {len(survivors)}개")
+        return [str(code).zfill(6) for code in survivors['Code'].tolist()]
+    except Exception as e:
+        print(f"한국 종목 1단계 필터 실패: {e}")
+        # 실패 시 기존 시가총액 기반 선별로 대체
+        return get_kr_top_stocks(funnel_size)
+
+
 def get_us_top_stocks(limit: int = 20) -> List[str]:
     """미국 상위 종목들을 자동으로 수집 (다양한 규모 포함)"""
     try:
@@ -287,8 +338,7 @@ def get_us_top_stocks(limit: int = 20) -> List[str]:
         
         for ticker in sp500_tickers:
             try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
+                info = get_yf_info(ticker)
                 if info and 'regularMarketPrice' in info and 'marketCap' in info:
                     market_cap = info.get('marketCap', 0)
                     if market_cap > 0:
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import heapq
+import json
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import math
+import pandas as pd
+
+from screener import score_row, INDICATOR_PARAMS
+from timeframes import TimeframeState
+from alert_rules import RuleEngine, format_alert, load_rules
+
+try:
+	import websocket  # type: ignore  # websocket-client (선택)
+except Exception:  # pragma: no cover
+	websocket = None  # type: ignore
+
+LATENCY_WINDOW = 10_000  # 지연 통계에 쓰는 최근 봉 수
+
+
+@dataclass
+class Bar:
+	ticker: str
+	ts: float  # epoch seconds
+	open: float
+	high: float
+	low: float
+	close: float
+	volume: float
+	received: float = 0.0  # 수신 시각 (지연 측정용)
+
+
+# ---------------------------------------------------------------------------
+# 피드
+# ---------------------------------------------------------------------------
+
+class ReplayFeed:
+	"""저장된 OHLCV 프레임을 시간순으로 섞어 재생하는 피드 (웹소켓 대체용)"""
+
+	def __init__(self, ticker_to_df: Mapping[str, pd.DataFrame], speed: Optional[float] = None) -> None:
+		self.ticker_to_df = ticker_to_df
+		self.speed = speed  # None 이면 최대 속도, 1.0 이면 실제 시간 간격
+
+	def __iter__(self) -> Iterator[Bar]:
+		rows: List[Tuple[float, str, tuple]] = []
+		for ticker, df in self.ticker_to_df.items():
+			ts = pd.DatetimeIndex(df.index).asi8 / 1e9
+			values = df[["Open", "High", "Low", "Close", "Volume"]].to_numpy(dtype=float)
+			rows.extend(zip(ts.tolist(), [ticker] * len(df), map(tuple, values)))
+		rows.sort(key=lambda r: r[0])
+		prev = None
+		for ts, ticker, (o, h, l, c, v) in rows:
+			if self.speed and prev is not None and ts > prev:
+				time.sleep((ts - prev) / self.speed)
+			prev = ts
+			yield Bar(ticker, ts, o, h, l, c, v, received=time.perf_counter())
+
+
+class WebSocketFeed:
+	"""JSON 분봉/체결 메시지를 받는 웹소켓 피드
+
+	메시지 형식: {"ticker": "005930", "ts": 1700000000, "o":..., "h":..., "l":..., "c":..., "v":...}
+	"""
+
+	def __init__(self, url: str) -> None:
+		if websocket is None:
+			raise RuntimeError("websocket-client 패키지가 필요합니다")
+		self.url = url
+
+	def __iter__(self) -> Iterator[Bar]:
+		ws = websocket.create_connection(self.url)
+		try:
+			while True:
+				msg = json.loads(ws.recv())
+				c = float(msg["c"])
+				yield Bar(
+					str(msg["ticker"]), float(msg.get("ts", time.time())),
+					float(msg.get("o", c)), float(msg.get("h", c)), float(msg.get("l", c)), c,
+					float(msg.get("v", 0.0)), received=time.perf_counter(),
+				)
+		finally:
+			ws.close()
+
+
+# ---------------------------------------------------------------------------
+# 증분 지표
+# ---------------------------------------------------------------------------
+
+class _Rolling:
+	"""고정 길이 이동 합/제곱합 (O(1) 갱신)"""
+	__slots__ = ("n", "buf", "i", "count", "sum", "sumsq")
+
+	def __init__(self, n: int) -> None:
+		self.n = n
+		self.buf = [0.0] * n
+		self.i = 0
+		self.count = 0
+		self.sum = 0.0
+		self.sumsq = 0.0
+
+	def push(self, x: float) -> None:
+		old = self.buf[self.i]
+		if self.count == self.n:
+			self.sum -= old
+			self.sumsq -= old * old
+		else:
+			self.count += 1
+		self.buf[self.i] = x
+		self.sum += x
+		self.sumsq += x * x
+		self.i = (self.i + 1) % self.n
+
+	def mean(self) -> float:
+		return self.sum / self.n if self.count == self.n else math.nan
+
+	def std(self) -> float:
+		if self.count < self.n or self.n < 2:
+			return math.nan
+		var = (self.sumsq - self.sum * self.sum / self.n) / (self.n - 1)
+		return math.sqrt(var) if var > 0 else 0.0
+
+
+class IncrementalIndicators:
+	"""indicators.py / enrich_indicators 와 같은 정의의 지표를 봉 단위로 갱신"""
+	__slots__ = ("smas", "rsi_gain", "rsi_loss", "ema_fast", "ema_slow", "ema_signal",
+	             "a_fast", "a_slow", "a_signal", "bb", "bb_std", "vol", "prev_close", "timeframes", "row")
+
+	def __init__(self) -> None:
+		p = INDICATOR_PARAMS
+		self.smas = {w: _Rolling(w) for w in p["sma"]}
+		self.rsi_gain = _Rolling(p["rsi"])
+		self.rsi_loss = _Rolling(p["rsi"])
+		fast, slow, signal = p["macd"]
+		self.a_fast, self.a_slow, self.a_signal = 2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1)
+		self.ema_fast = self.ema_slow = self.ema_signal = None
+		self.bb = _Rolling(p["bbands"][0])
+		self.bb_std = p["bbands"][1]
+		self.vol = _Rolling(p["vol_avg"])
+		self.prev_close: Optional[float] = None
+		# 주봉/월봉은 진행 중인 기간만 갱신
+		self.timeframes = [TimeframeState(tf, params) for tf, params in p["timeframes"].items()]
+		self.row: Dict[str, float] = {}
+
+	def seed(self, df: pd.DataFrame) -> None:
+		"""과거 일봉으로 상태 초기화"""
+		ts = (pd.DatetimeIndex(df.index).asi8 // 10**9).tolist()
+		for t, c, v in zip(ts, df["Close"].tolist(), df["Volume"].tolist()):
+			self.update(float(c), float(v), t)
+
+	def update(self, close: float, volume: float, ts: Optional[float] = None) -> Dict[str, float]:
+		for w, r in self.smas.items():
+			r.push(close)
+		if self.prev_close is not None:
+			delta = close - self.prev_close
+			self.rsi_gain.push(delta if delta > 0 else 0.0)
+			self.rsi_loss.push(-delta if delta < 0 else 0.0)
+		self.prev_close = close
+		if self.ema_fast is None:
+			self.ema_fast = self.ema_slow = close
+		else:
+			self.ema_fast += self.a_fast * (close - self.ema_fast)
+			self.ema_slow += self.a_slow * (close - self.ema_slow)
+		macd = self.ema_fast - self.ema_slow
+		self.ema_signal = macd if self.ema_signal is None else self.ema_signal + self.a_signal * (macd - self.ema_signal)
+		self.bb.push(close)
+		self.vol.push(volume)
+
+		avg_gain, avg_loss = self.rsi_gain.mean(), self.rsi_loss.mean()
+		rsi = math.nan if math.isnan(avg_gain) else 100 - 100 / (1 + avg_gain / (avg_loss or 1e-9))
+		mid, std = self.bb.mean(), self.bb.std()
+		row = {f"SMA_{w}": r.mean() for w, r in self.smas.items()}
+		row.update({
+			"Close": close,
+			"Volume": volume,
+			"VOL_AVG20": self.vol.mean(),
+			"RSI": rsi,
+			"MACD": macd,
+			"MACD_SIGNAL": self.ema_signal,
+			"MACD_HIST": macd - self.ema_signal,
+			"BB_MID": mid,
+			"BB_UPPER": mid + self.bb_std * std,
+			"BB_LOWER": mid - self.bb_std * std,
+		})
+		if ts is not None:
+			for state in self.timeframes:
+				row.update(state.update(ts, close))
+		self.row = row
+		return row
+
+
+# ---------------------------------------------------------------------------
+# 알림
+# ---------------------------------------------------------------------------
+
+class AlertDispatcher:
+	"""알림 전송 전용 스레드 (수집 루프를 네트워크 I/O 로 막지 않음)"""
+
+	def __init__(self, send: Callable[[str], None], cooldown: float = 1800.0, max_pending: int = 100) -> None:
+		self.send = send
+		self.cooldown = cooldown
+		self._last_sent: Dict[str, float] = {}
+		self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue(maxsize=max_pending)
+		self._thread = threading.Thread(target=self._run, daemon=True)
+		self._thread.start()
+
+	def push(self, ticker: str, text: str, cooldown: Optional[float] = None) -> bool:
+		now = time.monotonic()
+		cooldown = self.cooldown if cooldown is None else cooldown
+		if now - self._last_sent.get(ticker, -math.inf) < cooldown:
+			return False
+		try:
+			self._queue.put_nowait((ticker, text))
+		except queue.Full:
+			print(f"⚠️ 알림 대기열이 가득 차 건너뜀: {ticker}")
+			return False
+		self._last_sent[ticker] = now
+		return True
+
+	def _run(self) -> None:
+		while True:
+			item = self._queue.get()
+			if item is None:
+				break
+			try:
+				self.send(item[1])
+			except Exception as e:
+				print(f"❌ 알림 전송 실패 ({item[0]}): {e}")
+
+	def close(self) -> None:
+		self._queue.put(None)
+		self._thread.join(timeout=10)
+
+
+def kakao_sender() -> Callable[[str], None]:
+	from config import AppConfig
+	from kakao import KakaoClient
+	client = KakaoClient(AppConfig.load())
+	return lambda text: client.send_self_memo(text)
+
+
+# ---------------------------------------------------------------------------
+# 스트리밍 엔진
+# ---------------------------------------------------------------------------
+
+def _rank_key(row: Mapping[str, float], score: float) -> Tuple[float, float]:
+	vol_avg = row.get("VOL_AVG20")
+	vol_avg = vol_avg if vol_avg and not math.isnan(vol_avg) else 1.0
+	return (score, row.get("Volume", 0.0) / vol_avg)
+
+
+class StreamEngine:
+	"""실시간 봉을 받아 변경된 종목만 재채점하고, TOP-k 신규 진입 시 알림"""
+
+	def __init__(self, top_k: int = 3, dispatcher: Optional[AlertDispatcher] = None,
+	             rules: Optional[RuleEngine] = None) -> None:
+		self.top_k = top_k
+		self.dispatcher = dispatcher
+		self.rules = rules  # 구독자별 알림 규칙 (해당 종목 규칙만 평가)
+		self.states: Dict[str, IncrementalIndicators] = {}
+		self.keys: Dict[str, Tuple[float, float]] = {}
+		self.top: List[str] = []
+		self._kth: Tuple[float, float] = (-math.inf, -math.inf)
+		self.updates = 0
+		# p50/p99 용 최근 지연만 보관 (장시간 실행 시 메모리가 계속 늘지 않도록)
+		self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+	def seed(self, ticker_to_df: Mapping[str, pd.DataFrame]) -> None:
+		for ticker, df in ticker_to_df.items():
+			state = self.states.setdefault(ticker, IncrementalIndicators())
+			state.seed(df)
+			if state.row:
+				self.keys[ticker] = _rank_key(state.row, score_row(state.row))
+		self._recompute_top()
+
+	def _recompute_top(self) -> List[str]:
+		top = heapq.nlargest(self.top_k, self.keys.items(), key=lambda kv: kv[1])
+		self.top = [t for t, _ in top]
+		self._kth = top[-1][1] if len(top) == self.top_k else (-math.inf, -math.inf)
+		return self.top
+
+	def on_bar(self, bar: Bar) -> List[str]:
+		"""봉 하나 반영, 새로 TOP-k 에 진입한 종목 목록 반환"""
+		state = self.states.get(bar.ticker)
+		if state is None:
+			state = self.states[bar.ticker] = IncrementalIndicators()
+		row = state.update(bar.close, bar.volume, bar.ts)
+		key = _rank_key(row, score_row(row))
+		self.keys[bar.ticker] = key
+		self.updates += 1
+
+		entered: List[str] = []
+		# 현재 TOP-k 구성원이거나 k번째 점수를 넘을 때만 순위를 다시 계산
+		if bar.ticker in self.top or key > self._kth:
+			before = set(self.top)
+			entered = [t for t in self._recompute_top() if t not in before]
+		for ticker in entered:
+			if self.dispatcher:
+				r = self.states[ticker].row
+				self.dispatcher.push(ticker, (
+					f"🚨 TOP {self.top_k} 신규 진입: {ticker}\n"
+					f"점수 {self.keys[ticker][0]:.1f} · 종가 {r['Close']:,.2f} · RSI {r['RSI']:.1f}"
+				))
+		if self.rules is not None and self.dispatcher:
+			for alert in self.rules.update(bar.ticker, row, now=bar.ts):
+				# 규칙별 쿨다운은 RuleEngine 이 관리
+				self.dispatcher.push(f"rule:{alert.rule.rule_id}", f"[{alert.rule.user}] {format_alert(alert)}", cooldown=0)
+		if bar.received:
+			self.latencies.append(time.perf_counter() - bar.received)
+		return entered
+
+	def run(self, feed: Iterable[Bar], max_updates: Optional[int] = None) -> Dict[str, float]:
+		started = time.perf_counter()
+		for bar in feed:
+			self.on_bar(bar)
+			if max_updates and self.updates >= max_updates:
+				break
+		elapsed = time.perf_counter() - started
+		lat = sorted(self.latencies) or [0.0]
+		return {
+			"updates": self.updates,
+			"seconds": elapsed,
+			"updates_per_sec": self.updates / elapsed if elapsed else 0.0,
+			"p50_latency_ms": lat[len(lat) // 2] * 1000,
+			"p99_latency_ms": lat[int(len(lat) * 0.99) - 1 if len(lat) > 1 else 0] * 1000,
+		}
+
+
+if __name__ == "__main__":
+	import argparse
+	import numpy as np
+
+	parser = argparse.ArgumentParser(description="실시간 봉 스트리밍 (재생 피드 벤치마크)")
+	parser.add_argument("--tickers", type=int, default=500)
+	parser.add_argument("--bars", type=int, default=200)
+	parser.add_argument("--kakao", action="store_true", help="TOP-k 진입 시 카카오톡 알림 전송")
+	parser.add_argument("--rules", help="구독자 알림 규칙 JSON 파일 (alert_rules.load_rules 형식)")
+	args = parser.parse_args()
+
+	rng = np.random.default_rng(0)
+	idx = pd.date_range("2025-01-02 09:00", periods=args.bars, freq="min")
+	frames = {}
+	for i in range(args.tickers):
+		close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, args.bars)))
+		frames[f"T{i:04d}"] = pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close,
+		                                    "Volume": rng.integers(1_000, 10_000, args.bars).astype(float)}, index=idx)
+	sender = kakao_sender() if args.kakao else (lambda text: None)
+	dispatcher = AlertDispatcher(sender, cooldown=0 if not args.kakao else 1800)
+	engine = StreamEngine(top_k=3, dispatcher=dispatcher, rules=load_rules(args.rules) if args.rules else None)
+	stats = engine.run(ReplayFeed(frames))
+	dispatcher.close()
+	print(f"📡 {stats['updates']:,}건 / {stats['seconds']:.2f}s → {stats['updates_per_sec']:,.0f} updates/s")
+	print(f"⏱️ 봉→알림 판단 지연 p50 {stats['p50_latency_ms']:.3f}ms, p99 {stats['p99_latency_ms']:.3f}ms")
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from price_panel import DATA_DIR
+
+LISTINGS_PATH = os.path.join(DATA_DIR, "ticker_listings.json")
+LISTINGS_MAX_AGE = 24 * 3600  # 상장 목록 스냅샷 갱신 주기 (초)
+LISTINGS_RETRY = 600  # 일부 시장 목록을 받지 못했을 때 다시 시도하는 간격 (초)
+MARKETS = ("kr", "us")
+SCAN_THRESHOLD = 256  # 후보가 이보다 많으면 정렬 대신 규모 순 스캔
+
+# 한글 음절 → 자모 (호환 자모) 분해 표
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ", "ㅜㅔ",
+         "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+_JONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ", "ㄹㅍ", "ㄹㅎ",
+         "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 입력 중인 겹모음/겹받침 자모도 낱자로 풀어 비교
+_COMPAT = {"ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+           "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ",
+           "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ"}
+
+
+def _normalize(text: str) -> str:
+	return "".join(text.lower().split())
+
+
+def to_jamo(text: str) -> str:
+	"""'삼성전자' → 'ㅅㅏㅁㅅㅓㅇㅈㅓㄴㅈㅏ' (영문/숫자는 소문자 그대로)"""
+	out = []
+	for ch in _normalize(text):
+		code = ord(ch) - 0xAC00
+		if 0 <= code < 11172:
+			out.append(_CHO[code // 588] + _JUNG[code % 588 // 28] + _JONG[code % 28])
+		else:
+			out.append(_COMPAT.get(ch, ch))
+	return "".join(out)
+
+
+def to_choseong(text: str) -> str:
+	"""'삼성전자' → 'ㅅㅅㅈㅈ' (한글 외 문자는 그대로)"""
+	out = []
+	for ch in _normalize(text):
+		code = ord(ch) - 0xAC00
+		out.append(_CHO[code // 588] if 0 <= code < 11172 else ch)
+	return "".join(out)
+
+
+def _is_choseong_query(text: str) -> bool:
+	return bool(text) and all(ch in _CHO for ch in text)
+
+
+def _grams(key: str) -> Set[str]:
+	"""검색어 bigram (한 글자면 그 글자)"""
+	return {key[i:i + 2] for i in range(len(key) - 1)} if len(key) > 1 else {key}
+
+
+def _index_grams(key: str) -> Set[str]:
+	return set(key) | _grams(key)
+
+
+class TickerIndex:
+	"""KRX/미국 종목 검색 인덱스 (자모 bigram 역색인)
+
+	이름을 자모로 풀어 저장하므로 '삼성ㅈ' 처럼 입력 중인 음절도 접두어로 맞고,
+	초성만 입력하면('ㅅㅅㅈㅈ') 초성 문자열에서 찾는다. 후보는 bigram 교집합으로 좁힌 뒤
+	부분 문자열을 확인하고, 정확히 일치 > 접두어 > 포함 순서, 같은 등급은 규모 순으로 정렬한다.
+	"""
+
+	def __init__(self, entries: Sequence[Dict[str, str]]) -> None:
+		self.entries = list(entries)
+		self.by_code: Dict[Tuple[str, str], int] = {}
+		self._keys: List[Tuple[str, str]] = []  # (코드, 이름 자모)
+		self._cho: List[str] = []
+		self._grams: Dict[str, Set[int]] = {}
+		self._cho_grams: Dict[str, Set[int]] = {}
+		self._exact: Dict[str, List[int]] = {}
+		self._cho_exact: Dict[str, List[int]] = {}
+		for i, e in enumerate(self.entries):
+			self.by_code[(e["market"], e["code"].upper())] = i
+			code, name = e["code"].lower(), to_jamo(e["name"])
+			cho = to_choseong(e["name"])
+			self._keys.append((code, name))
+			self._cho.append(cho)
+			for g in _index_grams(code) | _index_grams(name):
+				self._grams.setdefault(g, set()).add(i)
+			for g in _index_grams(cho):
+				self._cho_grams.setdefault(g, set()).add(i)
+			for k in {code, name}:
+				self._exact.setdefault(k, []).append(i)
+			self._cho_exact.setdefault(cho, []).append(i)
+		# 같은 일치 등급 안에서의 순서: 규모 순위, 짧은 이름
+		self._order = sorted(range(len(self.entries)), key=lambda i: (self.entries[i]["rank"], len(self.entries[i]["name"])))
+		self._pos = {i: p for p, i in enumerate(self._order)}
+
+	def __len__(self) -> int:
+		return len(self.entries)
+
+	def name(self, code: str, market: str) -> Optional[str]:
+		i = self.by_code.get((market, code.upper()))
+		return self.entries[i]["name"] if i is not None else None
+
+	def search(self, query: str, limit: int = 10, market: Optional[str] = None) -> List[Dict[str, str]]:
+		q = _normalize(query)
+		if not q:
+			return []
+		choseong = _is_choseong_query(q)
+		key = q if choseong else to_jamo(q)
+		postings = self._cho_grams if choseong else self._grams
+		sets = sorted((postings.get(g, set()) for g in _grams(key)), key=len)
+		if not sets or not sets[0]:
+			return []
+		ids = set(sets[0])
+		for s in sets[1:]:
+			ids &= s
+			if not ids:
+				return []
+
+		def grade(i: int) -> int:
+			best = 9
+			for field in ((self._cho[i],) if choseong else self._keys[i]):
+				if field == key:
+					return 0
+				if field.startswith(key):
+					best = 1
+				elif best > 2 and key in field:
+					best = 2
+			return best
+
+		if len(ids) <= SCAN_THRESHOLD:
+			ranked = sorted((grade(i), self._pos[i], i) for i in ids
+			                if not market or self.entries[i]["market"] == market)
+			hits = [(g, i) for g, _, i in ranked if g < 9][:limit]
+		else:
+			# 후보가 많으면(한두 글자 검색어) 규모 순으로 훑다가 접두어 일치가 limit 개 모이면 중단
+			exact = (self._cho_exact if choseong else self._exact).get(key, [])
+			buckets: Tuple[List[int], ...] = ([i for i in exact if not market or self.entries[i]["market"] == market], [], [])
+			for i in self._order:
+				if i in ids and (not market or self.entries[i]["market"] == market):
+					g = grade(i)
+					if 0 < g < 9:
+						buckets[g].append(i)
+						if g == 1 and len(buckets[1]) >= limit:
+							break
+			hits = [(g, i) for g in range(3) for i in buckets[g]][:limit]
+		return [{**self.entries[i], "match": ("exact", "prefix", "contains")[g]} for g, i in hits]
+
+
+def fetch_listings() -> List[Dict[str, str]]:
+	"""KRX 상장 목록 + S&P 500 구성 종목 (규모 순위 포함)"""
+	from data_fetchers import get_krx_listing
+	from stock_selector import get_sp500_listing
+
+	entries: List[Dict[str, str]] = []
+	try:
+		listing = get_krx_listing()
+		if "Marcap" in listing.columns:
+			listing = listing.sort_values("Marcap", ascending=False)
+		for rank, (code, name) in enumerate(zip(listing["Code"], listing["Name"])):
+			entries.append({"code": str(code).zfill(6), "name": str(name), "market": "kr", "rank": rank})
+	except Exception as e:
+		print(f"⚠️ KRX 상장 목록 조회 실패: {e}")
+	try:
+		for rank, (symbol, name) in enumerate(get_sp500_listing()):
+			entries.append({"code": symbol, "name": name, "market": "us", "rank": rank})
+	except Exception as e:
+		print(f"⚠️ S&P 500 목록 조회 실패: {e}")
+	return entries
+
+
+def _is_fresh(path: str, max_age: float) -> bool:
+	try:
+		return time.time() - os.path.getmtime(path) < max_age
+	except OSError:
+		return False
+
+
+def load_listings(path: str = LISTINGS_PATH, max_age: float = LISTINGS_MAX_AGE) -> List[Dict[str, str]]:
+	"""하루 한 번만 상장 목록을 내려받아 스냅샷으로 저장 (받기 실패 시 오래된 스냅샷 사용)
+
+	한 시장이라도 받지 못하면 스냅샷을 갱신하지 않고, 빠진 시장은 이전 스냅샷의 종목으로 채운다.
+	"""
+	cached: List[Dict[str, str]] = []
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			cached = json.load(f)
+		if _is_fresh(path, max_age):
+			return cached
+	except (OSError, ValueError):
+		pass
+	entries = fetch_listings()
+	missing = [m for m in MARKETS if not any(e["market"] == m for e in entries)]
+	if missing:
+		print(f"⚠️ 상장 목록 일부({', '.join(missing)})를 받지 못해 스냅샷을 갱신하지 않습니다")
+		return entries + [e for e in cached if e.get("market") in missing]
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	tmp = f"{path}.tmp{os.getpid()}"
+	with open(tmp, "w", encoding="utf-8") as f:
+		json.dump(entries, f, ensure_ascii=False)
+	os.replace(tmp, path)
+	return entries
+
+
+_index: Optional[TickerIndex] = None
+_index_at = 0.0
+_index_ttl = float(LISTINGS_MAX_AGE)
+_index_lock = threading.Lock()
+
+
+def get_index() -> TickerIndex:
+	"""프로세스당 한 번 만들고 스냅샷 갱신 주기마다 다시 만든다
+
+	스냅샷을 갱신하지 못했으면(일부 시장 조회 실패) LISTINGS_RETRY 뒤에 다시 시도한다.
+	"""
+	global _index, _index_at, _index_ttl
+	with _index_lock:
+		if _index is None or time.time() - _index_at > _index_ttl:
+			_index = TickerIndex(load_listings())
+			_index_at = time.time()
+			_index_ttl = LISTINGS_MAX_AGE if _is_fresh(LISTINGS_PATH, LISTINGS_MAX_AGE) else LISTINGS_RETRY
+		return _index
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="종목 검색 (한글/초성/영문/코드)")
+	parser.add_argument("query", nargs="*", default=["삼성전자", "ㅅㅅㅈㅈ", "삼성ㅈ", "apple", "0059", "nvd"])
+	parser.add_argument("--refresh", action="store_true", help="상장 목록 스냅샷 새로 받기")
+	args = parser.parse_args()
+
+	started = time.perf_counter()
+	index = TickerIndex(load_listings(max_age=0 if args.refresh else LISTINGS_MAX_AGE))
+	print(f"🔎 종목 {len(index):,}개 인덱스: {(time.perf_counter() - started) * 1000:.0f}ms")
+	for q in args.query:
+		started = time.perf_counter()
+		for _ in range(1000):
+			hits = index.search(q, limit=5)
+		elapsed = (time.perf_counter() - started) / 1000 * 1e6
+		print(f"  {q!r} ({elapsed:.0f}µs): " + ", ".join(f"{h['name']}({h['code']}, {h['market']})" for h in hits))
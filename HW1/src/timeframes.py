@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import math
+import os
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 일봉에서 만드는 상위 봉: 주봉(토~금), 월봉(달력 월)
+TIMEFRAMES = ("W", "M")
+
+# 상위 봉 지표 파라미터 — 열 이름은 "<봉>_SMA_<n>", "<봉>_RSI", "<봉>_MACD", "<봉>_MACD_SIGNAL"
+TIMEFRAME_PARAMS: Dict[str, Dict[str, Any]] = {
+	"W": {"sma": (10, 20), "rsi": 14, "macd": (12, 26, 9)},
+	"M": {"sma": (3, 6), "rsi": 6},
+}
+
+# 스크리닝에 사용할 상위 봉 (빈 문자열이면 일봉만)
+ACTIVE_TIMEFRAMES: Tuple[str, ...] = tuple(
+	tf for tf in (s.strip().upper() for s in os.getenv("SCREEN_TIMEFRAMES", "W,M").split(",")) if tf in TIMEFRAMES
+)
+
+_DAY_NS = 86400 * 10**9
+_OHLCV = {"Open": "first", "High": np.maximum, "Low": np.minimum, "Close": "last", "Volume": np.add}
+
+
+def period_codes(index: pd.Index, tf: str) -> np.ndarray:
+	"""일봉 시각 → 기간 번호 (주봉: 1970-01-03(토) 기준 주, 월봉: 1970-01 기준 월)"""
+	ns = pd.DatetimeIndex(index).asi8
+	if tf == "W":
+		return (ns // _DAY_NS - 2) // 7
+	return ns.astype("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+
+
+def period_bounds(ts: float, tf: str) -> Tuple[int, float, float]:
+	"""epoch 초 하나 → (period_codes 와 같은 기간 번호, 기간 시작, 다음 기간 시작) — 스트리밍용"""
+	if tf == "W":
+		code = (int(ts // 86400) - 2) // 7
+		start = (code * 7 + 2) * 86400.0
+		return code, start, start + 7 * 86400.0
+	d = datetime.fromtimestamp(ts, tz=timezone.utc)
+	start = datetime(d.year, d.month, 1, tzinfo=timezone.utc)
+	end = datetime(d.year + d.month // 12, d.month % 12 + 1, 1, tzinfo=timezone.utc)
+	return (d.year - 1970) * 12 + d.month - 1, start.timestamp(), end.timestamp()
+
+
+def _aggregate(daily: pd.DataFrame, tf: str) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+	"""기간별 OHLCV 배열과 각 기간 마지막 일봉의 위치"""
+	codes = period_codes(daily.index, tf)
+	if not len(codes):
+		return {c: np.zeros(0) for c in _OHLCV if c in daily.columns}, np.zeros(0, dtype=np.int64)
+	starts = np.flatnonzero(np.diff(codes, prepend=codes[0] - 1))
+	ends = np.append(starts[1:], len(codes)) - 1
+	data: Dict[str, np.ndarray] = {}
+	for col, how in _OHLCV.items():
+		if col in daily.columns:
+			values = daily[col].to_numpy()
+			data[col] = values[starts] if how == "first" else values[ends] if how == "last" else how.reduceat(values, starts)
+	return data, ends
+
+
+def resample_ohlcv(daily: pd.DataFrame, tf: str) -> pd.DataFrame:
+	"""일봉 → 주봉/월봉 (인덱스는 기간의 마지막 거래일, 마지막 행은 아직 진행 중인 기간일 수 있음)"""
+	data, ends = _aggregate(daily, tf)
+	return pd.DataFrame(data, index=daily.index[ends])
+
+
+def _rolling_sum(x: np.ndarray, k: int) -> np.ndarray:
+	"""축 0 방향 길이 k 이동 합 (값이 k 개 안 되거나 NaN 이 섞인 창은 NaN)"""
+	if k <= 0:
+		return np.zeros(x.shape)
+	out = np.full(x.shape, np.nan)
+	if len(x) >= k:
+		nan = np.isnan(x)
+		zero = np.zeros((1,) + x.shape[1:])
+		cs = np.concatenate((zero, np.cumsum(np.where(nan, 0.0, x), axis=0)))
+		bad = np.concatenate((zero, np.cumsum(nan, axis=0)))
+		out[k - 1:] = np.where(bad[k:] - bad[:-k] > 0, np.nan, cs[k:] - cs[:-k])
+	return out
+
+
+def _ema(x: np.ndarray, span: int) -> np.ndarray:
+	"""ewm(span, adjust=False).mean() 과 같음 (상위 봉은 수십 개라 반복문으로 충분)"""
+	out = np.empty(x.shape)
+	a = 2 / (span + 1)
+	for i in range(len(x)):
+		out[i] = x[i] if i == 0 else out[i - 1] + a * (x[i] - out[i - 1])
+	return out
+
+
+def timeframe_columns(df: pd.DataFrame, tf: str, params: Optional[Mapping[str, Any]] = None) -> Dict[str, np.ndarray]:
+	"""일봉 행마다 그 날짜 기준 상위 봉 지표 값
+
+	각 날짜의 값은 이전 기간까지의 확정 봉 + 그 날 종가로 진행 중인 봉을 놓고 계산한다
+	(indicators.py 와 같은 정의, 미래 일봉을 보지 않음).
+	"""
+	if df.empty:
+		return {}
+	return timeframe_arrays(df["Close"].to_numpy(dtype=np.float64), period_codes(df.index, tf), tf, params)
+
+
+def timeframe_arrays(close: np.ndarray, codes: np.ndarray, tf: str,
+                     params: Optional[Mapping[str, Any]] = None) -> Dict[str, np.ndarray]:
+	"""timeframe_columns 의 배열 버전 — close 는 (날짜,) 또는 (날짜, 종목)
+
+	확정 봉 쪽 값만 봉 축에서 계산해 날짜로 펼치므로 일봉 수에 선형인 비용으로 끝난다.
+	"""
+	p = params or TIMEFRAME_PARAMS[tf]
+	new_period = np.diff(codes, prepend=codes[0] - 1) != 0
+	closes = close[np.append(np.flatnonzero(new_period)[1:], len(close)) - 1]  # 기간별 마지막 종가
+	cols: Dict[str, np.ndarray] = {}
+	# 날짜별로 직전(확정) 기간의 위치, 첫 기간이면 -1
+	prev_pos = np.cumsum(new_period) - 2
+	first = prev_pos < 0
+
+	def prev(values: np.ndarray) -> np.ndarray:
+		picked = values[prev_pos]
+		picked[first] = np.nan
+		return picked
+
+	for window in p.get("sma", ()):
+		cols[f"{tf}_SMA_{window}"] = (prev(_rolling_sum(closes, window - 1)) + close) / window
+
+	if "rsi" in p:
+		n = p["rsi"]
+		delta = np.diff(closes, prepend=np.nan)
+		delta_d = close - prev(closes)
+		with np.errstate(invalid="ignore"):
+			avg_gain = (prev(_rolling_sum(np.clip(delta, 0, None), n - 1)) + np.clip(delta_d, 0, None)) / n
+			avg_loss = (prev(_rolling_sum(np.clip(-delta, 0, None), n - 1)) + np.clip(-delta_d, 0, None)) / n
+		cols[f"{tf}_RSI"] = 100 - 100 / (1 + avg_gain / np.where(avg_loss == 0, 1e-9, avg_loss))
+
+	if "macd" in p:
+		fast, slow, signal = p["macd"]
+
+		def step(prev_value: np.ndarray, x: np.ndarray, span: int) -> np.ndarray:
+			return np.where(np.isnan(prev_value), x, prev_value + 2 / (span + 1) * (x - prev_value))
+
+		ema_fast, ema_slow = _ema(closes, fast), _ema(closes, slow)
+		macd = step(prev(ema_fast), close, fast) - step(prev(ema_slow), close, slow)
+		cols[f"{tf}_MACD"] = macd
+		cols[f"{tf}_MACD_SIGNAL"] = step(prev(_ema(ema_fast - ema_slow, signal)), macd, signal)
+	return cols
+
+
+def add_timeframe_indicators(df: pd.DataFrame, timeframes: Mapping[str, Mapping[str, Any]]) -> pd.DataFrame:
+	"""{봉: 파라미터} 의 상위 봉 지표 열을 붙인 새 프레임"""
+	cols: Dict[str, np.ndarray] = {}
+	for tf, params in timeframes.items():
+		cols.update(timeframe_columns(df, tf, params))
+	# 열을 하나씩 넣으면 매번 블록을 다시 만들므로 한 번에 붙임
+	return pd.concat([df, pd.DataFrame(cols, index=df.index)], axis=1) if cols else df.copy()
+
+
+class TimeframeState:
+	"""상위 봉 하나의 증분 상태 (streaming.IncrementalIndicators 용)
+
+	일봉이 들어오면 진행 중인 기간의 종가만 바꾸고, 기간이 바뀔 때 직전 봉을 확정해
+	이동 창 합계·EMA 를 한 번 다시 계산해 둔다. 그래서 일봉 하나의 갱신은 상수 시간이고,
+	값은 timeframe_columns 와 같다.
+	"""
+	__slots__ = ("tf", "sma", "rsi", "macd", "closes", "gains", "losses", "ema",
+	             "period", "start", "end", "close", "base", "empty", "row")
+
+	def __init__(self, tf: str, params: Optional[Mapping[str, Any]] = None) -> None:
+		p = params or TIMEFRAME_PARAMS[tf]
+		self.tf = tf
+		self.sma = tuple(p.get("sma", ()))
+		self.rsi = p.get("rsi")
+		self.macd = p.get("macd")
+		self.closes: deque = deque(maxlen=max(self.sma + ((self.rsi or 0) + 1,)))  # 확정된 기간 종가
+		self.gains: deque = deque(maxlen=self.rsi or 1)
+		self.losses: deque = deque(maxlen=self.rsi or 1)
+		self.ema: Optional[Tuple[float, float, float]] = None  # 확정 봉 기준 (fast, slow, signal)
+		self.period: Optional[int] = None
+		self.start = self.end = 0.0  # 진행 중인 기간의 [시작, 끝) epoch 초
+		self.close = math.nan
+		self.base: Dict[str, Any] = self._base()
+		# 값이 아직 없는 열까지 포함한 빈 행 (열 이름은 한 번만 만듦)
+		names = [f"{tf}_SMA_{w}" for w in self.sma] + ([f"{tf}_RSI"] if self.rsi else [])
+		names += [f"{tf}_MACD", f"{tf}_MACD_SIGNAL"] if self.macd else []
+		self.empty = dict.fromkeys(names, math.nan)
+		self.row: Dict[str, float] = {}
+
+	def _base(self) -> Dict[str, Any]:
+		"""확정 봉만으로 정해지는 값 (SMA 창의 앞 w-1 개 합, RSI 창의 앞 n-1 개 합)"""
+		closes = list(self.closes)
+		base: Dict[str, Any] = {"sma": [(f"{self.tf}_SMA_{w}", w, sum(closes[len(closes) - w + 1:]) if w > 1 else 0.0)
+		                                for w in self.sma if len(closes) >= w - 1]}
+		n = self.rsi
+		if n and closes and len(self.gains) >= n - 1:
+			gains, losses = list(self.gains), list(self.losses)
+			base["rsi"] = (f"{self.tf}_RSI", sum(gains[len(gains) - n + 1:]) if n > 1 else 0.0,
+			               sum(losses[len(losses) - n + 1:]) if n > 1 else 0.0, closes[-1])
+		if self.macd:
+			base["macd"] = (f"{self.tf}_MACD", f"{self.tf}_MACD_SIGNAL")
+		return base
+
+	def _close_period(self) -> None:
+		if self.closes:
+			delta = self.close - self.closes[-1]
+			self.gains.append(max(delta, 0.0))
+			self.losses.append(max(-delta, 0.0))
+		self.closes.append(self.close)
+		if self.macd:
+			self.ema = self._ema(self.close)
+		self.base = self._base()
+
+	def _ema(self, close: float) -> Tuple[float, float, float]:
+		fast, slow, signal = self.macd
+		if self.ema is None:
+			return close, close, 0.0
+		f, s, g = self.ema
+		f += 2 / (fast + 1) * (close - f)
+		s += 2 / (slow + 1) * (close - s)
+		return f, s, g + 2 / (signal + 1) * ((f - s) - g)
+
+	def update(self, ts: float, close: float) -> Dict[str, float]:
+		if not self.start <= ts < self.end:
+			period, self.start, self.end = period_bounds(ts, self.tf)
+			if self.period is not None and period != self.period:
+				self._close_period()
+			self.period = period
+		self.close = close
+
+		base, row = self.base, self.empty.copy()
+		for name, w, prev_sum in base["sma"]:
+			row[name] = (prev_sum + close) / w
+		if "rsi" in base:
+			name, gain_sum, loss_sum, prev_close = base["rsi"]
+			delta = close - prev_close
+			avg_gain = (gain_sum + max(delta, 0.0)) / self.rsi
+			avg_loss = (loss_sum + max(-delta, 0.0)) / self.rsi
+			row[name] = 100 - 100 / (1 + avg_gain / (avg_loss or 1e-9))
+		if self.macd:
+			f, s, g = self._ema(close)
+			row[base["macd"][0]] = f - s
+			row[base["macd"][1]] = g
+		self.row = row
+		return row
+
+
+if __name__ == "__main__":
+	import argparse
+	import time
+
+	from screener import enrich_indicators
+
+	parser = argparse.ArgumentParser(description="상위 봉 지표 계산 비용 측정 (합성 일봉)")
+	parser.add_argument("--tickers", type=int, default=500)
+	parser.add_argument("--days", type=int, default=250)
+	args = parser.parse_args()
+
+	rng = np.random.default_rng(0)
+	index = pd.bdate_range("2024-01-01", periods=args.days)
+	frames = {}
+	for i in range(args.tickers):
+		c = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, args.days)))
+		frames[f"T{i}"] = pd.DataFrame({"Open": c, "High": c * 1.01, "Low": c * 0.99, "Close": c,
+		                                "Volume": rng.integers(100_000, 1_000_000, args.days)}, index=index)
+
+	started = time.perf_counter()
+	for df in frames.values():
+		add_timeframe_indicators(df, TIMEFRAME_PARAMS)
+	elapsed = time.perf_counter() - started
+	started = time.perf_counter()
+	for df in frames.values():
+		enrich_indicators(df)
+	daily = time.perf_counter() - started
+	print(f"⏱️ 주봉·월봉 지표: {elapsed / args.tickers * 1000:.2f}ms/종목 (일봉 지표: {daily / args.tickers * 1000:.2f}ms/종목)")
+
+	states = {t: [TimeframeState(tf) for tf in TIMEFRAMES] for t in frames}
+	ts = (index.asi8 // 10**9).tolist()
+	started = time.perf_counter()
+	for t, df in frames.items():
+		for stamp, close in zip(ts, df["Close"].tolist()):
+			for state in states[t]:
+				state.update(stamp, close)
+	elapsed = time.perf_counter() - started
+	print(f"⏱️ 증분 갱신: {elapsed / (args.tickers * args.days) * 1e6:.1f}µs/일봉")
@@ -1,12 +1,34 @@
-from flask import Flask, Response, send_from_directory
+from flask import Flask, Response, send_from_directory, jsonify, request
 from data_manager import data_manager
+from price_panel import open_panel, panel_path
+import provider_health
+import ticker_search
+from reco_history import reco_history
 import os
 
 app = Flask(__name__)
 
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+REPORTS_DIR = os.path.join(ROOT_DIR, 'reports')
+
+
+def _prerendered(directory: str, stem: str, ext: str):
+    """발행 시 미리 렌더링해 둔 리포트(HTML/JSON)가 있으면 그대로 반환"""
+    if os.path.isfile(os.path.join(directory, f"{stem}.{ext}")):
+        return send_from_directory(directory, f"{stem}.{ext}")
+    return None
+
+@app.route('/report.json')
+def report_json():
+    """최신 리포트 (JSON)"""
+    return _prerendered(ROOT_DIR, 'report', 'json') or (jsonify({"error": "not found"}), 404)
+
 @app.route('/report.txt')
 def report_txt():
     """카카오톡에서 보낸 리포트 파일을 HTML로 반환 (모바일 호환)"""
+    prerendered = _prerendered(ROOT_DIR, 'report', 'html')
+    if prerendered is not None:
+        return prerendered
     try:
         # 저장된 리포트 파일 읽기 (카카오톡과 동일한 내용)
         with open('report.txt', 'r', encoding='utf-8') as f:
@@ -68,7 +90,13 @@ def report_txt():
 @app.route('/reports/<path:filename>')
 def serve_report(filename: str):
     """개별 카카오 메시지 전용 리포트 파일 제공 (HTML로 감싸기)"""
-    reports_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'reports'))
+    reports_dir = REPORTS_DIR
+    stem, ext = os.path.splitext(filename)
+    if ext in ('.html', '.json'):
+        return send_from_directory(reports_dir, filename)
+    prerendered = _prerendered(reports_dir, stem, 'html') if ext == '.txt' else None
+    if prerendered is not None:
+        return prerendered
     file_path = os.path.join(reports_dir, filename)
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -88,6 +116,46 @@ def serve_report(filename: str):
     html = html_template.replace("%%REPORT%%", report_text)
     return Response(html, mimetype='text/html; charset=utf-8')
 
+@app.route('/api/prices/<market>/<ticker>')
+def api_prices(market: str, ticker: str):
+    """공유 가격 패널(읽기 전용 메모리 매핑)에서 최근 시세 조회"""
+    panel = open_panel(panel_path(market)) if market in ('kr', 'us') else None
+    if panel is None or ticker not in panel:
+        return jsonify({"error": "not found"}), 404
+    df = panel[ticker].tail(60)
+    return jsonify({
+        "ticker": ticker,
+        "dates": [d.strftime('%Y-%m-%d') for d in df.index],
+        "close": [float(v) for v in df["Close"]],
+        "volume": [int(v) for v in df["Volume"]],
+    })
+
+@app.route('/api/picks')
+def api_picks():
+    """추천 이력 조회 (?start=&end=&ticker=&market=&source=)"""
+    args = request.args
+    picks = reco_history.query(args.get('start'), args.get('end'), args.get('ticker'),
+                               args.get('market'), args.get('source'), limit=min(args.get('limit', 200, type=int), 2000))
+    return jsonify(picks)
+
+@app.route('/api/picks/performance')
+def api_picks_performance():
+    """추천 종목의 1/5/20일 forward 수익률 요약 (수익률은 리포트 생성 시 갱신)"""
+    return jsonify(reco_history.performance(request.args.get('market'), request.args.get('source')))
+
+@app.route('/api/search')
+def api_search():
+    """종목 검색 (?q=삼성전자 / ㅅㅅㅈㅈ / apple / 005930, &market=kr|us, &limit=)"""
+    args = request.args
+    hits = ticker_search.get_index().search(args.get('q', ''), limit=min(args.get('limit', 10, type=int), 50),
+                                            market=args.get('market'))
+    return jsonify(hits)
+
+@app.route('/api/providers')
+def api_providers():
+    """데이터 공급자별 지연 시간/차단기 상태"""
+    return jsonify(provider_health.snapshot())
+
 if __name__ == '__main__':
     print("🚀 웹 서버 시작 중... (카카오톡 링크용)")
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from price_panel import PricePanel
+from screener import INDICATOR_PARAMS
+
+# indicators.py 와 같은 식으로 계산한 특징 (가격 수준에 무관하도록 종가 대비 비율로 정규화)
+FEATURES = ("log_ret", "close_sma5", "close_sma20", "close_sma60", "rsi", "macd", "macd_signal", "macd_hist",
+            "bb_pos", "log_vol_ratio")
+
+
+def indicator_features(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+	"""(날짜, 종목) 종가/거래량 → (종목, 날짜, 특징) float32 C-연속 배열
+
+	SMA/RSI/MACD/볼린저는 indicators.add_* 와 같은 윈도우·min_periods·ewm(adjust=False) 설정을 쓴다.
+	"""
+	c = pd.DataFrame(close)
+	feats = {"log_ret": np.log(c).diff()}
+	for window in INDICATOR_PARAMS["sma"]:
+		feats[f"close_sma{window}"] = c / c.rolling(window=window, min_periods=window).mean() - 1
+
+	rsi_window = INDICATOR_PARAMS["rsi"]
+	delta = c.diff()
+	avg_gain = delta.clip(lower=0).rolling(window=rsi_window, min_periods=rsi_window).mean()
+	avg_loss = (-delta.clip(upper=0)).rolling(window=rsi_window, min_periods=rsi_window).mean()
+	feats["rsi"] = (100 - 100 / (1 + avg_gain / avg_loss.replace(0, 1e-9))) / 100
+
+	fast, slow, signal = INDICATOR_PARAMS["macd"]
+	macd = c.ewm(span=fast, adjust=False).mean() - c.ewm(span=slow, adjust=False).mean()
+	macd_signal = macd.ewm(span=signal, adjust=False).mean()
+	feats["macd"] = macd / c
+	feats["macd_signal"] = macd_signal / c
+	feats["macd_hist"] = (macd - macd_signal) / c
+
+	window, num_std = INDICATOR_PARAMS["bbands"]
+	ma = c.rolling(window=window, min_periods=window).mean()
+	std = c.rolling(window=window, min_periods=window).std()
+	feats["bb_pos"] = (c - (ma - num_std * std)) / (2 * num_std * std)
+
+	v = pd.DataFrame(volume.astype(np.float64)).replace(0, np.nan)
+	vol_window = INDICATOR_PARAMS["vol_avg"]
+	feats["log_vol_ratio"] = np.log(v / v.rolling(window=vol_window, min_periods=vol_window).mean())
+
+	n_dates, n_tickers = close.shape
+	out = np.empty((n_tickers, n_dates, len(FEATURES)), dtype=np.float32)
+	for j, name in enumerate(FEATURES):
+		out[:, :, j] = feats[name].to_numpy().T
+	out[~np.isfinite(out)] = np.nan
+	return out
+
+
+class WindowDataset:
+	"""(window × 특징) 표본과 forward 수익률 라벨
+
+	특징은 (종목, 날짜, 특징) 연속 배열 하나에 저장되고, 표본은 그 위의
+	sliding_window_view 와 (종목, 마지막 날짜) 인덱스일 뿐이라 표본별 복사가 없다.
+	미니배치를 만들 때만 배치 크기만큼 한 번에 모은다.
+	"""
+
+	def __init__(self, features: np.ndarray, labels: np.ndarray, window: int, tickers: List[str],
+	             index: Optional[np.ndarray] = None) -> None:
+		self.features = features
+		self.labels = labels
+		self.window = window
+		self.tickers = tickers
+		# (종목, 시작 날짜, 윈도우, 특징) 뷰
+		self.windows = sliding_window_view(features, window, axis=1).swapaxes(-1, -2)
+		self.index = self._valid_index() if index is None else index
+
+	@classmethod
+	def from_panel(cls, panel: Mapping[str, pd.DataFrame], window: int = 60, horizon: int = 5) -> "WindowDataset":
+		if isinstance(panel, PricePanel):
+			close = np.asarray(panel.array("Close"), dtype=np.float64).T
+			volume = np.asarray(panel.array("Volume")).T
+			tickers = list(panel.tickers)
+		else:
+			tickers = [t for t, df in panel.items() if df is not None and not df.empty]
+			close = pd.concat({t: panel[t]["Close"] for t in tickers}, axis=1, sort=True).to_numpy(dtype=np.float64)
+			volume = pd.concat({t: panel[t]["Volume"] for t in tickers}, axis=1, sort=True).fillna(0).to_numpy()
+		features = indicator_features(close, volume)
+		labels = np.full(close.shape, np.nan, dtype=np.float32)
+		with np.errstate(divide="ignore", invalid="ignore"):
+			labels[:-horizon] = close[horizon:] / close[:-horizon] - 1
+		return cls(features, np.ascontiguousarray(labels.T), window, tickers)
+
+	def _valid_index(self) -> np.ndarray:
+		"""윈도우 안에 결측 특징이 없고 라벨이 있는 (종목, 시작 날짜) 목록"""
+		bad = np.isnan(self.features).any(axis=2)
+		counts = np.concatenate([np.zeros((bad.shape[0], 1), np.int32), np.cumsum(bad, axis=1, dtype=np.int32)], axis=1)
+		clean = (counts[:, self.window:] - counts[:, :-self.window]) == 0  # (종목, 시작 날짜)
+		end_labels = self.labels[:, self.window - 1:]
+		clean &= ~np.isnan(end_labels)
+		rows, starts = np.nonzero(clean)
+		return np.stack([rows, starts], axis=1).astype(np.int32)
+
+	def __len__(self) -> int:
+		return len(self.index)
+
+	def __getitem__(self, k: int) -> Tuple[np.ndarray, float]:
+		"""k 번째 표본 (window, 특징) 뷰와 라벨 (복사 없음)"""
+		row, start = self.index[k]
+		return self.windows[row, start], float(self.labels[row, start + self.window - 1])
+
+	def shard(self, rank: int, world: int) -> "WindowDataset":
+		"""world 개 워커 중 rank 번째가 맡을 표본 (특징 배열은 공유)"""
+		return WindowDataset(self.features, self.labels, self.window, self.tickers, self.index[rank::world])
+
+	def batches(self, batch_size: int = 256, shuffle: bool = True, seed: int = 0,
+	            drop_last: bool = False) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+		"""(배치, window, 특징) float32 와 (배치,) 라벨을 생성"""
+		order = np.random.default_rng(seed).permutation(len(self.index)) if shuffle else np.arange(len(self.index))
+		stop = len(order) - (len(order) % batch_size if drop_last else 0)
+		for lo in range(0, stop, batch_size):
+			rows, starts = self.index[order[lo:lo + batch_size]].T
+			yield self.windows[rows, starts], self.labels[rows, starts + self.window - 1]
+
+	def save(self, directory: str) -> str:
+		"""워커 프로세스가 메모리 매핑으로 공유할 수 있게 저장"""
+		os.makedirs(directory, exist_ok=True)
+		np.save(os.path.join(directory, "features.npy"), self.features)
+		np.save(os.path.join(directory, "labels.npy"), self.labels)
+		np.save(os.path.join(directory, "index.npy"), self.index)
+		with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+			json.dump({"window": self.window, "tickers": self.tickers, "features": list(FEATURES)}, f, ensure_ascii=False)
+		return directory
+
+	@classmethod
+	def load(cls, directory: str, mmap: bool = True) -> "WindowDataset":
+		mode = "r" if mmap else None
+		with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+			meta = json.load(f)
+		return cls(np.load(os.path.join(directory, "features.npy"), mmap_mode=mode),
+		           np.load(os.path.join(directory, "labels.npy"), mmap_mode=mode),
+		           meta["window"], meta["tickers"],
+		           np.load(os.path.join(directory, "index.npy"), mmap_mode=mode))
+
+
+def _scan_shard(directory: str, rank: int, world: int, batch_size: int) -> Tuple[int, float]:
+	"""워커: 저장된 데이터셋을 매핑해 자기 샤드의 배치를 모두 읽는다 (벤치마크용)"""
+	ds = WindowDataset.load(directory).shard(rank, world)
+	n, total = 0, 0.0
+	for x, y in ds.batches(batch_size, seed=rank):
+		n += len(y)
+		total += float(x[:, -1, 0].sum())
+	return n, total
+
+
+if __name__ == "__main__":
+	import argparse
+	from concurrent.futures import ProcessPoolExecutor
+
+	from price_panel import history_path, open_panel
+
+	parser = argparse.ArgumentParser(description="슬라이딩 윈도우 학습 데이터셋 생성/벤치마크")
+	parser.add_argument("--market", default="kr", choices=["kr", "us"])
+	parser.add_argument("--window", type=int, default=60)
+	parser.add_argument("--horizon", type=int, default=5)
+	parser.add_argument("--batch", type=int, default=1024)
+	parser.add_argument("--workers", type=int, default=4)
+	parser.add_argument("--synthetic", type=int, default=0, help="가상 종목 N개 x 1000일로 측정")
+	parser.add_argument("--out", default=None, help="데이터셋 저장 디렉터리")
+	args = parser.parse_args()
+
+	started = time.perf_counter()
+	if args.synthetic:
+		rng = np.random.default_rng(0)
+		idx = pd.bdate_range(end="2026-01-01", periods=1000)
+		close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(idx), args.synthetic)), axis=0))
+		volume = rng.integers(1e5, 1e6, close.shape)
+		features = indicator_features(close, volume)
+		labels = np.full(close.shape, np.nan, dtype=np.float32)
+		labels[:-args.horizon] = close[args.horizon:] / close[:-args.horizon] - 1
+		ds = WindowDataset(features, np.ascontiguousarray(labels.T), args.window, [str(i) for i in range(args.synthetic)])
+	else:
+		panel = open_panel(history_path(args.market))
+		if panel is None:
+			raise SystemExit("❌ 히스토리 패널이 없습니다 (python src/point_in_time.py --build)")
+		ds = WindowDataset.from_panel(panel, args.window, args.horizon)
+	print(f"🧱 특징 {ds.features.shape} ({ds.features.nbytes / 1e6:.0f}MB), 윈도우 표본 {len(ds):,}개: {time.perf_counter() - started:.1f}s")
+
+	started = time.perf_counter()
+	n = sum(len(y) for x, y in ds.batches(args.batch))
+	elapsed = time.perf_counter() - started
+	gb = n * args.window * len(FEATURES) * 4 / 1e9
+	print(f"🔀 셔플 미니배치 {n:,}개 윈도우: {elapsed:.2f}s ({n / elapsed:,.0f}개/s, {gb / elapsed:.1f}GB/s)")
+
+	out = args.out or os.path.join(os.path.dirname(history_path(args.market)), f"{args.market}_windows")
+	ds.save(out)
+	started = time.perf_counter()
+	with ProcessPoolExecutor(max_workers=args.workers) as pool:
+		results = list(pool.map(_scan_shard, [out] * args.workers, range(args.workers), [args.workers] * args.workers,
+		                        [args.batch] * args.workers))
+	elapsed = time.perf_counter() - started
+	n = sum(r[0] for r in results)
+	print(f"👷 워커 {args.workers}개 샤드 읽기 {n:,}개 윈도우: {elapsed:.2f}s ({n / elapsed:,.0f}개/s)")
+	print("💾 데이터셋 저장:", out)
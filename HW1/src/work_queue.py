@@ -0,0 +1,490 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from correlation import DEFAULT_WINDOW
+from data_fetchers import fetch_kr_price_history, fetch_us_price_history
+from price_panel import DATA_DIR
+from screener import merge_candidates, screen_tickers
+
+QUEUE_PATH = os.getenv("WORK_QUEUE_DB") or os.path.join(DATA_DIR, "work_queue.sqlite")
+# 여러 머신의 워커가 공유하는 Redis 호환 서버 (예: redis://queue-host:6379/0), 없으면 로컬 SQLite 큐
+QUEUE_URL = os.getenv("WORK_QUEUE_URL")
+LEASE_SECONDS = 120.0  # 이 시간 안에 완료/갱신하지 않은 작업 단위는 다른 워커가 다시 가져감
+MAX_ATTEMPTS = 3
+FETCHERS = {"kr": fetch_kr_price_history, "us": fetch_us_price_history}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+	id TEXT PRIMARY KEY,        -- job_id:샤드 해시 (같은 작업을 다시 넣어도 중복되지 않음)
+	job_id TEXT NOT NULL,
+	market TEXT NOT NULL,
+	tickers TEXT NOT NULL,      -- JSON 배열
+	pool_size INTEGER NOT NULL,
+	status TEXT NOT NULL DEFAULT 'pending',  -- pending / leased / done / failed
+	attempts INTEGER NOT NULL DEFAULT 0,
+	worker TEXT,
+	lease_until REAL,
+	result TEXT,
+	error TEXT,
+	updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS units_status ON units (status, lease_until);
+CREATE INDEX IF NOT EXISTS units_job ON units (job_id, status);
+"""
+
+
+def _placeholders(values: Sequence[Any]) -> str:
+	return ", ".join("?" * len(values)) or "NULL"
+
+
+def _unit_id(job_id: str, tickers: Sequence[str]) -> str:
+	return f"{job_id}:{hashlib.sha1(','.join(tickers).encode()).hexdigest()[:12]}"
+
+
+class LeaseLost(RuntimeError):
+	"""임대가 만료되어 다른 워커가 작업 단위를 가져감 (이 워커의 결과는 버림)"""
+
+
+class WorkQueue:
+	"""SQLite 기반 작업 큐 (별도 서버 없이 같은 머신의 워커 프로세스끼리 공유, 테스트용)
+
+	WAL 모드는 네트워크 파일시스템(NFS/SMB)에서 동작하지 않으므로 큐 파일은 로컬 디스크에 둔다.
+	여러 머신에 워커를 띄울 때는 같은 인터페이스의 RedisWorkQueue 를 쓴다 (WORK_QUEUE_URL).
+
+	작업 단위는 임대(lease) 방식으로 가져가며, 워커가 죽어 임대가 만료되면 다른 워커가
+	다시 가져간다. 완료는 임대한 워커만 한 번 기록할 수 있어 같은 단위가 두 번 반영되지 않는다.
+	"""
+
+	def __init__(self, path: str = QUEUE_PATH) -> None:
+		self.path = path
+		self._local = threading.local()
+
+	def _conn(self) -> sqlite3.Connection:
+		# 스레드마다 연결 하나, fork 된 프로세스는 새로 연결
+		conn = getattr(self._local, "conn", None)
+		if conn is None or self._local.pid != os.getpid():
+			os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+			conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+			conn.row_factory = sqlite3.Row
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.executescript(_SCHEMA)
+			self._local.conn = conn
+			self._local.pid = os.getpid()
+		return conn
+
+	def submit(self, job_id: str, market: str, tickers: Sequence[str], shard_size: int = 50,
+	           pool_size: int = 15) -> List[str]:
+		"""종목 목록을 shard_size 개씩 작업 단위로 나눠 등록하고 이번 등록의 단위 ID 반환
+
+		이미 있는 단위는 그대로 둔다. 같은 job_id 에 예전 등록의 다른 단위가 남아 있을 수 있으므로
+		진행/결과는 반환된 ID 로 조회한다.
+		"""
+		now = time.time()
+		tickers = list(dict.fromkeys(tickers))
+		rows = []
+		for lo in range(0, len(tickers), shard_size):
+			shard = list(tickers[lo:lo + shard_size])
+			rows.append((_unit_id(job_id, shard), job_id, market, json.dumps(shard), pool_size, now))
+		conn = self._conn()
+		conn.execute("BEGIN IMMEDIATE")
+		conn.executemany("INSERT OR IGNORE INTO units (id, job_id, market, tickers, pool_size, updated_at)"
+		                 " VALUES (?, ?, ?, ?, ?, ?)", rows)
+		conn.execute("COMMIT")
+		return [row[0] for row in rows]
+
+	def claim(self, worker: str, lease: float = LEASE_SECONDS) -> Optional[sqlite3.Row]:
+		"""대기 중이거나 임대가 만료된 단위 하나를 원자적으로 임대"""
+		now = time.time()
+		conn = self._conn()
+		conn.execute("BEGIN IMMEDIATE")
+		try:
+			while True:
+				row = conn.execute(
+					"SELECT * FROM units WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?)"
+					" ORDER BY attempts, updated_at LIMIT 1", (now,)).fetchone()
+				if row is None:
+					return None
+				if row["attempts"] < MAX_ATTEMPTS:
+					break
+				# 임대가 계속 만료된 단위는 포기 (워커를 죽게 만드는 입력일 수 있음)
+				conn.execute("UPDATE units SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+				             (row["error"] or "임대 만료 반복", now, row["id"]))
+			conn.execute("UPDATE units SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1,"
+			             " updated_at = ? WHERE id = ?", (worker, now + lease, now, row["id"]))
+			return row
+		finally:
+			conn.execute("COMMIT")
+
+	def renew(self, unit_id: str, worker: str, lease: float = LEASE_SECONDS) -> bool:
+		"""아직 임대 중인 워커의 임대를 지금부터 lease 초로 연장 (다른 워커가 가져갔으면 False)"""
+		now = time.time()
+		cur = self._conn().execute(
+			"UPDATE units SET lease_until = ?, updated_at = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+			(now + lease, now, unit_id, worker))
+		return cur.rowcount == 1
+
+	def complete(self, unit_id: str, worker: str, result: Any) -> bool:
+		"""임대 중인 워커의 결과만 기록 (늦게 끝난 이전 워커의 중복 완료는 무시)"""
+		cur = self._conn().execute(
+			"UPDATE units SET status = 'done', result = ?, lease_until = NULL, updated_at = ?"
+			" WHERE id = ? AND worker = ? AND status = 'leased'",
+			(json.dumps(result, ensure_ascii=False), time.time(), unit_id, worker))
+		return cur.rowcount == 1
+
+	def fail(self, unit_id: str, worker: str, error: str) -> None:
+		"""재시도 횟수가 남았으면 다시 대기열로, 아니면 failed"""
+		self._conn().execute(
+			"UPDATE units SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,"
+			" error = ?, lease_until = NULL, updated_at = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+			(MAX_ATTEMPTS, error, time.time(), unit_id, worker))
+
+	def progress(self, unit_ids: Sequence[str]) -> Dict[str, int]:
+		rows = self._conn().execute(
+			f"SELECT status, COUNT(*) FROM units WHERE id IN ({_placeholders(unit_ids)}) GROUP BY status", list(unit_ids))
+		return {status: n for status, n in rows}
+
+	def results(self, unit_ids: Sequence[str]) -> List[Any]:
+		rows = self._conn().execute(
+			f"SELECT result FROM units WHERE id IN ({_placeholders(unit_ids)}) AND status = 'done'", list(unit_ids))
+		return [json.loads(r[0]) for r in rows]
+
+	def purge(self, older_than: float = 7 * 86400) -> int:
+		"""끝난 작업 단위 정리"""
+		cur = self._conn().execute("DELETE FROM units WHERE status IN ('done', 'failed') AND updated_at < ?",
+		                           (time.time() - older_than,))
+		return cur.rowcount
+
+
+# Redis 쪽 상태 전이는 Lua 스크립트로 원자적으로 처리 (시각은 서버 TIME 기준이라 워커 간 시계 차이와 무관)
+_LUA_NOW = "local t = redis.call('TIME') local now = tonumber(t[1]) + tonumber(t[2]) / 1000000 "
+
+_LUA_SUBMIT = _LUA_NOW + """
+local p = ARGV[1]
+for i = 2, #ARGV, 5 do
+	local id = ARGV[i]
+	if redis.call('HSETNX', p .. 'unit:' .. id, 'job_id', ARGV[i + 1]) == 1 then
+		redis.call('HSET', p .. 'unit:' .. id, 'market', ARGV[i + 2], 'tickers', ARGV[i + 3], 'pool_size', ARGV[i + 4],
+		           'status', 'pending', 'attempts', 0, 'updated_at', now)
+		redis.call('ZADD', p .. 'pending', now, id)
+	end
+end
+"""
+
+_LUA_CLAIM = _LUA_NOW + """
+local p, worker, lease, max_attempts = ARGV[1], ARGV[2], tonumber(ARGV[3]), tonumber(ARGV[4])
+-- 임대가 만료된 단위를 대기열로 (시도 횟수가 적은 것부터)
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', p .. 'leased', '-inf', '(' .. now)) do
+	redis.call('ZREM', p .. 'leased', id)
+	redis.call('ZADD', p .. 'pending', tonumber(redis.call('HGET', p .. 'unit:' .. id, 'attempts')) * 1e11 + now, id)
+end
+while true do
+	local id = redis.call('ZRANGE', p .. 'pending', 0, 0)[1]
+	if not id then
+		return false
+	end
+	redis.call('ZREM', p .. 'pending', id)
+	local key = p .. 'unit:' .. id
+	local attempts = tonumber(redis.call('HGET', key, 'attempts'))
+	if attempts < max_attempts then
+		redis.call('HSET', key, 'status', 'leased', 'worker', worker, 'lease_until', now + lease,
+		           'attempts', attempts + 1, 'updated_at', now)
+		redis.call('ZADD', p .. 'leased', now + lease, id)
+		return {id, redis.call('HGET', key, 'market'), redis.call('HGET', key, 'tickers'),
+		        redis.call('HGET', key, 'pool_size'), attempts}
+	end
+	redis.call('HSET', key, 'status', 'failed', 'error', redis.call('HGET', key, 'error') or ARGV[5], 'updated_at', now)
+	redis.call('ZADD', p .. 'finished', now, id)
+end
+"""
+
+# KEYS 없이 ARGV[1] 접두사, ARGV[2] 단위 ID, ARGV[3] 워커 - 임대 중인 워커일 때만 실행
+_LUA_OWNED = _LUA_NOW + """
+local p, id, worker = ARGV[1], ARGV[2], ARGV[3]
+local key = p .. 'unit:' .. id
+if redis.call('HGET', key, 'status') ~= 'leased' or redis.call('HGET', key, 'worker') ~= worker then
+	return 0
+end
+"""
+
+_LUA_RENEW = _LUA_OWNED + """
+redis.call('HSET', key, 'lease_until', now + tonumber(ARGV[4]), 'updated_at', now)
+redis.call('ZADD', p .. 'leased', now + tonumber(ARGV[4]), id)
+return 1
+"""
+
+_LUA_COMPLETE = _LUA_OWNED + """
+redis.call('HSET', key, 'status', 'done', 'result', ARGV[4], 'updated_at', now)
+redis.call('HDEL', key, 'lease_until')
+redis.call('ZREM', p .. 'leased', id)
+redis.call('ZADD', p .. 'finished', now, id)
+return 1
+"""
+
+_LUA_FAIL = _LUA_OWNED + """
+local attempts = tonumber(redis.call('HGET', key, 'attempts'))
+redis.call('HSET', key, 'error', ARGV[4], 'updated_at', now)
+redis.call('HDEL', key, 'lease_until')
+redis.call('ZREM', p .. 'leased', id)
+if attempts >= tonumber(ARGV[5]) then
+	redis.call('HSET', key, 'status', 'failed')
+	redis.call('ZADD', p .. 'finished', now, id)
+else
+	redis.call('HSET', key, 'status', 'pending')
+	redis.call('ZADD', p .. 'pending', attempts * 1e11 + now, id)
+end
+return 1
+"""
+
+
+class RedisWorkQueue:
+	"""Redis 호환 서버 기반 작업 큐 (WorkQueue 와 같은 submit/claim/renew/complete/fail 인터페이스)
+
+	여러 머신의 워커가 같은 서버를 공유한다. 단위는 해시(<접두사>unit:<ID>)에, 대기/임대/종료 단위는
+	정렬 집합에 두고 상태 전이는 Lua 스크립트로 원자적으로 처리한다. redis 패키지가 필요하다.
+	"""
+
+	def __init__(self, url: Optional[str] = QUEUE_URL, client: Any = None, prefix: str = "work_queue:") -> None:
+		if client is None:
+			import redis  # 선택 의존성
+
+			client = redis.Redis.from_url(url, decode_responses=True)
+		self.client = client
+		self.prefix = prefix
+		self._scripts = {name: client.register_script(lua) for name, lua in (
+			("submit", _LUA_SUBMIT), ("claim", _LUA_CLAIM), ("renew", _LUA_RENEW),
+			("complete", _LUA_COMPLETE), ("fail", _LUA_FAIL))}
+
+	def _key(self, unit_id: str) -> str:
+		return f"{self.prefix}unit:{unit_id}"
+
+	def submit(self, job_id: str, market: str, tickers: Sequence[str], shard_size: int = 50,
+	           pool_size: int = 15) -> List[str]:
+		tickers = list(dict.fromkeys(tickers))
+		args: List[Any] = [self.prefix]
+		unit_ids = []
+		for lo in range(0, len(tickers), shard_size):
+			shard = list(tickers[lo:lo + shard_size])
+			unit_ids.append(_unit_id(job_id, shard))
+			args += [unit_ids[-1], job_id, market, json.dumps(shard), pool_size]
+		if unit_ids:
+			self._scripts["submit"](args=args)
+		return unit_ids
+
+	def claim(self, worker: str, lease: float = LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+		row = self._scripts["claim"](args=[self.prefix, worker, lease, MAX_ATTEMPTS, "임대 만료 반복"])
+		if not row:
+			return None
+		unit_id, market, tickers, pool_size, attempts = row
+		return {"id": unit_id, "market": market, "tickers": tickers, "pool_size": int(pool_size),
+		        "attempts": int(attempts)}
+
+	def renew(self, unit_id: str, worker: str, lease: float = LEASE_SECONDS) -> bool:
+		return self._scripts["renew"](args=[self.prefix, unit_id, worker, lease]) == 1
+
+	def complete(self, unit_id: str, worker: str, result: Any) -> bool:
+		return self._scripts["complete"](
+			args=[self.prefix, unit_id, worker, json.dumps(result, ensure_ascii=False)]) == 1
+
+	def fail(self, unit_id: str, worker: str, error: str) -> None:
+		self._scripts["fail"](args=[self.prefix, unit_id, worker, error, MAX_ATTEMPTS])
+
+	def progress(self, unit_ids: Sequence[str]) -> Dict[str, int]:
+		pipe = self.client.pipeline(transaction=False)
+		for unit_id in unit_ids:
+			pipe.hget(self._key(unit_id), "status")
+		counts: Dict[str, int] = {}
+		for status in pipe.execute():
+			if status is not None:
+				counts[status] = counts.get(status, 0) + 1
+		return counts
+
+	def results(self, unit_ids: Sequence[str]) -> List[Any]:
+		pipe = self.client.pipeline(transaction=False)
+		for unit_id in unit_ids:
+			pipe.hmget(self._key(unit_id), "status", "result")
+		return [json.loads(result) for status, result in pipe.execute() if status == "done"]
+
+	def purge(self, older_than: float = 7 * 86400) -> int:
+		seconds, micros = self.client.time()
+		old = self.client.zrangebyscore(f"{self.prefix}finished", "-inf", seconds + micros / 1e6 - older_than)
+		if old:
+			self.client.delete(*[self._key(unit_id) for unit_id in old])
+			self.client.zrem(f"{self.prefix}finished", *old)
+		return len(old)
+
+
+def open_queue(url: Optional[str] = QUEUE_URL):
+	"""WORK_QUEUE_URL 이 있으면 Redis 큐, 없으면 로컬 SQLite 큐"""
+	return RedisWorkQueue(url) if url else WorkQueue()
+
+
+def _jsonable(value: Any) -> Any:
+	if isinstance(value, (np.floating, np.integer)):
+		value = value.item()
+	if isinstance(value, float) and not np.isfinite(value):
+		return None
+	return value
+
+
+def screen_unit(market: str, tickers: Sequence[str], pool_size: int,
+                heartbeat: Optional[Callable[[], Any]] = None) -> List[Dict[str, Any]]:
+	"""작업 단위 하나: 시세 조회 → 지표 → 채점 후 상위 pool_size 후보
+
+	코디네이터가 상관 필터를 적용할 수 있도록 후보별 최근 종가도 함께 돌려준다.
+	heartbeat 는 종목 조회마다 불러 임대를 연장한다 (느린 조회로 임대가 만료되지 않도록).
+	"""
+	fetch = FETCHERS[market]
+	frames = {}
+	for ticker in tickers:
+		frames[ticker] = fetch(ticker)
+		if heartbeat is not None:
+			heartbeat()
+	selected = screen_tickers(frames, top_k=pool_size)
+	out = []
+	for ticker, df, meta in selected:
+		tail = df["Close"].tail(DEFAULT_WINDOW + 1)
+		out.append({
+			"ticker": ticker,
+			"meta": {k: _jsonable(v) for k, v in meta.items()},
+			"dates": [pd.Timestamp(d).strftime("%Y-%m-%d") for d in tail.index],
+			"close": [_jsonable(v) for v in tail.to_numpy(dtype=np.float64)],
+		})
+	return out
+
+
+def _lease_keeper(queue, unit_id: str, worker: str, lease: float) -> Callable[[], None]:
+	"""screen_unit 의 heartbeat: lease/4 초가 지났을 때만 실제로 임대를 연장, 빼앗겼으면 LeaseLost"""
+	last = time.monotonic()
+
+	def renew() -> None:
+		nonlocal last
+		if time.monotonic() - last < lease / 4:
+			return
+		if not queue.renew(unit_id, worker, lease):
+			raise LeaseLost(unit_id)
+		last = time.monotonic()
+	return renew
+
+
+def run_worker(queue=None, name: Optional[str] = None, idle_exit: Optional[float] = None,
+               poll: float = 1.0, lease: float = LEASE_SECONDS) -> int:
+	"""작업 단위를 가져와 처리하는 워커 루프 (idle_exit 초 동안 일이 없으면 종료). 처리한 단위 수 반환"""
+	queue = queue or open_queue()
+	name = name or f"{socket.gethostname()}:{os.getpid()}"
+	done = 0
+	idle_since = time.time()
+	while True:
+		unit = queue.claim(name, lease)
+		if unit is None:
+			if idle_exit is not None and time.time() - idle_since >= idle_exit:
+				return done
+			time.sleep(poll)
+			continue
+		try:
+			result = screen_unit(unit["market"], json.loads(unit["tickers"]), unit["pool_size"],
+			                     heartbeat=_lease_keeper(queue, unit["id"], name, lease))
+		except LeaseLost:
+			print(f"⚠️ 임대 만료로 다른 워커가 가져감 ({unit['id']}), 결과를 버립니다")
+		except Exception as e:
+			print(f"⚠️ 작업 단위 실패 ({unit['id']}, {unit['attempts'] + 1}회차): {e}")
+			queue.fail(unit["id"], name, str(e))
+		else:
+			if queue.complete(unit["id"], name, result):
+				done += 1
+		idle_since = time.time()
+
+
+def merge_results(results: Sequence[Sequence[Dict[str, Any]]], top_k: int = 3,
+                  max_corr: Optional[float] = None, ranker=None) -> List[Tuple[str, pd.DataFrame, Dict[str, Any]]]:
+	"""샤드별 후보를 합쳐 screen_tickers 와 같은 (종목, 종가 df, meta) 상위 top_k (종목당 한 번)
+
+	meta 의 지표와 rule_score 로 합친 후보 전체를 다시 채점한다 (merge_candidates).
+	"""
+	candidates = []
+	seen = set()
+	for shard in results:
+		for c in shard:
+			if c["ticker"] in seen:
+				continue
+			seen.add(c["ticker"])
+			df = pd.DataFrame({"Close": c["close"]}, index=pd.to_datetime(c["dates"]), dtype=np.float64)
+			meta = {k: (np.nan if v is None else v) for k, v in c["meta"].items()}
+			candidates.append((c["ticker"], df, meta))
+	return merge_candidates(candidates, top_k, max_corr, ranker=ranker)
+
+
+def coordinate(market: str, tickers: Sequence[str], job_id: Optional[str] = None, shard_size: int = 50,
+               top_k: int = 3, max_corr: Optional[float] = 0.7, timeout: float = 3600.0,
+               queue=None) -> List[Tuple[str, pd.DataFrame, Dict[str, Any]]]:
+	"""종목 목록을 작업 단위로 등록하고 모두 끝나면 결과를 합쳐 상위 top_k 반환
+
+	같은 job_id 로 같은 종목을 다시 실행하면 이미 끝난 단위는 재사용한다. 결과는 이번 등록의
+	단위에서만 모으므로 같은 job_id 에 예전 종목 구성이 남아 있어도 섞이지 않는다.
+	"""
+	queue = queue or open_queue()
+	job_id = job_id or f"{market}-{time.strftime('%Y%m%d')}"
+	unit_ids = queue.submit(job_id, market, tickers, shard_size, pool_size=top_k * 5)
+	print(f"📤 {job_id}: 종목 {len(tickers):,}개 → 작업 단위 {len(unit_ids)}개 등록")
+	deadline = time.time() + timeout
+	while True:
+		counts = queue.progress(unit_ids)
+		if counts.get("pending", 0) + counts.get("leased", 0) == 0:
+			break
+		if time.time() > deadline:
+			print(f"⚠️ {job_id}: 시간 초과, 완료된 단위만 합침 {counts}")
+			break
+		time.sleep(0.5)
+	if counts.get("failed"):
+		print(f"⚠️ {job_id}: 실패한 작업 단위 {counts['failed']}개 (해당 종목 제외)")
+	return merge_results(queue.results(unit_ids), top_k, max_corr)
+
+
+def universe(market: str, size: int) -> List[str]:
+	"""분산 스크리닝 대상: KR 은 1단계 필터 상위 size 개, US 는 시가총액 상위 size 개"""
+	from stock_selector import get_us_top_stocks, select_kr_candidates
+
+	return select_kr_candidates(size) if market == "kr" else get_us_top_stocks(size)
+
+
+if __name__ == "__main__":
+	import argparse
+	from concurrent.futures import ProcessPoolExecutor
+
+	parser = argparse.ArgumentParser(description="작업 큐 기반 분산 스크리닝 (코디네이터/워커)")
+	parser.add_argument("role", choices=["coordinator", "worker", "bench"])
+	parser.add_argument("--market", default="kr", choices=["kr", "us"])
+	parser.add_argument("--universe", type=int, default=500, help="스크리닝할 종목 수")
+	parser.add_argument("--shard", type=int, default=50, help="작업 단위당 종목 수")
+	parser.add_argument("--job", default=None, help="작업 ID (같은 ID 로 재실행하면 끝난 단위 재사용)")
+	parser.add_argument("--workers", type=int, default=4, help="bench: 같은 머신에서 띄울 워커 수")
+	parser.add_argument("--idle-exit", type=float, default=None, help="worker: 일이 없으면 N초 후 종료")
+	args = parser.parse_args()
+
+	if args.role == "worker":
+		print(f"👷 워커 시작 ({QUEUE_URL or QUEUE_PATH})")
+		print(f"✅ 작업 단위 {run_worker(idle_exit=args.idle_exit)}개 처리")
+	else:
+		tickers = universe(args.market, args.universe)
+		pool = ProcessPoolExecutor(max_workers=args.workers) if args.role == "bench" else None
+		if pool:
+			for _ in range(args.workers):
+				pool.submit(run_worker, None, None, 5.0)
+		started = time.perf_counter()
+		selected = coordinate(args.market, tickers, args.job or f"{args.market}-{int(time.time())}", args.shard)
+		elapsed = time.perf_counter() - started
+		if pool:
+			pool.shutdown(wait=True)
+		print(f"⏱️ 종목 {len(tickers):,}개: {elapsed:.1f}s ({len(tickers) / elapsed:,.0f}종목/s)")
+		for ticker, df, meta in selected:
+			print(f"  {ticker}: 점수 {meta['score']:.2f}")
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# src 모듈은 평평한 구조라 `from config import ...` 처럼 바로 가져온다
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def make_daily(days: int = 300, seed: int = 0, start: str = "2024-01-01") -> pd.DataFrame:
+	"""합성 일봉 (영업일 기준, 네트워크 없음)"""
+	rng = np.random.default_rng(seed)
+	index = pd.bdate_range(start, periods=days)
+	close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+	return pd.DataFrame({
+		"Open": close * 0.995,
+		"High": close * 1.01,
+		"Low": close * 0.99,
+		"Close": close,
+		"Volume": rng.integers(100_000, 1_000_000, days).astype(np.float64),
+	}, index=index)
+
+
+@pytest.fixture
+def daily() -> pd.DataFrame:
+	return make_daily()
@@ -0,0 +1,97 @@
+import pytest
+
+from alert_rules import AlertRule, RuleEngine, load_rules, save_rules
+
+
+def fired_ids(engine, ticker, values, now):
+	return sorted(a.rule.rule_id for a in engine.update(ticker, values, now=now))
+
+
+def test_threshold_fires_only_when_crossed():
+	engine = RuleEngine()
+	engine.add_rule(AlertRule("low", "kim", "005930", "RSI", "<", 30, cooldown=0))
+	engine.add_rule(AlertRule("high", "kim", "005930", "RSI", ">", 70, cooldown=0))
+	assert fired_ids(engine, "005930", {"RSI": 50}, 0) == []
+	assert fired_ids(engine, "005930", {"RSI": 25}, 1) == ["low"]
+	# 조건이 계속 충족되는 동안에는 다시 울리지 않음 (edge trigger)
+	assert fired_ids(engine, "005930", {"RSI": 20}, 2) == []
+	assert fired_ids(engine, "005930", {"RSI": 40}, 3) == []
+	assert fired_ids(engine, "005930", {"RSI": 29}, 4) == ["low"]
+	assert fired_ids(engine, "005930", {"RSI": 75}, 5) == ["high"]
+
+
+def test_first_value_fires_if_already_past_threshold():
+	engine = RuleEngine()
+	engine.add_rule(AlertRule("low", "kim", "AAPL", "RSI", "<", 30))
+	assert fired_ids(engine, "AAPL", {"RSI": 10}, 0) == ["low"]
+
+
+def test_cooldown_suppresses_repeat():
+	engine = RuleEngine()
+	engine.add_rule(AlertRule("low", "kim", "AAPL", "RSI", "<", 30, cooldown=100))
+	assert fired_ids(engine, "AAPL", {"RSI": 20}, 0) == ["low"]
+	engine.update("AAPL", {"RSI": 40}, now=10)
+	assert fired_ids(engine, "AAPL", {"RSI": 20}, 50) == []
+	engine.update("AAPL", {"RSI": 40}, now=60)
+	assert fired_ids(engine, "AAPL", {"RSI": 20}, 150) == ["low"]
+
+
+def test_cross_rules():
+	engine = RuleEngine()
+	engine.add_rule(AlertRule("up", "kim", "AAPL", "MACD", "cross_above", ref="MACD_SIGNAL", cooldown=0))
+	engine.add_rule(AlertRule("down", "lee", "AAPL", "MACD", "cross_below", ref="MACD_SIGNAL", cooldown=0))
+	assert fired_ids(engine, "AAPL", {"MACD": -1, "MACD_SIGNAL": 0}, 0) == []
+	assert fired_ids(engine, "AAPL", {"MACD": 1, "MACD_SIGNAL": 0}, 1) == ["up"]
+	assert fired_ids(engine, "AAPL", {"MACD": 2, "MACD_SIGNAL": 0}, 2) == []
+	assert fired_ids(engine, "AAPL", {"MACD": -1, "MACD_SIGNAL": 0}, 3) == ["down"]
+
+
+def test_duplicate_condition_is_merged():
+	engine = RuleEngine()
+	first = engine.add_rule(AlertRule("a", "kim", "AAPL", "RSI", "<", 30))
+	assert engine.add_rule(AlertRule("b", "kim", "AAPL", "RSI", "<", 30)) == first
+	assert len(engine) == 1
+
+
+def test_replacing_rule_id_drops_old_condition():
+	engine = RuleEngine()
+	engine.add_rule(AlertRule("r1", "kim", "AAPL", "RSI", "<", 30, cooldown=0))
+	engine.add_rule(AlertRule("r1", "kim", "AAPL", "RSI", "<", 20, cooldown=0))
+	assert len(engine) == 1
+	engine.update("AAPL", {"RSI": 50}, now=0)
+	assert fired_ids(engine, "AAPL", {"RSI": 25}, 1) == []
+	assert fired_ids(engine, "AAPL", {"RSI": 15}, 2) == ["r1"]
+
+
+def test_remove_rule_prunes_indexes():
+	engine = RuleEngine()
+	engine.add_rule(AlertRule("t", "kim", "AAPL", "RSI", "<", 30))
+	engine.add_rule(AlertRule("x", "kim", "AAPL", "MACD", "cross_above", ref="MACD_SIGNAL"))
+	engine.update("AAPL", {"RSI": 50, "MACD": 1, "MACD_SIGNAL": 0}, now=0)
+	engine.remove_rule("t")
+	engine.remove_rule("x")
+	engine.remove_rule("missing")
+	assert len(engine) == 0
+	assert not (engine._below or engine._cross or engine._cross_pairs or engine._fields)
+	assert not (engine._last or engine._last_diff)
+	assert engine.update("AAPL", {"RSI": 10}, now=1) == []
+
+
+def test_rejects_invalid_rules():
+	engine = RuleEngine()
+	with pytest.raises(ValueError):
+		engine.add_rule(AlertRule("a", "kim", "AAPL", "RSI", "=", 30))
+	with pytest.raises(ValueError):
+		engine.add_rule(AlertRule("b", "kim", "AAPL", "MACD", "cross_above"))
+
+
+def test_save_and_load_round_trip(tmp_path):
+	engine = RuleEngine()
+	engine.add_rule(AlertRule("t", "kim", "AAPL", "RSI", "<", 30))
+	engine.add_rule(AlertRule("x", "lee", "005930", "MACD", "cross_above", ref="MACD_SIGNAL"))
+	path = str(tmp_path / "rules.json")
+	save_rules(engine, path)
+	loaded = load_rules(path)
+	# 교차 규칙의 threshold 는 NaN 이라 signature 로 비교
+	assert {k: r.signature() for k, r in loaded.rules.items()} == {k: r.signature() for k, r in engine.rules.items()}
+	assert len(load_rules(str(tmp_path / "missing.json"))) == 0
@@ -0,0 +1,76 @@
+import asyncio
+import os
+
+import asgi_app
+from asgi_app import FileCache, ReportApp, _safe_join
+
+
+def _request(app, path, headers=None, method="GET"):
+	scope = {"type": "http", "method": method, "path": path, "headers": headers or []}
+	sent = []
+
+	async def receive():
+		return {"type": "http.request", "body": b"", "more_body": False}
+
+	async def send(message):
+		sent.append(message)
+
+	asyncio.run(app(scope, receive, send))
+	start = sent[0]
+	return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def test_file_cache_reloads_on_mtime_change(tmp_path):
+	path = tmp_path / "a.html"
+	path.write_text("one")
+	cache = FileCache()
+	body, etag = asyncio.run(cache.get(str(path)))
+	assert body == b"one"
+	path.write_text("two")
+	os.utime(path, (1, 1))
+	body2, etag2 = asyncio.run(cache.get(str(path)))
+	assert body2 == b"two" and etag2 != etag
+	assert cache.size == 3
+	assert asyncio.run(cache.get(str(tmp_path / "missing.html"))) is None
+
+
+def test_file_cache_evicts_least_recently_used(tmp_path):
+	cache = FileCache(max_bytes=10)
+	for name in ("a", "b", "c"):
+		(tmp_path / name).write_bytes(b"x" * 4)
+		asyncio.run(cache.get(str(tmp_path / name)))
+	assert cache.size <= 10
+	assert str(tmp_path / "a") not in cache._entries
+	assert str(tmp_path / "c") in cache._entries
+
+
+def test_safe_join_rejects_traversal(tmp_path):
+	root = str(tmp_path)
+	assert _safe_join(root, "report_20240101.html") == os.path.join(root, "report_20240101.html")
+	assert _safe_join(root, "../secret.html") is None
+	assert _safe_join(root, "") is None
+
+
+def test_report_app_serves_rendered_file_with_etag(tmp_path, monkeypatch):
+	monkeypatch.setattr(asgi_app, "REPORTS_DIR", str(tmp_path))
+	(tmp_path / "report_20240101.html").write_text("<pre>hi</pre>", encoding="utf-8")
+	app = ReportApp()
+
+	status, headers, body = _request(app, "/reports/report_20240101.txt")
+	assert status == 200 and body == b"<pre>hi</pre>"
+	assert headers[b"content-type"].startswith(b"text/html")
+	etag = headers[b"etag"]
+
+	status, _, body = _request(app, "/reports/report_20240101.txt", headers=[(b"if-none-match", etag)])
+	assert status == 304 and body == b""
+
+	status, _, body = _request(app, "/reports/report_20240101.html", method="HEAD")
+	assert status == 200 and body == b""
+	assert app.in_flight == 0 and app.served == 3
+
+
+def test_report_app_rejects_when_saturated():
+	app = ReportApp(max_concurrency=1)
+	app.in_flight = 1
+	status, headers, _ = _request(app, "/healthz")
+	assert status == 503 and headers[b"retry-after"] == b"1"
@@ -0,0 +1,25 @@
+from batch_report import render_reports, subscriber_ids
+from config import Subscriber
+
+
+def item(ticker: str, name: str):
+	return {"ticker": ticker, "name": name, "reason": "-", "entry": "-", "exit": "-",
+	        "close": 70000.0, "low_52w": 50000.0, "high_52w": 90000.0}
+
+
+def test_subscriber_ids_are_unique_and_path_safe():
+	subs = [Subscriber("김 철수"), Subscriber("김 철수"), Subscriber("../etc"), Subscriber("x", id="team/a"),
+	        Subscriber("???")]
+	ids = subscriber_ids(subs)
+	assert ids == ["김_철수", "김_철수-2", "etc", "team_a", "subscriber"]
+	assert all("/" not in i and "." not in i for i in ids)
+
+
+def test_render_reports_per_subscriber_from_one_computation():
+	data = {"kr_items": [item("005930", "삼성전자")], "us_items": [item("AAPL", "Apple")], "news_summary": "요약"}
+	watch = {"000660": item("000660", "SK하이닉스")}
+	subs = [Subscriber("kim", ["000660"], "kr"), Subscriber("kim", [], "us")]
+	reports = render_reports(subs, data, watch)
+	assert list(reports) == ["kim", "kim-2"]
+	assert "삼성전자" in reports["kim"] and "SK하이닉스" in reports["kim"] and "Apple" not in reports["kim"]
+	assert "Apple" in reports["kim-2"] and "삼성전자" not in reports["kim-2"]
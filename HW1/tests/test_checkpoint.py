@@ -0,0 +1,63 @@
+import os
+import threading
+import time
+
+from checkpoint import Checkpoint, cleanup, resume_or_start
+from pipeline import Pipeline, Stage
+
+
+def test_resume_skips_completed_stages(tmp_path):
+	directory = str(tmp_path)
+	calls = []
+
+	def fetch():
+		calls.append("fetch")
+		return [1, 2, 3]
+
+	def report(data):
+		calls.append("report")
+		if len(calls) == 2:
+			raise RuntimeError("전송 실패")
+		return sum(data)
+
+	stages = [Stage("fetch", fetch), Stage("report", report, ("fetch",))]
+	cp = resume_or_start("run1", directory)
+	result = Pipeline(stages).run(cp.load(), on_complete=cp.save)
+	assert "report" in result.errors and cp.completed() == ["fetch"]
+
+	cp = resume_or_start(directory=directory)  # 최근 미완료 실행을 이어서
+	assert cp.run_id == "run1"
+	result = Pipeline(stages).run(cp.load(), on_complete=cp.save)
+	assert result.outputs["report"] == 6
+	assert calls == ["fetch", "report", "report"]
+	cp.finish()
+	assert not os.path.exists(cp.path)
+
+
+def test_unpicklable_outputs_are_skipped(tmp_path):
+	cp = Checkpoint("run", str(tmp_path))
+	cp.save("lock", threading.Lock())
+	cp.save("value", {"a": 1})
+	assert cp.completed() == ["value"]
+	assert cp.load() == {"value": {"a": 1}}
+
+
+def test_old_runs_are_cleaned_and_not_resumed(tmp_path):
+	directory = str(tmp_path)
+	old = Checkpoint("old", directory)
+	past = time.time() - 7200
+	os.utime(old.path, (past, past))
+	assert resume_or_start(directory=directory, window=3600).run_id != "old"
+	os.utime(old.path, (0, 0))
+	assert cleanup(directory) == 1
+	assert not os.path.exists(old.path)
+
+
+def test_on_complete_skips_failed_and_uncheckpointed_stages():
+	seen = []
+	Pipeline([
+		Stage("a", lambda: 1),
+		Stage("b", lambda a: a, ("a",), checkpoint=False),
+		Stage("c", lambda: 1 / 0, optional=True),
+	]).run(on_complete=lambda name, value: seen.append(name))
+	assert seen == ["a"]
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from conftest import make_daily
+from correlation import RollingCorrelation, greedy_decorrelated, return_matrix
+from screener import screen_tickers
+
+
+def sample_returns(n: int = 12, days: int = 80, seed: int = 0) -> np.ndarray:
+	rng = np.random.default_rng(seed)
+	factor = rng.normal(0, 0.01, days)
+	return factor * rng.uniform(0, 1, (n, 1)) + rng.normal(0, 0.01, (n, days))
+
+
+def test_matrix_matches_corrcoef():
+	rets = sample_returns()
+	tickers = [f"T{i}" for i in range(len(rets))]
+	rc = RollingCorrelation.from_returns(tickers, rets, block_rows=5)
+	np.testing.assert_allclose(rc.matrix(np.float64), np.corrcoef(rets), atol=1e-9)
+
+
+def test_push_slides_window():
+	rets = sample_returns(days=100)
+	tickers = [f"T{i}" for i in range(len(rets))]
+	rc = RollingCorrelation.from_returns(tickers, rets[:, :60], block_rows=4)
+	rc.push(rets[:, 60])
+	rc.push(rets[:, 61:100])
+	assert len(rc) == 60
+	np.testing.assert_allclose(rc.matrix(np.float64), np.corrcoef(rets[:, -60:]), atol=1e-8)
+
+
+def test_constant_series_has_zero_correlation():
+	rets = sample_returns(n=3)
+	rets[1] = 0.0
+	rc = RollingCorrelation.from_returns(["A", "B", "C"], rets)
+	assert np.all(rc.rows([1])[0] == 0)
+
+
+def test_greedy_skips_correlated_and_backfills():
+	rng = np.random.default_rng(1)
+	base = rng.normal(0, 0.01, 60)
+	rets = np.vstack([base, base + rng.normal(0, 1e-4, 60), rng.normal(0, 0.01, 60), rng.normal(0, 0.01, 60)])
+	rc = RollingCorrelation.from_returns(["A", "A2", "B", "C"], rets)
+	assert greedy_decorrelated(["A", "A2", "B", "C"], rc, k=3) == ["A", "B", "C"]
+	# 조건을 만족하는 종목이 부족하면 점수 순으로 채움
+	assert greedy_decorrelated(["A", "A2"], rc, k=2) == ["A", "A2"]
+
+
+def test_return_matrix_aligns_dates():
+	a = make_daily(50, seed=1)
+	b = make_daily(50, seed=2).drop(make_daily(50).index[[10, 20]])
+	rets = return_matrix({"A": a, "B": b}, ["A", "B"], window=30)
+	assert rets.shape == (2, 30)
+	np.testing.assert_allclose(rets[0], np.diff(np.log(a["Close"].to_numpy()))[-30:])
+	assert np.isfinite(rets).all()
+
+
+def test_decorrelated_pick_skips_near_duplicates():
+	frames = {f"T{i:02d}": make_daily(150, seed=i) for i in range(6)}
+	best = screen_tickers(frames, top_k=1)[0][0]
+	twin = frames[best].copy()
+	twin["Close"] *= 1 + np.random.default_rng(9).normal(0, 1e-4, len(twin))
+	frames["TWIN"] = twin
+	plain = [t for t, _, _ in screen_tickers(frames, top_k=3)]
+	spread = [t for t, _, _ in screen_tickers(frames, top_k=3, max_corr=0.7)]
+	assert {best, "TWIN"} <= set(plain)
+	assert not {best, "TWIN"} <= set(spread)
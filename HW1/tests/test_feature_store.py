@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import feature_store
+from conftest import make_daily
+from feature_store import export_features, from_ipc, latest_table, load_features, snapshots
+
+
+def test_export_then_partial_read(tmp_path):
+	root = str(tmp_path)
+	frames = {"A": make_daily(30, seed=1), "B": make_daily(30, seed=2)}
+	path = export_features("kr", frames, selected=["B"], root=root)
+	day = f"{frames['A'].index[-1]:%Y-%m-%d}"
+	assert path == os.path.join(root, "market=kr", f"snapshot={day}", "part-0.parquet")
+	assert snapshots("kr", root) == [day]
+
+	df = load_features("kr", columns=["Close"], start=frames["A"].index[-5], tickers=["B"], root=root)
+	assert list(df.columns) == ["ticker", "Date", "Close"]
+	assert len(df) == 5 and set(df["ticker"]) == {"B"}
+	assert df["Close"].tolist() == pytest.approx(frames["B"]["Close"].tail(5).tolist())
+
+	full = load_features("kr", root=root)
+	assert len(full) == 60
+	assert full.loc[full["ticker"] == "B", "selected"].all()
+	assert latest_table("kr").num_rows == 60
+	assert from_ipc(os.path.join(root, "kr_latest.arrows")).num_rows == 60
+
+
+def test_snapshots_hold_one_export_each_and_are_pruned(tmp_path):
+	root = str(tmp_path)
+	for days in (20, 21, 22):
+		export_features("kr", {"A": make_daily(days)}, root=root)
+	assert len(snapshots("kr", root)) == 3
+	feature_store._prune("kr", root, keep=2)
+	kept = snapshots("kr", root)
+	assert len(kept) == 2
+	# 기본은 가장 최근 스냅샷 하나만 읽으므로 행이 중복되지 않음
+	assert len(load_features("kr", root=root)) == 22
+	assert len(load_features("kr", snapshot=kept[0], root=root)) == 21
+
+
+def test_legacy_date_partitions_are_renamed(tmp_path):
+	root = str(tmp_path)
+	os.makedirs(os.path.join(root, "market=kr", "date=2024-01-05"))
+	export_features("kr", {"A": make_daily(10)}, root=root)
+	names = os.listdir(os.path.join(root, "market=kr"))
+	assert not [n for n in names if n.startswith("date=")]
+	assert "2024-01-05" in snapshots("kr", root)
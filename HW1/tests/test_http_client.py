@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import http_client
+
+
+class Handler(BaseHTTPRequestHandler):
+	hits = 0
+
+	def do_GET(self):
+		Handler.hits += 1
+		self._reply({"path": self.path})
+
+	def do_POST(self):
+		Handler.hits += 1
+		self._reply({"access_token": "secret"} if self.path == "/token" else {"ok": True})
+
+	def _reply(self, payload):
+		body = json.dumps(payload).encode()
+		self.send_response(200)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Cache-Control", "max-age=60")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *args):
+		pass
+
+
+@pytest.fixture
+def server():
+	httpd = HTTPServer(("127.0.0.1", 0), Handler)
+	thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+	thread.start()
+	Handler.hits = 0
+	yield f"http://127.0.0.1:{httpd.server_address[1]}"
+	httpd.shutdown()
+	httpd.server_close()
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+	monkeypatch.setattr(http_client, "CACHE_DIR", str(tmp_path / "cache"))
+	monkeypatch.setattr(http_client, "FIXTURES_DIR", str(tmp_path / "fixtures"))
+	return tmp_path
+
+
+def test_fresh_responses_are_served_from_disk_cache(server, dirs, monkeypatch):
+	monkeypatch.setattr(http_client, "MODE", "live")
+	first = http_client.get(f"{server}/quote")
+	second = http_client.get(f"{server}/quote")
+	assert Handler.hits == 1
+	assert not getattr(first, "from_cache", False) and second.from_cache
+	assert second.json() == first.json() == {"path": "/quote"}
+
+
+def test_record_then_replay_offline(server, dirs, monkeypatch):
+	monkeypatch.setattr(http_client, "MODE", "record")
+	recorded = http_client.get(f"{server}/quote", cache=False)
+	monkeypatch.setattr(http_client, "MODE", "replay")
+	replayed = http_client.get(f"{server}/quote")
+	assert Handler.hits == 1
+	assert replayed.from_cache and replayed.json() == recorded.json()
+	assert all(name.endswith(".json") for name in os.listdir(dirs / "fixtures" / "http"))
+	with pytest.raises(http_client.ReplayMissError):
+		http_client.get(f"{server}/other")
+
+
+def test_record_with_warm_cache_still_writes_fixtures(server, dirs, monkeypatch):
+	monkeypatch.setattr(http_client, "MODE", "live")
+	http_client.get(f"{server}/quote", min_ttl=86400)  # 캐시를 미리 채움
+	monkeypatch.setattr(http_client, "MODE", "record")
+	recorded = http_client.get(f"{server}/quote", min_ttl=86400)
+	assert Handler.hits == 2 and recorded.status_code == 200
+	monkeypatch.setattr(http_client, "MODE", "replay")
+	replayed = http_client.get(f"{server}/quote", min_ttl=86400)
+	assert replayed.status_code == 200 and replayed.json() == {"path": "/quote"}
+
+
+def test_authorized_gets_bypass_disk_cache(server, dirs, monkeypatch):
+	monkeypatch.setattr(http_client, "MODE", "live")
+	http_client.get(f"{server}/me", headers={"authorization": "Bearer x"})
+	http_client.get(f"{server}/me", headers={"authorization": "Bearer x"})
+	assert Handler.hits == 2
+	assert not (dirs / "cache").exists()
+
+
+def test_secrets_are_never_recorded(server, dirs, monkeypatch):
+	monkeypatch.setattr(http_client, "MODE", "record")
+	http_client.post(f"{server}/token", data={"grant_type": "refresh_token"})
+	http_client.post(f"{server}/send", data={"client_secret": "x"})
+	http_client.post(f"{server}/send", headers={"Authorization": "Bearer x"}, data={"a": 1})
+	assert not (dirs / "fixtures" / "http").exists()
+	http_client.post(f"{server}/send", data={"a": 1})
+	assert len(os.listdir(dirs / "fixtures" / "http")) == 1
+
+	monkeypatch.setattr(http_client, "MODE", "replay")
+	with pytest.raises(http_client.ReplayMissError):
+		http_client.post("https://kauth.kakao.com/oauth/token", data={"grant_type": "refresh_token"})
+
+
+def test_is_sensitive():
+	assert http_client.is_sensitive("https://kauth.kakao.com/oauth/token")
+	assert http_client.is_sensitive("https://example.com", headers={"authorization": "Bearer x"})
+	assert http_client.is_sensitive("https://example.com", data={"refresh_token": "x"})
+	assert not http_client.is_sensitive("https://example.com", data={"q": "삼성전자"})
+
+
+def test_replayable_round_trips_frames_as_json(dirs, monkeypatch):
+	calls = []
+	index = pd.DatetimeIndex(["2025-01-02", "2025-01-03"], name="Date")
+	frame = pd.DataFrame({"Close": [1.5, np.nan], "Volume": np.array([10, 20], dtype=np.int64)}, index=index)
+
+	@http_client.replayable("prices")
+	def fetch(ticker, days=2):
+		calls.append(ticker)
+		return frame
+
+	monkeypatch.setattr(http_client, "MODE", "record")
+	fetch("005930", days=2)
+	monkeypatch.setattr(http_client, "MODE", "replay")
+	replayed = fetch("005930", days=2)
+	assert calls == ["005930"]
+	pd.testing.assert_frame_equal(replayed, frame)
+	stored = os.listdir(dirs / "fixtures" / "calls" / "prices")
+	with open(dirs / "fixtures" / "calls" / "prices" / stored[0], encoding="utf-8") as f:
+		assert "__frame__" in json.load(f)["value"]
@@ -0,0 +1,50 @@
+import screener
+from conftest import make_daily
+from indicator_cache import IndicatorCache, make_key
+from ranker import RuleRanker
+from screener import ScoreParams, screen_tickers
+
+
+def test_key_changes_with_new_bar_or_params():
+	df = make_daily(100)
+	key = make_key("A", df, {"rsi": 14})
+	assert make_key("A", df.copy(), {"rsi": 14}) == key
+	assert make_key("A", df.iloc[:-1], {"rsi": 14}) != key
+	assert make_key("A", df, {"rsi": 10}) != key
+	assert make_key("B", df, {"rsi": 14}) != key
+	changed = df.copy()
+	changed.iloc[-1, changed.columns.get_loc("Close")] += 1
+	assert make_key("A", changed, {"rsi": 14}) != key
+
+
+def test_lru_eviction_and_disk_tier(tmp_path):
+	cache = IndicatorCache(max_entries=2, disk_dir=str(tmp_path))
+	for k in "abc":
+		cache.put(k, k.upper())
+	assert list(cache._mem) == ["b", "c"]
+	cold = IndicatorCache(max_entries=2, disk_dir=str(tmp_path))
+	assert cold.get("a") == "A"  # 디스크에서 읽어 메모리로
+	assert cold.get("missing") is None
+	assert (cold.hits, cold.misses) == (1, 1)
+
+
+def test_repeat_screen_hits_indicator_cache(monkeypatch):
+	frames = {f"T{i:02d}": make_daily(150, seed=i) for i in range(3)}
+	calls = []
+	original = screener._screen_one
+	monkeypatch.setattr(screener, "_screen_one", lambda df: calls.append(1) or original(df))
+	screener.indicator_cache.clear()
+	first = screen_tickers(frames, top_k=3, ranker=RuleRanker())
+	second = screen_tickers(frames, top_k=3, ranker=RuleRanker())
+	assert len(calls) == 3
+	assert [m["score"] for _, _, m in first] == [m["score"] for _, _, m in second]
+
+
+def test_score_params_are_part_of_the_key(monkeypatch):
+	frames = {"A": make_daily(150)}
+	screener.indicator_cache.clear()
+	before = screen_tickers(frames, top_k=1, ranker=RuleRanker())[0][2]["score"]
+	monkeypatch.setattr(screener, "SCORE_PARAMS", ScoreParams(w_trend_short=10.0, w_trend_long=10.0, w_rsi=10.0,
+	                                                           w_oversold=10.0, w_macd=10.0, w_volume=10.0))
+	after = screen_tickers(frames, top_k=1, ranker=RuleRanker())[0][2]["score"]
+	assert after != before
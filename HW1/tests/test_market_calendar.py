@@ -0,0 +1,43 @@
+import datetime as dt
+
+import pytz
+
+from market_calendar import KRX, NYSE, TradingCalendar
+
+KST = pytz.timezone("Asia/Seoul")
+ET = pytz.timezone("America/New_York")
+
+
+def test_krx_holidays_and_year_end_closure():
+	assert not KRX.is_session(dt.date(2023, 1, 23))  # 설 연휴
+	assert not KRX.is_session(dt.date(2025, 10, 6))  # 추석
+	assert not KRX.is_session(dt.date(2024, 12, 31))  # 연말 휴장
+	assert KRX.is_session(dt.date(2024, 12, 30))
+	assert KRX.next_session(dt.date(2025, 1, 25)) == dt.date(2025, 1, 31)
+	assert KRX.previous_session(dt.date(2025, 1, 31), inclusive=False) == dt.date(2025, 1, 24)
+
+
+def test_nyse_rule_based_holidays_and_early_close():
+	assert not NYSE.is_session(dt.date(2025, 4, 18))  # Good Friday
+	assert not NYSE.is_session(dt.date(2025, 11, 27))  # Thanksgiving
+	assert not NYSE.is_session(dt.date(2022, 6, 20))  # Juneteenth (observed)
+	assert NYSE.session_close(dt.date(2025, 11, 28)).hour == 13
+
+
+def test_cache_expires_at_next_data_ready_time():
+	# 금요일 장 마감 후 → 다음 월요일 마감 + 지연까지 유지
+	now = KST.localize(dt.datetime(2025, 3, 7, 18, 0))
+	assert KRX.cache_expiry(now, dt.timedelta(minutes=10)) == KST.localize(dt.datetime(2025, 3, 10, 16, 0))
+	# 장중에는 짧은 TTL
+	now = ET.localize(dt.datetime(2025, 3, 7, 11, 0))
+	assert NYSE.is_open(now)
+	assert NYSE.cache_expiry(now, dt.timedelta(minutes=10)) == now + dt.timedelta(minutes=10)
+
+
+def test_warns_once_outside_holiday_table(capsys):
+	cal = TradingCalendar("TEST", "Asia/Seoul", dt.time(9), dt.time(15, 30), dt.timedelta(0),
+	                      frozenset(), years=range(2024, 2026))
+	assert cal.is_session(dt.date(2030, 1, 2))
+	cal.is_session(dt.date(2030, 1, 3))
+	cal.is_session(dt.date(2025, 1, 2))
+	assert capsys.readouterr().out.count("2030") == 1
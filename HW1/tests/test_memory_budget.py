@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+import pytest
+
+import memory_budget
+from conftest import make_daily
+from memory_budget import MB, SAMPLE_INTERVAL, MemoryBudget, MemoryBudgetExceeded, current_rss
+from ranker import RuleRanker
+from screener import screen_chunked, screen_tickers
+
+
+def test_stage_peak_includes_transient_allocations():
+	budget = MemoryBudget(profile=False, budget_mb=1e6)
+
+	def spike():
+		block = np.ones(200 * MB // 8)  # 단계 안에서만 잡았다 놓는 메모리
+		time.sleep(SAMPLE_INTERVAL * 10)  # 감시 스레드가 샘플링할 시간
+		del block
+
+	budget.run_stage("spike", spike)
+	record = budget.stages[-1]
+	assert record.name == "spike"
+	# 단계 전후 RSS 로는 보이지 않는 일시적 사용량이 최대 RSS 에 잡힘
+	assert record.peak_rss - max(record.rss_before, record.rss_after) > 150 * MB
+	assert "spike" in budget.report()
+
+
+def test_budget_trips_inside_stage_loop(monkeypatch):
+	budget = MemoryBudget(budget_mb=current_rss() / MB + 10_000)
+	checked = []
+
+	def work():
+		for i in range(3):
+			checked.append(i)
+			if i == 1:
+				monkeypatch.setattr(memory_budget, "current_rss", lambda: 10**13)
+			budget.check(f"청크 {i}")
+
+	with pytest.raises(MemoryBudgetExceeded):
+		budget.run_stage("screen", work)
+	assert checked == [0, 1]
+	# 이후 단계는 시작하지 않음
+	with pytest.raises(MemoryBudgetExceeded):
+		budget.run_stage("next", lambda: None)
+
+
+def test_stage_error_is_not_masked_by_budget(monkeypatch):
+	budget = MemoryBudget(budget_mb=current_rss() / MB + 10_000)
+
+	def work():
+		monkeypatch.setattr(memory_budget, "current_rss", lambda: 10**13)
+		raise ValueError("단계 자체의 오류")
+
+	with pytest.raises(ValueError, match="단계 자체"):
+		budget.run_stage("news", work)
+	assert budget.stages[-1].name == "news"  # 실패한 단계도 측정은 남김
+
+
+def test_chunk_size_only_when_over_budget():
+	assert MemoryBudget().chunk_size(10_000) is None
+	budget = MemoryBudget(budget_mb=(current_rss() / MB + 100) / 0.7)  # 여유분 약 100MB (safety=0.7)
+	assert budget.chunk_size(10, bytes_per_item=MB) is None
+	size = budget.chunk_size(10_000, bytes_per_item=MB)
+	assert 1 <= size <= 150
+
+
+def test_disabled_budget_does_not_wrap():
+	func = lambda: 1  # noqa: E731
+	assert MemoryBudget().wrap("x", func) is func
+
+
+def test_chunked_screening_matches_single_pass():
+	frames = {f"T{i:02d}": make_daily(150, seed=i) for i in range(12)}
+	expected = screen_tickers(frames, top_k=3, ranker=RuleRanker(), use_cache=False)
+	checks = []
+	got = screen_chunked(frames.__getitem__, list(frames), chunk_size=5, top_k=3, ranker=RuleRanker(),
+	                     check=checks.append)
+	assert [t for t, _, _ in got] == [t for t, _, _ in expected]
+	assert len(checks) == 6  # 청크 3개 × (조회, 채점)
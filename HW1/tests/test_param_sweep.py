@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_daily
+from param_sweep import compute_features, evaluate, forward_returns, iter_score_params
+from screener import INDICATOR_PARAMS, SCORE_PARAMS, ScoreParams, enrich_indicators, score_row
+
+WINDOWS = {k: INDICATOR_PARAMS[k] for k in ("sma", "rsi", "macd")}
+
+
+@pytest.fixture(scope="module")
+def universe():
+	frames = {f"T{i}": make_daily(220, seed=i) for i in range(8)}
+	index = next(iter(frames.values())).index
+	close = np.column_stack([df["Close"].to_numpy() for df in frames.values()])
+	volume = np.column_stack([df["Volume"].to_numpy() for df in frames.values()])
+	return frames, index, close, volume
+
+
+def scalar_scores(frames, rows, params: ScoreParams) -> np.ndarray:
+	"""screen_tickers 가 쓰는 score_row 를 날짜마다 그대로 적용"""
+	out = np.empty((len(rows), len(frames)))
+	for j, df in enumerate(frames.values()):
+		enriched = enrich_indicators(df)
+		window = INDICATOR_PARAMS["vol_avg"]
+		enriched["VOL_AVG20"] = df["Volume"].rolling(window, min_periods=window).mean()
+		for i, r in enumerate(rows):
+			out[i, j] = score_row(enriched.iloc[r], params)
+	return out
+
+
+def test_vectorized_features_reproduce_score_row(universe):
+	frames, index, close, volume = universe
+	rows = np.arange(100, 200, 7)
+	feats = compute_features(close, volume, WINDOWS, index)
+	p = SCORE_PARAMS
+	rsi = feats["rsi"][rows]
+	in_band = (rsi >= p.rsi_low) & (rsi <= p.rsi_high)
+	vector = (p.w_trend_short * feats["trend_short"][rows] + p.w_trend_long * feats["trend_long"][rows]
+	          + p.w_rsi * in_band + p.w_oversold * (~in_band & (rsi < p.rsi_oversold))
+	          + p.w_macd * feats["macd_up"][rows] + p.w_volume * (feats["vol_ratio"][rows] >= p.vol_ratio)
+	          + p.w_weekly_trend * feats["weekly_trend"][rows] + p.w_monthly_trend * feats["monthly_trend"][rows])
+	np.testing.assert_allclose(vector, scalar_scores(frames, rows, p))
+
+
+def test_evaluate_matches_top_k_by_score_row(universe):
+	frames, index, close, volume = universe
+	rows = np.arange(100, 200, 7)
+	horizon, top_k = 5, 3
+	feats = {k: v[rows] for k, v in compute_features(close, volume, WINDOWS, index).items()}
+	fwd = forward_returns(close, horizon)[rows]
+	valid = ~np.isnan(fwd)
+	params = [SCORE_PARAMS, ScoreParams(w_trend_short=0, w_trend_long=0, w_rsi=0, w_oversold=0, w_volume=0,
+	                                    w_weekly_trend=0, w_monthly_trend=0)]
+	stats = evaluate(feats, fwd, valid, params, top_k)
+
+	for p, (mean_return, hit_rate, samples) in zip(params, stats):
+		scores = scalar_scores(frames, rows, p)
+		# 동점은 거래량 비율 순 (evaluate 와 같은 기준)
+		picked = []
+		for i in range(len(rows)):
+			keys = sorted(range(scores.shape[1]), key=lambda j: (scores[i, j], np.nan_to_num(feats["vol_ratio"][i, j])),
+			              reverse=True)
+			picked.extend(fwd[i, j] for j in keys[:top_k])
+		assert samples == len(picked)
+		assert mean_return == pytest.approx(np.mean(picked))
+		assert hit_rate == pytest.approx(np.mean(np.array(picked) > 0))
+
+
+def test_grid_expands_rsi_band():
+	params = list(iter_score_params({"rsi_band": [(40.0, 65.0), (30.0, 60.0)], "w_macd": [0.0, 1.0]}))
+	assert len(params) == 4
+	assert {(p.rsi_low, p.rsi_high) for p in params} == {(40.0, 65.0), (30.0, 60.0)}
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import Pipeline, Stage
+
+
+def boom(*_):
+	raise RuntimeError("boom")
+
+
+def test_outputs_flow_through_inputs():
+	result = Pipeline([
+		Stage("a", lambda: 2),
+		Stage("b", lambda a: a * 10, ("a",)),
+		Stage("c", lambda a, b: a + b, ("a", "b")),
+	]).run()
+	assert result.outputs == {"a": 2, "b": 20, "c": 22}
+	assert not result.errors and not result.skipped
+
+
+def test_optional_failure_uses_default_and_continues():
+	result = Pipeline([
+		Stage("news", boom, optional=True, default="없음"),
+		Stage("report", lambda news: f"뉴스: {news}", ("news",)),
+	]).run()
+	assert result.outputs["report"] == "뉴스: 없음"
+	assert "news" in result.errors and not result.ok("news")
+	assert result.ok("report")
+
+
+def test_required_failure_skips_downstream_only():
+	result = Pipeline([
+		Stage("kr", boom),
+		Stage("kr_report", lambda kr: kr, ("kr",)),
+		Stage("kr_publish", lambda r: r, ("kr_report",)),
+		Stage("us", lambda: "us"),
+		Stage("us_report", lambda us: us.upper(), ("us",)),
+	]).run()
+	assert set(result.skipped) == {"kr_report", "kr_publish"}
+	assert "kr" in result.errors
+	assert result.outputs["us_report"] == "US"
+
+
+def test_initial_outputs_are_not_recomputed():
+	calls = []
+	result = Pipeline([
+		Stage("a", lambda: calls.append("a") or 1),
+		Stage("b", lambda a: a + 1, ("a",)),
+	]).run(initial={"a": 41})
+	assert calls == []
+	assert result.outputs["b"] == 42
+
+
+def test_independent_branches_run_concurrently():
+	barrier = threading.Barrier(2, timeout=5)
+
+	def branch():
+		barrier.wait()  # 두 분기가 동시에 실행되지 않으면 시간 초과
+		return True
+
+	started = time.perf_counter()
+	result = Pipeline([Stage("kr", branch), Stage("us", branch)]).run(max_workers=2)
+	assert result.outputs == {"kr": True, "us": True}
+	assert time.perf_counter() - started < 5
+
+
+def test_rejects_cycles_duplicates_and_unknown_inputs():
+	with pytest.raises(ValueError):
+		Pipeline([Stage("a", lambda b: b, ("b",)), Stage("b", lambda a: a, ("a",))])
+	with pytest.raises(ValueError):
+		Pipeline([Stage("a", lambda: 1), Stage("a", lambda: 2)])
+	with pytest.raises(ValueError):
+		Pipeline([Stage("a", lambda x: x, ("missing",))]).run()
@@ -0,0 +1,112 @@
+import datetime as dt
+import os
+
+import pandas as pd
+import pytest
+
+import data_fetchers
+import point_in_time
+import price_panel
+from config import AppConfig
+from conftest import make_daily
+from point_in_time import build_history, data_dates, is_report_day, replay, report_as_of
+from price_panel import PricePanel, history_path, open_panel, write_panel
+from reco_history import RecoHistory
+
+KR = [f"{i:05d}0" for i in range(1, 9)]
+US = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+
+
+def kr_daily(seed: int) -> pd.DataFrame:
+	df = make_daily(300, seed=seed)
+	df[["Open", "High", "Low", "Close"]] *= 1000  # 1단계 필터의 최소 거래대금 (10억) 을 넘도록
+	return df
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+	"""합성 히스토리 패널 (2024-01 ~ 2025-02) + 임시 추천 이력, 네트워크 호출은 실패하게"""
+	monkeypatch.setattr(price_panel, "DATA_DIR", str(tmp_path))
+	monkeypatch.setattr(data_fetchers, "fdr", None)
+	monkeypatch.setattr(data_fetchers, "yf", None)
+	monkeypatch.setattr(point_in_time, "reco_history", RecoHistory(str(tmp_path / "reco.sqlite")))
+	kr = {t: kr_daily(i) for i, t in enumerate(KR)}
+	us = {t: make_daily(300, seed=100 + i) for i, t in enumerate(US)}
+	write_panel(history_path("kr"), kr, names={t: f"KR{t}" for t in KR})
+	write_panel(history_path("us"), us, names={t: f"US {t}" for t in US})
+	return {"kr": kr, "us": us}
+
+
+def config() -> AppConfig:
+	return AppConfig("kim", [], [], None, "", "http://localhost", None, None, "", kr_funnel_size=5)
+
+
+def test_data_dates_are_previous_sessions():
+	# 2024-12-26(목) 08:30 리포트: KRX 는 성탄절 휴장이라 24일, NYSE 도 25일 휴장이라 24일
+	assert data_dates(dt.date(2024, 12, 26)) == (dt.date(2024, 12, 24), dt.date(2024, 12, 24))
+	# 월요일 리포트는 직전 금요일 데이터
+	assert data_dates(dt.date(2024, 3, 11)) == (dt.date(2024, 3, 8), dt.date(2024, 3, 8))
+
+
+def test_is_report_day_follows_either_market():
+	assert is_report_day(dt.date(2024, 3, 11))  # 월: KRX 개장
+	assert is_report_day(dt.date(2024, 3, 9))  # 토: 전날(금) NYSE 개장
+	assert not is_report_day(dt.date(2024, 3, 10))  # 일: 둘 다 휴장
+
+
+def test_as_of_hides_later_bars(tmp_path):
+	a = make_daily(40)
+	panel = PricePanel(write_panel(str(tmp_path / "kr.panel"), {"A": a}, names={"A": "에이"}))
+	assert panel.names == {"A": "에이"}
+	cut = a.index[19]
+	view = panel.as_of(cut)
+	assert view["A"].index[-1] == cut and len(view["A"]) == 20
+	assert len(panel["A"]) == 40
+
+
+def test_report_as_of_uses_only_bars_up_to_the_data_date(history):
+	report = report_as_of(dt.date(2024, 12, 26), config(), record=True)
+	cut = pd.Timestamp("2024-12-24")  # 25일은 두 시장 모두 휴장 (합성 데이터에는 봉이 있어도 쓰지 않음)
+	assert report.created_at.date() == dt.date(2024, 12, 26) and report.created_at.hour == 8
+	assert 1 <= len(report.kr_items) <= 3 and 1 <= len(report.us_items) <= 3
+	for market, items in (("kr", report.kr_items), ("us", report.us_items)):
+		for it in items:
+			assert it["name"] == open_panel(history_path(market)).names[it["ticker"]]
+			assert it["close"] == pytest.approx(history[market][it["ticker"]].loc[cut, "Close"], rel=1e-6)
+	rows = point_in_time.reco_history.query(source="replay")
+	assert {r["ticker"] for r in rows} == {it["ticker"] for it in report.kr_items + report.us_items}
+	assert {r["trade_date"] for r in rows} == {"2024-12-24"}
+
+
+def test_report_as_of_without_history(tmp_path, monkeypatch):
+	monkeypatch.setattr(price_panel, "DATA_DIR", str(tmp_path))
+	assert report_as_of(dt.date(2024, 12, 26), config()) is None
+
+
+def test_replay_covers_report_days_only(history, tmp_path, monkeypatch):
+	monkeypatch.setattr(AppConfig, "load", staticmethod(config))
+	out_dir = str(tmp_path / "replay")
+	start, end = dt.date(2024, 12, 23), dt.date(2024, 12, 29)
+	results = replay(start, end, workers=2, out_dir=out_dir)
+	days = [start + dt.timedelta(days=i) for i in range(7)]
+	assert sorted(results) == [d for d in days if is_report_day(d)]
+	assert dt.date(2024, 12, 29) not in results  # 일요일: 두 시장 모두 전날 휴장
+	assert all(results.values())
+	for day in results:
+		assert os.path.exists(os.path.join(out_dir, f"{day.isoformat()}.json"))
+	assert {r["run_at"][:10] for r in point_in_time.reco_history.query(source="replay")} == {d.isoformat() for d in results}
+
+
+def test_build_history_keeps_common_stocks_by_market_cap(tmp_path, monkeypatch):
+	monkeypatch.setattr(price_panel, "DATA_DIR", str(tmp_path))
+	listing = pd.DataFrame({"Code": [5930, 5935, 660, 35420], "Name": ["삼성전자", "삼성전자우", "SK하이닉스", "NAVER"],
+	                        "Marcap": [400e12, 50e12, 100e12, 30e12]})
+	periods = []
+	monkeypatch.setattr(point_in_time, "get_krx_listing", lambda: listing)
+	monkeypatch.setattr(point_in_time, "fetch_kr_price_history",
+	                    lambda t, period_days: periods.append(period_days) or kr_daily(int(t)))
+	path = build_history("kr", universe=2, years=1, workers=2)
+	panel = open_panel(path)
+	assert list(panel) == ["005930", "000660"]  # 우선주(끝자리 5) 제외, 시가총액 상위 2개
+	assert panel.names == {"005930": "삼성전자", "000660": "SK하이닉스"}
+	assert set(periods) == {182}  # fetch_kr_price_history 는 period_days × 2 구간을 조회
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from conftest import make_daily
+from price_panel import open_panel, write_panel
+
+
+def test_round_trip_on_common_date_axis(tmp_path):
+	a = make_daily(40, seed=1)
+	b = make_daily(30, seed=2, start="2024-01-15").drop(pd.Timestamp("2024-01-17"))
+	path = write_panel(str(tmp_path / "kr.panel"), {"A": a, "B": b, "EMPTY": pd.DataFrame()})
+	panel = open_panel(path)
+	assert list(panel) == ["A", "B"] and "EMPTY" not in panel
+	assert panel.array("Close").shape == (2, len(panel.dates))
+	assert not panel.array("Close").flags.writeable
+
+	got = panel["B"]
+	assert got.index.equals(b.index)
+	np.testing.assert_allclose(got["Close"], b["Close"].astype(np.float32))
+	assert (got["Volume"].to_numpy() == b["Volume"].astype(np.int64).to_numpy()).all()
+
+
+def test_open_panel_remaps_replaced_file(tmp_path):
+	path = str(tmp_path / "kr.panel")
+	write_panel(path, {"A": make_daily(10)})
+	first = open_panel(path)
+	assert open_panel(path) is first
+	write_panel(path, {"A": make_daily(10), "B": make_daily(10, seed=3)})
+	assert list(open_panel(path)) == ["A", "B"]
+	assert open_panel(str(tmp_path / "missing.panel")) is None
@@ -0,0 +1,121 @@
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import provider_health
+from provider_health import InvalidResponse, ProviderHealth, ProviderUnavailable, call, hedged, provider
+
+_names = itertools.count()
+
+
+@pytest.fixture
+def name():
+	# 레지스트리는 프로세스 전역이라 테스트마다 새 공급자 이름 사용
+	return f"test-provider-{next(_names)}"
+
+
+def fail():
+	raise ConnectionError("down")
+
+
+def test_consecutive_failures_open_breaker(name):
+	provider(name, failure_threshold=2, reset_after=60)
+	for _ in range(2):
+		with pytest.raises(ConnectionError):
+			call(name, fail)
+	assert provider(name).state == "open"
+	with pytest.raises(ProviderUnavailable):
+		call(name, lambda: "ok")
+
+
+def test_half_open_success_closes_breaker(name):
+	health = provider(name, failure_threshold=1, reset_after=0)
+	with pytest.raises(ConnectionError):
+		call(name, fail)
+	assert health.state == "half-open"
+	assert call(name, lambda: "ok") == "ok"
+	assert health.state == "closed"
+
+
+def test_rejected_results_do_not_trip_breaker(name):
+	provider(name, failure_threshold=2)
+	for _ in range(5):
+		with pytest.raises(InvalidResponse):
+			call(name, lambda: [], accept=bool)
+	assert provider(name).state == "closed"
+	assert call(name, lambda: [1], accept=bool) == [1]
+
+
+def test_cache_hits_do_not_shrink_timeout(name):
+	health = provider(name, default_timeout=10.0, min_timeout=1.0)
+	for _ in range(10):
+		call(name, lambda: SimpleNamespace(from_cache=True))
+	assert len(health.latencies) == 0
+	assert health.timeout() == 10.0
+
+
+def test_half_open_admits_a_single_trial_call(name):
+	health = provider(name, failure_threshold=1, reset_after=0)
+	with pytest.raises(ConnectionError):
+		call(name, fail)
+	release = threading.Event()
+	trial = threading.Thread(target=call, args=(name, lambda: release.wait(5) and "ok"))
+	trial.start()
+	time.sleep(0.05)
+	assert health.state == "half-open"
+	with pytest.raises(ProviderUnavailable, match="차단"):
+		call(name, lambda: "ok")  # 시험 호출이 끝나기 전의 다른 호출은 거절
+	release.set()
+	trial.join()
+	assert health.state == "closed"
+	assert call(name, lambda: "ok") == "ok"
+
+
+def test_hung_provider_does_not_starve_others(name):
+	hung, healthy = f"{name}-hung", f"{name}-healthy"
+	provider(hung, default_timeout=0.05, failure_threshold=100, max_workers=2)
+	release = threading.Event()
+	for _ in range(2):
+		with pytest.raises(ProviderUnavailable):
+			call(hung, release.wait, 5)
+	with pytest.raises(ProviderUnavailable, match="점유"):
+		call(hung, lambda: "ok")  # 스레드가 모두 묶여 있으면 대기열에 넣지 않고 바로 거절
+	assert call(healthy, lambda: "ok") == "ok"
+	release.set()
+	for _ in range(100):
+		if not provider(hung).saturated():
+			break
+		time.sleep(0.01)
+	assert call(hung, lambda: "ok") == "ok"
+
+
+def test_adaptive_timeout_follows_latency():
+	health = ProviderHealth("x", min_timeout=1.0, max_timeout=15.0)
+	for latency in (2.0, 2.0, 2.0, 2.0, 3.0):
+		health.record_success(latency)
+	assert health.timeout() == 6.0
+
+
+def test_slow_call_times_out(name):
+	provider(name, default_timeout=0.05)
+	with pytest.raises(ProviderUnavailable):
+		call(name, time.sleep, 0.5)
+
+
+def test_hedged_prefers_fast_provider_and_skips_failures(name):
+	slow, fast, broken = f"{name}-slow", f"{name}-fast", f"{name}-broken"
+	started = time.perf_counter()
+	result = hedged([(slow, lambda: time.sleep(1) or "slow"), (fast, lambda: "fast")], hedge_after=0.05)
+	assert result == "fast"
+	assert time.perf_counter() - started < 1
+	assert hedged([(broken, fail), (fast, lambda: "fast")], hedge_after=5) == "fast"
+	with pytest.raises(ProviderUnavailable):
+		hedged([(broken, fail)], hedge_after=0.05)
+
+
+def test_snapshot_lists_providers(name):
+	provider(name)
+	assert provider_health.snapshot()[name]["state"] == "closed"
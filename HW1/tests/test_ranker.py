@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ranker import FEATURES, NumpyRanker, RuleRanker, feature_matrix, load_ranker, rank_metas, train_logistic
+
+
+def meta(close: float, rsi: float, score: float = 2.0):
+	return {"score": score, "close": close, "sma5": close, "sma20": close * 0.95, "sma60": close * 0.9, "rsi": rsi,
+	        "macd": 1.0, "macd_signal": 0.5, "bb_lower": close * 0.9, "bb_upper": close * 1.1,
+	        "vol": 2e5, "vol_avg20": 1e5, "low_52w": close * 0.5, "high_52w": close * 1.5}
+
+
+class FixedRanker:
+	name = "fixed"
+
+	def __init__(self, scores):
+		self.scores = scores
+
+	def score(self, metas):
+		return self.scores
+
+
+def test_feature_matrix_marks_missing_values_nan():
+	x = feature_matrix([meta(100, 50), {"close": 10.0}])
+	assert x.shape == (2, len(FEATURES))
+	assert np.isfinite(x[0]).all()
+	assert x[0, FEATURES.index("rsi")] == pytest.approx(0.5)
+	assert np.isnan(x[1]).all()
+
+
+def test_model_scores_replace_rule_scores():
+	metas = [meta(100, 40, score=3.0), meta(50, 60, score=1.0)]
+	rank_metas(metas, FixedRanker([0.2, 0.9]))
+	assert [m["score"] for m in metas] == [0.2, 0.9]
+	assert [m["rule_score"] for m in metas] == [3.0, 1.0]
+	assert metas[0]["ranker"] == "fixed"
+
+
+@pytest.mark.parametrize("scores", [[0.2, np.nan], [0.2, np.inf], [0.2]])
+def test_bad_model_output_keeps_rule_scores_for_whole_batch(scores):
+	metas = [meta(100, 40, score=3.0), meta(50, 60, score=1.0)]
+	rank_metas(metas, FixedRanker(scores))
+	assert [m["score"] for m in metas] == [3.0, 1.0]
+	assert all("rule_score" not in m for m in metas)
+
+
+def test_rule_ranker_is_a_no_op():
+	metas = [meta(100, 40, score=3.0)]
+	rank_metas(metas, RuleRanker())
+	assert metas[0]["score"] == 3.0 and "ranker" not in metas[0]
+
+
+def test_rescoring_starts_from_rule_scores():
+	metas = [meta(100, 40, score=3.0), meta(50, 60, score=1.0)]
+	rank_metas(metas, FixedRanker([0.2, 0.9]))
+	rank_metas(metas, FixedRanker([0.7, 0.1]))
+	assert [m["score"] for m in metas] == [0.7, 0.1]
+	assert [m["rule_score"] for m in metas] == [3.0, 1.0]
+	rank_metas(metas, RuleRanker())
+	assert [m["score"] for m in metas] == [3.0, 1.0] and all("ranker" not in m for m in metas)
+
+
+class MetaRanker:
+	"""rsi 가 낮을수록 높은 점수, nan_for 종목은 NaN"""
+	name = "meta"
+
+	def __init__(self, nan_for=()):
+		self.nan_for = set(nan_for)
+
+	def score(self, metas):
+		return np.array([np.nan if m["tag"] in self.nan_for else 1 - m["rsi"] / 100 for m in metas])
+
+
+def test_merged_pool_is_ranked_on_one_scale():
+	from screener import merge_candidates
+
+	def candidates(tags, ranker):
+		metas = [{**meta(100, rsi, score=score), "tag": tag} for tag, rsi, score in tags]
+		rank_metas(metas, ranker)
+		df = pd.DataFrame({"Close": [1.0, 1.1]})
+		return [(m["tag"], df, m) for m in metas]
+
+	# 첫 청크는 모델 점수(0~1), 둘째 청크는 NaN 때문에 규칙 점수(0~5)로 대체된 상태
+	model_chunk = candidates([("A", 20, 1.0), ("B", 40, 1.0)], MetaRanker())
+	rule_chunk = candidates([("C", 80, 5.0), ("D", 30, 0.5)], MetaRanker(nan_for={"D"}))
+	assert rule_chunk[0][2]["score"] == 5.0
+	merged = merge_candidates(model_chunk + rule_chunk, top_k=4, ranker=MetaRanker())
+	assert [t for t, _, _ in merged] == ["A", "D", "B", "C"]
+	assert all(m["ranker"] == "meta" for _, _, m in merged)
+
+	# 합친 풀에서 모델이 한 종목이라도 실패하면 풀 전체가 규칙 점수
+	merged = merge_candidates(model_chunk + rule_chunk, top_k=4, ranker=MetaRanker(nan_for={"B"}))
+	assert [t for t, _, _ in merged] == ["C", "A", "B", "D"]
+	assert [m["score"] for _, _, m in merged] == [5.0, 1.0, 1.0, 0.5]
+
+
+def test_trained_model_round_trips_through_npz(tmp_path):
+	rng = np.random.default_rng(0)
+	metas = [meta(100, rsi) for rsi in rng.uniform(10, 90, 200)]
+	x = feature_matrix(metas)
+	y = x[:, FEATURES.index("rsi")] < 0.5  # RSI 가 낮으면 양수 라벨
+	path = str(tmp_path / "ranker.npz")
+	np.savez(path, **train_logistic(x, y, hidden=4, epochs=300))
+	ranker = load_ranker(path)
+	assert isinstance(ranker, NumpyRanker)
+	scores = ranker.score([meta(100, 20), meta(100, 80)])
+	assert 0 <= scores[1] < scores[0] <= 1
+
+
+def test_missing_or_broken_model_falls_back_to_rules(tmp_path):
+	assert isinstance(load_ranker(str(tmp_path / "missing.npz")), RuleRanker)
+	broken = tmp_path / "broken.npz"
+	broken.write_bytes(b"not a model")
+	assert isinstance(load_ranker(str(broken)), RuleRanker)
@@ -0,0 +1,137 @@
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import reco_history
+from conftest import make_daily
+from price_panel import write_panel
+from reco_history import HORIZONS, RecoHistory
+
+
+@pytest.fixture
+def panels(tmp_path, monkeypatch):
+	paths = {m: str(tmp_path / f"kr_{m}.panel") for m in ("panel", "picks", "history")}
+	monkeypatch.setattr(reco_history, "panel_path", lambda market: paths["panel"])
+	monkeypatch.setattr(reco_history, "picks_path", lambda market: paths["picks"])
+	monkeypatch.setattr(reco_history, "history_path", lambda market: paths["history"])
+	return paths
+
+
+def pick(df: pd.DataFrame, ticker: str, score: float = 3.0):
+	return ticker, df, {"score": score, "close": float(df["Close"].iloc[-1]), "rsi": np.nan}
+
+
+def test_record_and_query(tmp_path):
+	history = RecoHistory(str(tmp_path / "reco.sqlite"))
+	df = make_daily(30)
+	run_at = datetime(2024, 2, 13, 8, 30)
+	assert history.record(run_at, "kr", [pick(df, "A"), pick(df, "B", 2.0)], [{"ticker": "A", "name": "에이"}]) == 2
+	# 같은 실행을 다시 기록하면 덮어씀
+	history.record(run_at, "kr", [pick(df, "A"), pick(df, "B", 2.0)], [])
+	rows = history.query(market="kr")
+	assert [(r["rank"], r["ticker"]) for r in rows] == [(1, "A"), (2, "B")]
+	assert rows[0]["meta"]["rsi"] is None
+	assert rows[0]["trade_date"] == f"{df.index[-1]:%Y-%m-%d}"
+
+
+def test_evaluate_fills_forward_returns_once(tmp_path, panels):
+	full = make_daily(60)
+	write_panel(panels["panel"], {"A": full})
+	history = RecoHistory(str(tmp_path / "reco.sqlite"))
+	at = 30
+	history.record(datetime(2024, 2, 13), "kr", [pick(full.iloc[:at + 1], "A")], [])
+	now = datetime(2024, 3, 30)
+	assert history.evaluate(now) == 1
+	row = history.query()[0]
+	close = full["Close"].to_numpy(dtype=np.float32).astype(np.float64)
+	for h in HORIZONS:
+		assert row[f"ret_{h}d"] == pytest.approx(close[at + h] / close[at] - 1, rel=1e-6)
+	assert row["eval_done"] == 1
+	assert history.evaluate(now) == 0
+
+
+def test_partial_returns_are_completed_later(tmp_path, panels):
+	full = make_daily(80)
+	at = 50
+	write_panel(panels["panel"], {"A": full.iloc[:at + 6]})
+	history = RecoHistory(str(tmp_path / "reco.sqlite"))
+	history.record(datetime(2024, 3, 12), "kr", [pick(full.iloc[:at + 1], "A")], [])
+	now = datetime(2024, 3, 20)
+	assert history.evaluate(now) == 1
+	first = history.query()[0]
+	assert first["ret_5d"] is not None and first["ret_20d"] is None and first["eval_done"] == 0
+
+	# 장기 히스토리 패널에서 나머지 기간 보충, 이미 채운 값은 유지
+	write_panel(panels["panel"], {})
+	write_panel(panels["history"], {"A": full})
+	assert history.evaluate(now) == 1
+	row = history.query()[0]
+	assert row["ret_5d"] == first["ret_5d"]
+	assert row["ret_20d"] is not None and row["eval_done"] == 1
+
+
+def test_picks_that_leave_the_daily_panel_are_kept_pending(tmp_path, panels):
+	a, b = make_daily(80, seed=1), make_daily(80, seed=2)
+	at = 50
+	history = RecoHistory(str(tmp_path / "reco.sqlite"))
+	history.record(datetime(2024, 3, 12), "kr", [pick(a.iloc[:at + 1], "A")], [])
+	# 다음 날 패널은 그날 후보(B, C)만 담음 → A 는 아직 끝난 것이 아님
+	write_panel(panels["panel"], {"B": b.iloc[:at + 2], "C": make_daily(at + 2, seed=3)})
+	now = datetime(2024, 3, 13)
+	assert history.evaluate(now) == 0
+	row = history.query()[0]
+	assert row["eval_done"] == 0 and row["ret_1d"] is None
+	assert history.pending_tickers("kr", now) == ["A"]
+
+	# 패널에 없는 대기 종목만 따로 받아 picks 패널에 저장 → 이후 평가에서 채움
+	fetched = []
+	assert history.update_prices("kr", lambda t: fetched.append(t) or a, now) == panels["picks"]
+	assert fetched == ["A"]
+	assert history.evaluate(now) == 1
+	row = history.query()[0]
+	close = a["Close"].to_numpy(dtype=np.float32).astype(np.float64)
+	assert row["ret_20d"] == pytest.approx(close[at + 20] / close[at] - 1, rel=1e-6)
+	assert row["eval_done"] == 1
+	assert history.pending_tickers("kr", now) == []
+	assert history.update_prices("kr", lambda t: pytest.fail("조회할 종목 없음"), now) is None
+
+
+def test_stale_picks_stop_being_evaluated(tmp_path, panels):
+	full = make_daily(40)
+	write_panel(panels["panel"], {"A": full})
+	history = RecoHistory(str(tmp_path / "reco.sqlite"))
+	history.record(datetime(2024, 2, 26), "kr", [pick(full.iloc[:-2], "A")], [])
+	history.evaluate(datetime(2024, 2, 28))
+	assert history.query()[0]["eval_done"] == 0
+	history.evaluate(datetime(2024, 2, 26) + pd.Timedelta(days=reco_history.GIVE_UP_DAYS + 1))
+	assert history.query()[0]["eval_done"] == 1
+
+
+def test_old_schema_is_migrated(tmp_path):
+	path = str(tmp_path / "reco.sqlite")
+	conn = sqlite3.connect(path)
+	conn.execute("CREATE TABLE picks (id INTEGER PRIMARY KEY, run_at TEXT NOT NULL, trade_date TEXT NOT NULL,"
+	             " market TEXT NOT NULL, rank INTEGER NOT NULL, ticker TEXT NOT NULL, name TEXT, score REAL,"
+	             " close REAL, reason TEXT, entry TEXT, exit TEXT, meta TEXT, source TEXT NOT NULL DEFAULT 'live',"
+	             " ret_1d REAL, ret_5d REAL, ret_20d REAL, UNIQUE (run_at, market, ticker, source))")
+	conn.commit()
+	conn.close()
+	history = RecoHistory(path)
+	history.record(datetime(2024, 1, 2), "kr", [pick(make_daily(10), "A")], [])
+	assert history.query()[0]["eval_done"] == 0
+
+
+def test_performance_summary(tmp_path):
+	history = RecoHistory(str(tmp_path / "reco.sqlite"))
+	df = make_daily(10)
+	history.record(datetime(2024, 1, 2), "kr", [pick(df, "A"), pick(df, "B")], [])
+	with history._conn() as conn:
+		conn.execute("UPDATE picks SET ret_1d = CASE ticker WHEN 'A' THEN 0.02 ELSE -0.01 END")
+	perf = history.performance("kr")
+	assert perf["1d"]["count"] == 2
+	assert perf["1d"]["mean_return"] == pytest.approx(0.005)
+	assert perf["1d"]["hit_rate"] == pytest.approx(0.5)
+	assert perf["5d"]["count"] == 0
@@ -0,0 +1,65 @@
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+import report as report_module
+from report import Report, publish_report
+
+
+def item(ticker: str, name: str, market: str = "kr"):
+	return {"ticker": ticker, "name": name, "market": market, "reason": "<강세>", "entry": "-", "exit": "-",
+	        "close": 70000.0, "low_52w": math.nan, "high_52w": 90000.0}
+
+
+def make_report(**kwargs):
+	return Report("kim", datetime(2025, 3, 10, 8, 30), [item("005930", "삼성전자")], [item("AAPL", "Apple", "us")],
+	              "요약", **kwargs)
+
+
+def test_formats_share_one_model():
+	rep = make_report(watchlist=["000660"], watch_items={"000660": item("000660", "SK하이닉스")})
+	data = json.loads(rep.to_json())
+	assert data["version"] == rep.version
+	assert data["kr_items"][0]["low_52w"] is None
+	assert [w["ticker"] for w in data["watch_items"]] == ["000660"]
+	assert "&lt;강세&gt;" in rep.to_html() and "<강세>" not in rep.to_html()
+	assert "삼성전자" in rep.to_text() and "SK하이닉스" in rep.to_text()
+
+
+def test_market_filter_changes_content_and_version():
+	kr = make_report(market="kr")
+	assert "Apple" not in kr.to_text() and "Apple" not in kr.to_html()
+	assert kr.version != make_report().version
+	assert make_report().version == make_report().version
+
+
+def test_render_cached_per_version(monkeypatch):
+	rep = make_report()
+	calls = []
+	original = Report._render_text
+	monkeypatch.setattr(Report, "_render_text", lambda self: calls.append(1) or original(self))
+	assert make_report().to_text() == rep.to_text()
+	rep.to_text()
+	assert len(calls) == 1
+	assert f"{rep.version}:text" in report_module._RENDER_CACHE
+	with pytest.raises(ValueError):
+		rep.render("pdf")
+
+
+def test_render_cache_is_safe_across_threads(monkeypatch):
+	monkeypatch.setattr(report_module, "_RENDER_CACHE_SIZE", 4)
+	reports = [Report(f"user{i}", datetime(2025, 3, 10, 8, 30), [item("005930", "삼성전자")], [], "요약")
+	           for i in range(16)]
+	with ThreadPoolExecutor(8) as pool:
+		texts = list(pool.map(lambda i: reports[i % 16].render(("text", "html", "json")[i % 3]), range(2000)))
+	assert all(texts)
+	assert len(report_module._RENDER_CACHE) <= 4
+
+
+def test_publish_writes_all_formats(tmp_path):
+	paths = publish_report(make_report(), str(tmp_path), "kim")
+	assert sorted(paths) == ["html", "json", "text"]
+	assert json.loads((tmp_path / "kim.json").read_text(encoding="utf-8"))["user_name"] == "kim"
@@ -0,0 +1,65 @@
+import math
+from datetime import datetime
+
+import numpy as np
+
+from snapshot_diff import build_snapshot, diff_snapshots, load_snapshot, reuse_item, save_snapshot
+
+NOW = datetime(2025, 3, 10, 8, 30)
+
+
+def selected(*picks):
+	return [(ticker, None, {"score": score, "close": close, "rsi": rsi, "vol": 1.0}) for ticker, score, close, rsi in picks]
+
+
+def snapshot(kr, headlines=("a",), items=None):
+	outputs = {"kr_selected": selected(*kr), "us_selected": [], "headlines": list(headlines)}
+	items = items or {"kr": [{"ticker": t, "name": f"종목{t}", "close": c} for t, _, c, _ in kr], "us": []}
+	return build_snapshot(NOW, outputs, items, "요약")
+
+
+def test_first_snapshot_is_material():
+	diff = diff_snapshots(None, snapshot([("A", 3.0, 100.0, 50.0)]))
+	assert diff.first and diff.material
+
+
+def test_small_moves_are_not_material():
+	old = snapshot([("A", 3.0, 100.0, 50.0), ("B", 2.0, 10.0, 40.0)])
+	new = snapshot([("A", 3.1, 100.5, 52.0), ("B", 2.0, 10.0, 40.0)], headlines=("b",))
+	diff = diff_snapshots(old, new)
+	assert not diff.material
+	assert diff.news_changed
+	assert diff.summary() == "뉴스 갱신"
+
+
+def test_membership_and_threshold_changes():
+	old = snapshot([("A", 3.0, 100.0, 50.0), ("B", 2.0, 10.0, 40.0)])
+	new = snapshot([("B", 2.0, 10.2, 40.0), ("C", 1.5, 5.0, 30.0)])
+	diff = diff_snapshots(old, new)
+	assert diff.added["kr"] == ["C"] and diff.removed["kr"] == ["A"]
+	assert [(c.ticker, c.field) for c in diff.changes] == [("B", "close")]
+	assert diff.material
+	message = diff.to_message(NOW)
+	assert "종목C(C)" in message
+
+
+def test_reuse_item_only_when_meta_unchanged():
+	items = {"kr": [{"ticker": "A", "name": "에이", "close": 100.0, "low_52w": float("nan")}], "us": []}
+	previous = snapshot([("A", 3.0, 100.0, 50.0)], items=items)
+	same = {"score": 3.0, "close": 100.0, "rsi": 50.0, "vol": 1.0}
+	item, name = reuse_item(previous, "kr", "A", same)
+	assert name == "에이" and item["close"] == 100.0
+	item, name = reuse_item(previous, "kr", "A", {**same, "close": 101.0})
+	assert item is None and name == "에이"
+	assert reuse_item(previous, "kr", "Z", same) == (None, None)
+
+
+def test_save_and_load_keep_nan_items(tmp_path):
+	items = {"kr": [{"ticker": "A", "name": "에이", "low_52w": np.float64("nan")}], "us": []}
+	snap = snapshot([("A", 3.0, 100.0, np.nan)], items=items)
+	path = str(tmp_path / "snap" / "last.json")
+	save_snapshot(snap, path)
+	loaded = load_snapshot(path)
+	assert math.isnan(loaded["kr_items"][0]["low_52w"])
+	assert "rsi" in loaded["kr"][0] and loaded["kr"][0]["rsi"] is None
+	assert load_snapshot(str(tmp_path / "missing.json")) is None
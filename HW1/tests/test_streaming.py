@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_daily
+from screener import INDICATOR_PARAMS, enrich_indicators
+from streaming import Bar, IncrementalIndicators, LATENCY_WINDOW, ReplayFeed, StreamEngine
+
+
+def batch_frame(df: pd.DataFrame) -> pd.DataFrame:
+	out = enrich_indicators(df)
+	window = INDICATOR_PARAMS["vol_avg"]
+	out["VOL_AVG20"] = df["Volume"].rolling(window, min_periods=window).mean()
+	return out
+
+
+def test_incremental_matches_batch_indicators():
+	df = make_daily(260)
+	expected = batch_frame(df)
+	state = IncrementalIndicators()
+	ts = (df.index.asi8 // 10**9).tolist()
+	rows = [state.update(c, v, t) for t, c, v in zip(ts, df["Close"].tolist(), df["Volume"].tolist())]
+	got = pd.DataFrame(rows, index=df.index)
+
+	columns = [c for c in got.columns if c in expected.columns]
+	assert {"SMA_60", "RSI", "MACD", "MACD_SIGNAL", "BB_UPPER", "VOL_AVG20", "W_SMA_10", "M_RSI"} <= set(columns)
+	warm = 80  # 가장 긴 창(SMA 60) 이후
+	for col in columns:
+		np.testing.assert_allclose(got[col].to_numpy()[warm:], expected[col].to_numpy()[warm:],
+		                           rtol=1e-6, atol=1e-6, err_msg=col)
+
+
+def test_seed_then_update_equals_full_replay():
+	df = make_daily(200)
+	seeded = IncrementalIndicators()
+	seeded.seed(df.iloc[:-1])
+	last = df.iloc[-1]
+	row = seeded.update(float(last["Close"]), float(last["Volume"]), df.index[-1].timestamp())
+
+	full = IncrementalIndicators()
+	full.seed(df)
+	assert row == pytest.approx(full.row, nan_ok=True)
+
+
+def test_engine_reports_only_new_top_k_entries():
+	frames = {f"T{i}": make_daily(120, seed=i) for i in range(6)}
+	engine = StreamEngine(top_k=2)
+	engine.seed(frames)
+	before = list(engine.top)
+	assert len(before) == 2
+
+	for bar in ReplayFeed({t: make_daily(30, seed=10 + i, start="2024-06-17") for i, t in enumerate(frames)}):
+		old = set(engine.top)
+		entered = engine.on_bar(bar)
+		assert entered == [t for t in engine.top if t not in old]
+	assert engine.updates == 6 * 30
+
+
+def test_latency_samples_are_bounded():
+	engine = StreamEngine(top_k=1)
+	engine.seed({"A": make_daily(80)})
+	for i in range(LATENCY_WINDOW + 50):
+		close = 100.0 + i % 7
+		engine.on_bar(Bar("A", 1.7e9 + i * 86400, close, close, close, close, 1000.0, received=1.0))
+	assert len(engine.latencies) == LATENCY_WINDOW
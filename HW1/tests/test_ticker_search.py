@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+import ticker_search
+from ticker_search import TickerIndex, load_listings, to_choseong
+
+ENTRIES = [
+	{"code": "005930", "name": "삼성전자", "market": "kr", "rank": 0},
+	{"code": "005935", "name": "삼성전자우", "market": "kr", "rank": 5},
+	{"code": "028260", "name": "삼성물산", "market": "kr", "rank": 10},
+	{"code": "000660", "name": "SK하이닉스", "market": "kr", "rank": 1},
+	{"code": "AAPL", "name": "Apple Inc.", "market": "us", "rank": 0},
+	{"code": "SSNLF", "name": "Samsung Electronics", "market": "us", "rank": 50},
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+	return TickerIndex(ENTRIES)
+
+
+def codes(hits):
+	return [h["code"] for h in hits]
+
+
+def test_exact_then_prefix_then_contains(index):
+	hits = index.search("삼성전자")
+	assert codes(hits) == ["005930", "005935"]
+	assert [h["match"] for h in hits] == ["exact", "prefix"]
+	assert codes(index.search("전자"))[:2] == ["005930", "005935"]
+
+
+def test_partial_syllable_and_choseong(index):
+	assert to_choseong("삼성전자") == "ㅅㅅㅈㅈ"
+	assert codes(index.search("삼성ㅈ")) == ["005930", "005935"]
+	assert codes(index.search("ㅅㅅㅁㅅ")) == ["028260"]
+
+
+def test_code_market_filter_and_limit(index):
+	assert codes(index.search("0059")) == ["005930", "005935"]
+	assert codes(index.search("sam", market="us")) == ["SSNLF"]
+	assert codes(index.search("aapl")) == ["AAPL"]
+	assert len(index.search("삼성", limit=1)) == 1
+	assert index.search("") == [] and index.search("없는종목") == []
+	assert index.name("aapl", "us") == "Apple Inc."
+
+
+def test_partial_listing_is_not_persisted(tmp_path, monkeypatch, capsys):
+	path = str(tmp_path / "listings.json")
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump(ENTRIES, f, ensure_ascii=False)
+	os.utime(path, (0, 0))  # 오래된 스냅샷
+	fresh_us = [{"code": "MSFT", "name": "Microsoft", "market": "us", "rank": 0}]
+	monkeypatch.setattr(ticker_search, "fetch_listings", lambda: fresh_us)
+	entries = load_listings(path)
+	assert os.path.getmtime(path) == 0
+	assert {e["code"] for e in entries} == {"MSFT", "005930", "005935", "028260", "000660"}
+	assert "kr" in capsys.readouterr().out
+
+	monkeypatch.setattr(ticker_search, "fetch_listings", lambda: fresh_us + ENTRIES[:1])
+	assert load_listings(path) == fresh_us + ENTRIES[:1]
+	with open(path, encoding="utf-8") as f:
+		assert json.load(f) == fresh_us + ENTRIES[:1]
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_daily
+from timeframes import TIMEFRAME_PARAMS, TimeframeState, period_bounds, period_codes, resample_ohlcv, timeframe_columns
+
+PANDAS_RULE = {"W": "W-FRI", "M": "ME"}
+
+
+@pytest.mark.parametrize("tf", ["W", "M"])
+def test_resample_matches_pandas(tf):
+	df = make_daily(400)
+	df = df.drop(df.index[[3, 17, 18, 90]])  # 휴장일
+	got = resample_ohlcv(df, tf)
+	expected = df.resample(PANDAS_RULE[tf]).agg(
+		{"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}).dropna()
+	assert len(got) == len(expected)
+	np.testing.assert_allclose(got.to_numpy(), expected[got.columns].to_numpy())
+	# 인덱스는 기간의 마지막 거래일
+	assert got.index[-1] == df.index[-1]
+
+
+def naive_columns(df: pd.DataFrame, tf: str) -> pd.DataFrame:
+	"""각 날짜까지의 일봉만으로 상위 봉을 다시 만들어 지표 계산 (미래를 보지 않는 정의)"""
+	p = TIMEFRAME_PARAMS[tf]
+	rows = []
+	for i in range(len(df)):
+		close = resample_ohlcv(df.iloc[:i + 1], tf)["Close"]
+		row = {f"{tf}_SMA_{w}": close.rolling(w).mean().iloc[-1] for w in p.get("sma", ())}
+		if "rsi" in p:
+			delta = close.diff()
+			gain = delta.clip(lower=0).rolling(p["rsi"]).mean().iloc[-1]
+			loss = (-delta.clip(upper=0)).rolling(p["rsi"]).mean().iloc[-1]
+			row[f"{tf}_RSI"] = 100 - 100 / (1 + gain / (loss if loss else 1e-9))
+		if "macd" in p:
+			fast, slow, signal = p["macd"]
+			macd = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+			row[f"{tf}_MACD"] = macd.iloc[-1]
+			row[f"{tf}_MACD_SIGNAL"] = macd.ewm(span=signal, adjust=False).mean().iloc[-1]
+		rows.append(row)
+	return pd.DataFrame(rows, index=df.index)
+
+
+@pytest.mark.parametrize("tf", ["W", "M"])
+def test_columns_match_recomputing_each_day(tf):
+	df = make_daily(260)
+	got = pd.DataFrame(timeframe_columns(df, tf), index=df.index)
+	expected = naive_columns(df, tf)
+	for col in expected.columns:
+		np.testing.assert_allclose(got[col].to_numpy(), expected[col].to_numpy(), rtol=1e-9, atol=1e-9, err_msg=col)
+
+
+@pytest.mark.parametrize("tf", ["W", "M"])
+def test_incremental_state_matches_columns(tf):
+	df = make_daily(260)
+	expected = pd.DataFrame(timeframe_columns(df, tf), index=df.index)
+	state = TimeframeState(tf)
+	ts = (df.index.asi8 // 10**9).tolist()
+	got = pd.DataFrame([state.update(t, c) for t, c in zip(ts, df["Close"].tolist())], index=df.index)
+	for col in expected.columns:
+		np.testing.assert_allclose(got[col].to_numpy(), expected[col].to_numpy(), rtol=1e-9, atol=1e-9, err_msg=col)
+
+
+@pytest.mark.parametrize("tf", ["W", "M"])
+def test_period_bounds_agree_with_codes(tf):
+	index = pd.date_range("2023-12-25", "2024-03-05", freq="D")
+	codes = period_codes(index, tf)
+	for day, code in zip(index, codes):
+		got, start, end = period_bounds(day.timestamp(), tf)
+		assert got == code
+		assert start <= day.timestamp() < end
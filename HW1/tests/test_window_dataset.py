@@ -0,0 +1,48 @@
+import numpy as np
+
+from conftest import make_daily
+from window_dataset import FEATURES, WindowDataset
+
+
+def dataset(window: int = 20, horizon: int = 5):
+	return WindowDataset.from_panel({f"T{i}": make_daily(120, seed=i) for i in range(3)}, window, horizon)
+
+
+def test_windows_are_views_with_matching_labels():
+	ds = dataset()
+	assert len(ds) > 0
+	x, y = ds[0]
+	assert x.shape == (20, len(FEATURES))
+	assert np.shares_memory(x, ds.features)
+	assert not np.isnan(x).any() and not np.isnan(y)
+	row, start = ds.index[0]
+	end = start + ds.window - 1
+	np.testing.assert_array_equal(x[-1], ds.features[row, end])
+	assert y == ds.labels[row, end]
+
+
+def test_label_is_forward_return():
+	frames = {"A": make_daily(120)}
+	ds = WindowDataset.from_panel(frames, window=20, horizon=5)
+	close = frames["A"]["Close"].to_numpy()
+	row, start = ds.index[-1]
+	end = start + 19
+	assert ds.labels[row, end] == np.float32(close[end + 5] / close[end] - 1)
+
+
+def test_shards_partition_samples_and_batches_cover_all():
+	ds = dataset()
+	shards = [ds.shard(r, 3) for r in range(3)]
+	assert sum(len(s) for s in shards) == len(ds)
+	seen = sum(len(y) for _, y in ds.batches(16, shuffle=True))
+	assert seen == len(ds)
+	x, y = next(ds.batches(8, shuffle=False))
+	assert x.shape == (8, 20, len(FEATURES)) and y.shape == (8,)
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+	ds = dataset()
+	loaded = WindowDataset.load(ds.save(str(tmp_path / "ds")))
+	assert len(loaded) == len(ds) and loaded.tickers == ds.tickers
+	assert isinstance(loaded.features, np.memmap)
+	np.testing.assert_array_equal(loaded[3][0], ds[3][0])
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+import work_queue
+from conftest import make_daily
+from work_queue import MAX_ATTEMPTS, RedisWorkQueue, WorkQueue, coordinate, merge_results, run_worker, screen_unit
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def queue(request, tmp_path):
+	if request.param == "sqlite":
+		return WorkQueue(str(tmp_path / "queue.sqlite"))
+	fakeredis = pytest.importorskip("fakeredis")
+	pytest.importorskip("lupa")  # Lua 스크립트 실행
+	return RedisWorkQueue(client=fakeredis.FakeRedis(decode_responses=True))
+
+
+def candidate(ticker: str, score: float):
+	return {"ticker": ticker, "meta": {"score": score, "vol": 1.0, "vol_avg20": 1.0},
+	        "dates": ["2025-01-02", "2025-01-03"], "close": [1.0, 1.1]}
+
+
+def test_submit_is_idempotent_and_dedupes(queue):
+	ids = queue.submit("job", "kr", ["A", "B", "A", "C"], shard_size=2)
+	assert len(ids) == 2
+	assert queue.submit("job", "kr", ["A", "B", "C"], shard_size=2) == ids
+	assert queue.progress(ids) == {"pending": 2}
+
+
+def test_expired_lease_is_reclaimed_and_stale_completion_ignored(queue):
+	unit_id, = queue.submit("job", "kr", ["A"])
+	first = queue.claim("w1", lease=-1)  # 바로 만료
+	second = queue.claim("w2")
+	assert first["id"] == second["id"] == unit_id
+	assert queue.claim("w3") is None
+	assert not queue.complete(unit_id, "w1", [candidate("A", 1)])
+	assert queue.complete(unit_id, "w2", [candidate("A", 2)])
+	assert not queue.complete(unit_id, "w2", [candidate("A", 3)])
+	assert queue.results([unit_id]) == [[candidate("A", 2)]]
+
+
+def test_failures_retry_then_give_up(queue):
+	unit_id, = queue.submit("job", "kr", ["A"])
+	for attempt in range(MAX_ATTEMPTS):
+		assert queue.claim("w")["id"] == unit_id
+		queue.fail(unit_id, "w", f"error {attempt}")
+	assert queue.claim("w") is None
+	assert queue.progress([unit_id]) == {"failed": 1}
+
+
+def test_renewed_lease_is_not_reclaimed(queue):
+	unit_id, = queue.submit("job", "kr", ["A"])
+	queue.claim("w1", lease=0.2)
+	assert queue.renew(unit_id, "w1", lease=60)
+	time.sleep(0.3)
+	assert queue.claim("w2") is None
+	assert not queue.renew(unit_id, "w2")
+	assert queue.complete(unit_id, "w1", [candidate("A", 1)])
+	assert not queue.renew(unit_id, "w1")
+
+
+def test_screen_unit_heartbeats_between_fetches(monkeypatch):
+	fetched = []
+	monkeypatch.setitem(work_queue.FETCHERS, "kr", lambda t: fetched.append(t) or make_daily(days=80))
+	beats = []
+	screen_unit("kr", ["A", "B", "C"], 2, heartbeat=lambda: beats.append(len(fetched)))
+	assert beats == [1, 2, 3]
+
+
+def test_slow_unit_keeps_its_lease(queue, monkeypatch):
+	def slow(market, tickers, pool_size, heartbeat):
+		for _ in range(8):  # 임대(0.2초)보다 오래 걸리는 조회
+			time.sleep(0.05)
+			heartbeat()
+		return [candidate(t, 1) for t in tickers]
+
+	monkeypatch.setattr(work_queue, "screen_unit", slow)
+	unit_id, = queue.submit("job", "kr", ["A"])
+	worker = threading.Thread(target=run_worker, kwargs={"queue": queue, "name": "w1", "idle_exit": 0.1,
+	                                                      "poll": 0.05, "lease": 0.2})
+	worker.start()
+	time.sleep(0.25)
+	assert queue.claim("w2") is None
+	worker.join()
+	assert queue.progress([unit_id]) == {"done": 1}
+
+
+def test_results_only_for_current_units(queue):
+	old, = queue.submit("job", "kr", ["A", "B"], shard_size=2)
+	queue.claim("w")
+	queue.complete(old, "w", [candidate("A", 5), candidate("B", 4)])
+	new = queue.submit("job", "kr", ["C"], shard_size=2)
+	unit = queue.claim("w")
+	queue.complete(unit["id"], "w", [candidate("C", 1)])
+	assert queue.results(new) == [[candidate("C", 1)]]
+
+
+def test_merge_results_ranks_once_per_ticker():
+	merged = merge_results([[candidate("A", 3), candidate("B", 1)], [candidate("A", 3), candidate("C", 2)]], top_k=3)
+	assert [t for t, _, _ in merged] == ["A", "C", "B"]
+	assert list(merged[0][1]["Close"]) == [1.0, 1.1]
+
+
+def test_coordinate_with_worker(queue, monkeypatch):
+	monkeypatch.setattr(work_queue, "screen_unit",
+	                    lambda market, tickers, pool_size, heartbeat: [candidate(t, float(ord(t[0]))) for t in tickers])
+	worker = threading.Thread(target=run_worker, kwargs={"queue": queue, "name": "w", "idle_exit": 2, "poll": 0.05})
+	worker.start()
+	try:
+		started = time.perf_counter()
+		picks = coordinate("kr", ["A", "B", "C", "D", "E"], job_id="job", shard_size=2, top_k=3, max_corr=None,
+		                   queue=queue, timeout=10)
+	finally:
+		worker.join()
+	assert [t for t, _, _ in picks] == ["E", "D", "C"]
+	assert time.perf_counter() - started < 10